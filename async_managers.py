@@ -0,0 +1,218 @@
+"""
+PayPulse 비동기 인터페이스
+async_managers - 인건비 관리자의 블로킹 작업을 실행기에서 수행하는 asyncio 파사드
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import logging
+
+import pandas as pd
+
+from columnar_export import ExportedPartition
+from direct_labor_cost_manager import DirectLaborCostManager, _parse_direct_labor_file
+from kpi_engine import KpiResult
+from parallel_ingest import FileIngestReport
+from period_catalog import Period
+from total_labor_cost_manager import TotalLaborCostManager, _parse_payroll_file
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행할 최대 작업 수
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class _AsyncManagerBase:
+    """
+    동기 관리자를 감싸는 공통 비동기 파사드
+
+    - SQL 조회, 보고서 작성, 저장: 스레드 실행기 (조회는 스레드별 읽기 연결 사용)
+    - Excel 파싱/정제: 프로세스 실행기 (GIL과 무관하게 병렬 처리)
+
+    모든 작업은 max_concurrency 세마포어로 동시 실행 수가 제한되며, timeout을 넘기거나
+    호출이 취소되면 아직 시작하지 않은 작업은 실행되지 않는다. 이미 실행 중인 스레드 작업은
+    중단할 수 없으므로 끝까지 수행된 뒤 결과가 버려진다.
+    """
+
+    manager_class: type = None
+    parse_file: Callable[[str], pd.DataFrame] = None
+    save_method: str = None
+
+    def __init__(self, db_path: Optional[str] = None, manager=None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 process_workers: Optional[int] = None,
+                 default_timeout: Optional[float] = None, **manager_kwargs):
+        """
+        Args:
+            db_path (Optional[str]): 데이터베이스 경로 (manager를 주지 않을 때 사용)
+            manager: 감쌀 동기 관리자 (None이면 새로 생성)
+            max_concurrency (int): 동시에 실행할 최대 작업 수
+            process_workers (Optional[int]): 파싱용 프로세스 수 (None이면 CPU 수)
+            default_timeout (Optional[float]): 호출별 timeout을 주지 않았을 때의 제한 시간(초)
+            **manager_kwargs: 관리자 생성 인자 (batch_size, cache_size 등)
+        """
+        if manager is None:
+            if db_path is not None:
+                manager_kwargs['db_path'] = db_path
+            manager = self.manager_class(**manager_kwargs)
+        self.manager = manager
+        self.default_timeout = default_timeout
+        self.process_workers = process_workers
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._threads = ThreadPoolExecutor(max_workers=max_concurrency,
+                                           thread_name_prefix=type(self).__name__)
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _submit(self, executor, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            future = loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+            return await asyncio.wait_for(future, timeout)
+
+    async def run_in_thread(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """임의의 블로킹 함수를 스레드 실행기에서 실행"""
+        return await self._submit(self._threads, fn, *args, timeout=timeout, **kwargs)
+
+    async def run_in_process(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """모듈 수준 함수를 프로세스 실행기에서 실행"""
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+        return await self._submit(self._processes, fn, *args, timeout=timeout, **kwargs)
+
+    async def load_from_excel(self, excel_path: str, timeout: Optional[float] = None) -> bool:
+        """
+        Excel 파일 적재 (파싱은 프로세스, 저장은 단일 작성자 스레드)
+
+        Args:
+            excel_path (str): Excel 파일 경로
+            timeout (Optional[float]): 전체 제한 시간(초)
+
+        Returns:
+            bool: 적재 성공 여부
+        """
+        async def _load() -> bool:
+            if not os.path.exists(excel_path):
+                logger.error(f"파일을 찾을 수 없습니다: {excel_path}")
+                return False
+
+            ledger = self.manager.ledger
+            file_hash = await self.run_in_thread(ledger.file_hash, excel_path)
+            if await self.run_in_thread(ledger.is_file_loaded, file_hash):
+                logger.info(f"변경 없는 파일, 적재 생략: {excel_path}")
+                return True
+
+            try:
+                df = await self.run_in_process(type(self).parse_file, excel_path)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                raise
+            except Exception as e:
+                logger.error(f"Excel 파일 로드 오류: {e}")
+                return False
+
+            save = getattr(self.manager, self.save_method)
+            return await self.run_in_thread(save, df, file_hash=file_hash, source_path=excel_path)
+
+        timeout = self.default_timeout if timeout is None else timeout
+        return await asyncio.wait_for(_load(), timeout)
+
+    async def load_directory(self, directory: str, workers: Optional[int] = None,
+                             timeout: Optional[float] = None) -> List[FileIngestReport]:
+        """디렉터리 적재 (내부적으로 프로세스 풀 사용)"""
+        return await self.run_in_thread(self.manager.load_directory, directory, workers, timeout=timeout)
+
+    async def get_kpis(self, periods: Optional[List[Period]] = None,
+                       timeout: Optional[float] = None) -> Dict[Period, KpiResult]:
+        """기간별 KPI"""
+        return await self.run_in_thread(self.manager.get_kpis, periods, timeout=timeout)
+
+    async def get_employee_history(self, employee_ids: Union[str, List[str]], start: Optional[Period] = None,
+                                   end: Optional[Period] = None, timeout: Optional[float] = None) -> pd.DataFrame:
+        """직원별 기간 이력"""
+        return await self.run_in_thread(self.manager.get_employee_history, employee_ids, start, end,
+                                        timeout=timeout)
+
+    async def export_columnar(self, output_dir: str, fmt: str = 'parquet',
+                              periods: Optional[List[Period]] = None,
+                              timeout: Optional[float] = None) -> List[ExportedPartition]:
+        """기간 파티션 단위 내보내기"""
+        return await self.run_in_thread(self.manager.export_columnar, output_dir, fmt, periods,
+                                        timeout=timeout)
+
+    async def roll_year(self, year: int, vacuum: bool = False, timeout: Optional[float] = None) -> bool:
+        """지난 연도를 보관 파일로 이동"""
+        return await self.run_in_thread(self.manager.roll_year, year, vacuum, timeout=timeout)
+
+    async def restore_year(self, year: int, timeout: Optional[float] = None) -> bool:
+        """보관 연도를 주 데이터베이스로 복원"""
+        return await self.run_in_thread(self.manager.restore_year, year, timeout=timeout)
+
+    async def aclose(self):
+        """실행 중인 작업이 끝나기를 기다린 뒤 실행기와 데이터베이스 연결 종료"""
+        def _shutdown():
+            self._threads.shutdown(wait=True)
+            if self._processes is not None:
+                self._processes.shutdown(wait=True)
+            self.manager.close()
+
+        await asyncio.get_running_loop().run_in_executor(None, _shutdown)
+
+
+class AsyncTotalLaborCostManager(_AsyncManagerBase):
+    """TotalLaborCostManager 비동기 파사드"""
+
+    manager_class = TotalLaborCostManager
+    parse_file = staticmethod(_parse_payroll_file)
+    save_method = '_save_to_database'
+
+    async def get_department_summary(self, year: Optional[int] = None, month: Optional[int] = None,
+                                     timeout: Optional[float] = None) -> pd.DataFrame:
+        """부서별 인건비 요약"""
+        return await self.run_in_thread(self.manager.get_department_summary, year, month, timeout=timeout)
+
+    async def get_monthly_trend(self, months: int = 12, timeout: Optional[float] = None) -> pd.DataFrame:
+        """월별 인건비 추이"""
+        return await self.run_in_thread(self.manager.get_monthly_trend, months, timeout=timeout)
+
+    async def generate_report(self, output_path: str = "인건비_종합보고서.xlsx", streaming: bool = False,
+                              timeout: Optional[float] = None) -> bool:
+        """Excel 종합 보고서 생성"""
+        return await self.run_in_thread(self.manager.generate_report, output_path, streaming,
+                                        timeout=timeout)
+
+
+class AsyncDirectLaborCostManager(_AsyncManagerBase):
+    """DirectLaborCostManager 비동기 파사드"""
+
+    manager_class = DirectLaborCostManager
+    parse_file = staticmethod(_parse_direct_labor_file)
+    save_method = '_save_direct_labor_to_database'
+
+    async def get_overtime_trend(self, months: int = 12, start: Optional[Period] = None,
+                                 end: Optional[Period] = None, departments: Optional[Tuple[str, ...]] = None,
+                                 after: Optional[Tuple[str, int, int]] = None, limit: Optional[int] = None,
+                                 timeout: Optional[float] = None) -> pd.DataFrame:
+        """연장근무 트렌드 (기간 범위, 부서 필터, 키셋 페이지)"""
+        return await self.run_in_thread(self.manager.get_overtime_trend, months, start, end, departments,
+                                        after, limit, timeout=timeout)
+
+    async def get_direct_labor_analysis(self, year: Optional[int] = None, month: Optional[int] = None,
+                                        timeout: Optional[float] = None) -> Dict:
+        """직접 인건비 종합 분석"""
+        return await self.run_in_thread(self.manager.get_direct_labor_analysis, year, month,
+                                        timeout=timeout)
+
+    async def generate_detailed_report(self, output_path: str = "직접인건비_상세보고서.xlsx",
+                                       streaming: bool = False, timeout: Optional[float] = None) -> bool:
+        """직접 인건비 상세 보고서 생성"""
+        return await self.run_in_thread(self.manager.generate_detailed_report, output_path, streaming,
+                                        timeout=timeout)
@@ -0,0 +1,94 @@
+"""
+PayPulse 대량 적재 엔진
+bulk_loader - 정제된 DataFrame을 executemany 배치로 SQLite에 일괄 저장
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 executemany 호출로 전달할 기본 행 수
+DEFAULT_BATCH_SIZE = 10000
+
+
+@dataclass
+class BulkLoadResult:
+    """대량 적재 결과"""
+    table: str
+    rows: int
+    batches: int
+    elapsed: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        """초당 적재 행 수"""
+        return self.rows / self.elapsed if self.elapsed > 0 else float(self.rows)
+
+
+def _column_to_native(series: pd.Series) -> list:
+    """컬럼 하나를 sqlite3가 바인딩할 수 있는 파이썬 기본형 리스트로 변환"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime('%Y-%m-%d')
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+    # tolist()는 numpy 스칼라를 int/float/str 기본형으로 변환한다
+    return series.tolist()
+
+
+def dataframe_to_records(df: pd.DataFrame, columns: Sequence[str]) -> List[tuple]:
+    """
+    DataFrame을 컬럼 단위로 한 번에 변환하여 INSERT용 튜플 목록 생성
+
+    Args:
+        df (pd.DataFrame): 정제된 데이터
+        columns (Sequence[str]): 저장할 컬럼 순서
+
+    Returns:
+        List[tuple]: 행 단위 파라미터 튜플
+    """
+    return list(zip(*(_column_to_native(df[col]) for col in columns)))
+
+
+def bulk_insert(connection: sqlite3.Connection, table: str, df: pd.DataFrame,
+                columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> BulkLoadResult:
+    """
+    DataFrame을 배치 단위 executemany로 테이블에 삽입
+
+    커밋은 호출자가 담당하므로 여러 번의 호출과 선행 DELETE를
+    하나의 트랜잭션으로 묶을 수 있다.
+
+    Args:
+        connection (sqlite3.Connection): 대상 연결
+        table (str): 대상 테이블명
+        df (pd.DataFrame): 저장할 데이터
+        columns (Sequence[str]): 저장할 컬럼 순서
+        batch_size (int): executemany 한 번에 전달할 행 수
+
+    Returns:
+        BulkLoadResult: 적재 행 수, 배치 수, 소요 시간
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+
+    placeholders = ", ".join("?" for _ in columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    start = time.perf_counter()
+    cursor = connection.cursor()
+    batches = 0
+    for offset in range(0, len(df), batch_size):
+        records = dataframe_to_records(df.iloc[offset:offset + batch_size], columns)
+        cursor.executemany(sql, records)
+        batches += 1
+
+    result = BulkLoadResult(table=table, rows=len(df), batches=batches,
+                            elapsed=time.perf_counter() - start)
+    logger.debug(f"{table} 대량 적재: {result.rows}행, {result.batches}배치, "
+                 f"{result.rows_per_sec:,.0f}행/초")
+    return result
@@ -0,0 +1,147 @@
+"""
+PayPulse 컬럼 형식 내보내기
+columnar_export - 조회 결과를 (년, 월) 파티션 단위로 Parquet / Arrow IPC / 압축 CSV로 저장
+"""
+
+import importlib.util
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+
+import pandas as pd
+
+from period_catalog import Period
+
+logger = logging.getLogger(__name__)
+
+# 형식별 파일 확장자 (arrow는 메모리 매핑 가능한 Arrow IPC 파일 = Feather v2)
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+    'csv': '.csv.gz'
+}
+
+# 파티션 경로로 표현되는 컬럼
+PARTITION_COLUMNS = ('year', 'month')
+
+
+@dataclass
+class ExportedPartition:
+    """파티션 하나의 내보내기 결과"""
+    dataset: str
+    period: Period
+    path: str
+    rows: int
+
+
+class PartitionedExporter:
+    """
+    기간 파티션 단위 내보내기
+
+    각 데이터셋은 {output_dir}/{dataset}/year=YYYY/month=MM/part{확장자}에 저장되며,
+    한 번에 한 기간만 메모리에 올리므로 여러 해를 내보내도 사용량은 한 달 분량으로 제한된다.
+    경로는 Hive 파티션 규칙을 따르므로 pyarrow.dataset 등으로 디렉터리째 읽을 수 있고,
+    year/month 값은 경로에 있으므로 파일 컬럼에서는 제외한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, output_dir: str, fmt: str = 'parquet'):
+        """
+        Args:
+            connection (sqlite3.Connection): 조회에 사용할 연결
+            output_dir (str): 출력 최상위 디렉터리
+            fmt (str): 'parquet', 'arrow', 'csv' 중 하나
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+        if fmt in ('parquet', 'arrow') and importlib.util.find_spec('pyarrow') is None:
+            raise ImportError(f"{fmt} 형식으로 내보내려면 pyarrow가 필요합니다 (pip install pyarrow)")
+
+        self.connection = connection
+        self.output_dir = output_dir
+        self.fmt = fmt
+
+    def partition_path(self, dataset: str, period: Period) -> str:
+        year, month = period
+        return os.path.join(self.output_dir, dataset, f"year={year}", f"month={month:02d}",
+                            f"part{EXPORT_FORMATS[self.fmt]}")
+
+    def _write(self, df: pd.DataFrame, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.fmt == 'parquet':
+            df.to_parquet(path, index=False, compression='zstd')
+        elif self.fmt == 'arrow':
+            # 메모리 매핑으로 읽을 수 있도록 압축하지 않음
+            df.to_feather(path, compression='uncompressed')
+        else:
+            df.to_csv(path, index=False, compression='gzip')
+
+    def export_frames(self, dataset: str, periods: Sequence[Period],
+                      frame_fn: Callable[[Period], pd.DataFrame]) -> List[ExportedPartition]:
+        """
+        기간마다 frame_fn(period)의 결과를 파티션으로 저장 (빈 결과는 건너뜀)
+
+        Args:
+            dataset (str): 데이터셋 이름 (출력 하위 디렉터리)
+            periods (Sequence[Period]): 내보낼 (년, 월) 목록
+            frame_fn (Callable): 기간을 받아 DataFrame을 반환하는 함수
+
+        Returns:
+            List[ExportedPartition]: 저장된 파티션 목록
+        """
+        exported = []
+        for period in periods:
+            df = frame_fn(period)
+            if df is None or df.empty:
+                continue
+            df = df.drop(columns=[col for col in PARTITION_COLUMNS if col in df.columns])
+            path = self.partition_path(dataset, period)
+            self._write(df, path)
+            exported.append(ExportedPartition(dataset, period, path, len(df)))
+        return exported
+
+    def export_query(self, dataset: str, query: str, periods: Sequence[Period]) -> List[ExportedPartition]:
+        """
+        (year, month) 파라미터를 받는 쿼리 결과를 기간별 파티션으로 저장
+
+        Args:
+            dataset (str): 데이터셋 이름 (출력 하위 디렉터리)
+            query (str): WHERE year = ? AND month = ? 형태의 쿼리
+            periods (Sequence[Period]): 내보낼 (년, 월) 목록
+
+        Returns:
+            List[ExportedPartition]: 저장된 파티션 목록
+        """
+        return self.export_frames(
+            dataset, periods,
+            lambda period: pd.read_sql_query(query, self.connection, params=list(period)))
+
+
+def export_datasets(exporter: PartitionedExporter, periods: Sequence[Period],
+                    queries: Dict[str, str],
+                    frames: Optional[Dict[str, Callable[[Period], pd.DataFrame]]] = None) -> List[ExportedPartition]:
+    """
+    여러 데이터셋을 차례로 내보내고 결과를 로그로 남김
+
+    Args:
+        exporter (PartitionedExporter): 내보내기 대상
+        periods (Sequence[Period]): 내보낼 (년, 월) 목록
+        queries (Dict[str, str]): 데이터셋 이름 → (year, month) 파라미터 쿼리
+        frames (Optional[Dict]): 데이터셋 이름 → 기간을 받아 DataFrame을 반환하는 함수
+
+    Returns:
+        List[ExportedPartition]: 저장된 파티션 목록
+    """
+    start = time.perf_counter()
+    exported = []
+    for dataset, query in queries.items():
+        exported.extend(exporter.export_query(dataset, query, periods))
+    for dataset, frame_fn in (frames or {}).items():
+        exported.extend(exporter.export_frames(dataset, periods, frame_fn))
+
+    logger.info(f"{exporter.fmt} 내보내기 완료: {exporter.output_dir} "
+                f"({len(exported)}개 파티션, {sum(p.rows for p in exported)}행, "
+                f"{time.perf_counter() - start:.2f}초)")
+    return exported
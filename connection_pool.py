@@ -0,0 +1,151 @@
+"""
+PayPulse SQLite 연결 풀
+connection_pool - WAL 모드의 전용 작성자 연결과 스레드별 읽기 전용 연결
+"""
+
+import functools
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Optional, Set
+import logging
+
+from instrumentation import InstrumentedConnection, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# 잠금 대기 시간(초)
+DEFAULT_BUSY_TIMEOUT = 30.0
+
+
+class ThreadSlot:
+    """스레드 로컬에 두는 연결 보관 객체 (state는 사용처가 연결과 함께 두는 값)"""
+
+    __slots__ = ('connection', 'state', '__weakref__')
+
+    def __init__(self, connection: sqlite3.Connection, state: Any = None):
+        self.connection = connection
+        self.state = state
+
+
+class ThreadConnections:
+    """
+    스레드별 연결 등록부
+
+    연결은 스레드 로컬의 ThreadSlot에 두고, 스레드가 끝나 슬롯이 해제되면 finalize로 닫는다.
+    작업자 스레드나 비동기 실행기 스레드가 끝난 뒤에도 연결이 열린 채 남지 않는다.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[ThreadSlot]:
+        """호출 스레드의 슬롯 (없으면 None)"""
+        return getattr(self._local, 'slot', None)
+
+    def register(self, connection: sqlite3.Connection, state: Any = None) -> ThreadSlot:
+        """호출 스레드의 연결 등록"""
+        slot = self._local.slot = ThreadSlot(connection, state)
+        with self._lock:
+            self._connections.add(connection)
+        weakref.finalize(slot, self._release, connection)
+        return slot
+
+    def _release(self, connection: sqlite3.Connection):
+        with self._lock:
+            if connection not in self._connections:
+                return  # close()에서 이미 닫음
+            self._connections.remove(connection)
+        connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
+    def close(self):
+        """등록된 모든 연결 닫기"""
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+class ConnectionPool:
+    """
+    데이터베이스 파일 하나에 대한 연결 묶음
+
+    - writer: 적재/스키마 변경에 쓰는 단일 연결. write_lock으로 스레드 간 직렬화한다.
+    - reader(): 호출 스레드 전용 읽기 전용 연결 (처음 호출 시 생성, 스레드가 끝나면 닫힘)
+
+    WAL 모드에서는 읽기가 쓰기를 막지 않으므로 적재 중에도 대시보드 조회가 계속된다.
+    메모리 DB는 연결마다 별개의 DB가 되므로 읽기에도 작성자 연결을 사용한다.
+    """
+
+    def __init__(self, db_path: str, timeout: float = DEFAULT_BUSY_TIMEOUT, wal: bool = True,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            timeout (float): 잠금 대기 시간(초)
+            wal (bool): WAL 저널 모드 사용 여부
+            metrics (Optional[MetricsRegistry]): 지정 시 모든 연결의 SQL 실행을 기록
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None and metrics.enabled else None
+        self.in_memory = db_path == ':memory:' or db_path.startswith('file::memory:')
+        self.write_lock = threading.RLock()
+        self.readers = ThreadConnections()
+
+        self.writer = self._connect(db_path)
+        if wal and not self.in_memory:
+            mode = self.writer.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() == 'wal':
+                # WAL에서는 NORMAL로도 커밋 일관성이 보장됨 (전원 장애 시 마지막 트랜잭션만 유실 가능)
+                self.writer.execute("PRAGMA synchronous=NORMAL")
+            else:
+                logger.warning(f"WAL 모드 전환 실패, {mode} 모드로 동작: {db_path}")
+
+    def _connect(self, database: str, uri: bool = False) -> sqlite3.Connection:
+        if self.metrics is None:
+            return sqlite3.connect(database, timeout=self.timeout, check_same_thread=False, uri=uri)
+        connection = sqlite3.connect(database, timeout=self.timeout, check_same_thread=False, uri=uri,
+                                     factory=InstrumentedConnection)
+        connection.metrics = self.metrics
+        return connection
+
+    def open_reader(self) -> sqlite3.Connection:
+        """새 읽기 전용 연결 (URI 파일명 사용, 닫기는 호출자 담당)"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        connection = self._connect(uri, uri=True)
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def reader(self) -> sqlite3.Connection:
+        """호출 스레드 전용 읽기 전용 연결"""
+        if self.in_memory:
+            return self.writer
+
+        slot = self.readers.current()
+        if slot is None:
+            slot = self.readers.register(self.open_reader())
+        return slot.connection
+
+    def close(self):
+        """모든 읽기 연결과 작성자 연결 닫기"""
+        self.readers.close()
+        self.writer.close()
+
+
+def serialized_write(method: Callable) -> Callable:
+    """self.pool.write_lock을 잡고 실행하는 쓰기 메서드 데코레이터"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.pool.write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -2,16 +2,46 @@
 PayPulse용 더미 급여대장 Excel 파일 생성
 """
 
-import pandas as pd
+import argparse
+import os
 import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 부서 / 직급 분포 (대용량 생성기 가중치)
+DEPARTMENTS = ['개발팀', '마케팅팀', '인사팀', '영업팀', '기획팀', '디자인팀', '회계팀']
+DEPARTMENT_WEIGHTS = [0.30, 0.12, 0.06, 0.22, 0.10, 0.12, 0.08]
+POSITIONS = ['사원', '주임', '대리', '과장', '차장', '부장', '팀장']
+POSITION_WEIGHTS = [0.35, 0.20, 0.18, 0.12, 0.07, 0.05, 0.03]
+
+# 직급별 기본급 범위
+BASE_SALARY_RANGES = {
+    '사원': (2500000, 3000000),
+    '주임': (3000000, 3500000),
+    '대리': (3500000, 4200000),
+    '과장': (4200000, 5000000),
+    '차장': (5000000, 6000000),
+    '부장': (6000000, 7500000),
+    '팀장': (7000000, 8500000)
+}
+
+# 연장근무 유형
+OVERTIME_TYPES = ['평일연장', '야간', '휴일']
+
+# Excel 시트 최대 행 수 (헤더 제외)
+EXCEL_MAX_ROWS = 1048575
 
 def create_dummy_payroll_excel():
     """2025년 급여대장 더미 데이터 생성"""
     
     # 부서 및 직급 정보
-    departments = ['개발팀', '마케팅팀', '인사팀', '영업팀', '기획팀', '디자인팀', '회계팀']
-    positions = ['사원', '주임', '대리', '과장', '차장', '부장', '팀장']
+    departments = DEPARTMENTS
+    positions = POSITIONS
     
     # 더미 데이터 생성
     employees = []
@@ -25,17 +55,7 @@ def create_dummy_payroll_excel():
             position = random.choice(positions)
             
             # 직급별 기본급 설정
-            base_salary_ranges = {
-                '사원': (2500000, 3000000),
-                '주임': (3000000, 3500000),
-                '대리': (3500000, 4200000),
-                '과장': (4200000, 5000000),
-                '차장': (5000000, 6000000),
-                '부장': (6000000, 7500000),
-                '팀장': (7000000, 8500000)
-            }
-            
-            base_salary = random.randint(*base_salary_ranges.get(position, (2500000, 3000000)))
+            base_salary = random.randint(*BASE_SALARY_RANGES.get(position, (2500000, 3000000)))
             overtime_pay = random.randint(100000, 500000)
             allowances = random.randint(50000, 300000)
             bonuses = random.randint(200000, 1000000)
@@ -70,5 +90,229 @@ def create_dummy_payroll_excel():
     
     return df
 
+@dataclass
+class SyntheticPayroll:
+    """대용량 합성 데이터 묶음"""
+    payroll: pd.DataFrame                                  # 한글 헤더 급여대장 (관리자 적재 형식)
+    overtime_details: Optional[pd.DataFrame] = None        # overtime_details 테이블 형식
+    productivity_metrics: Optional[pd.DataFrame] = None    # productivity_metrics 테이블 형식
+
+
+# 연장근무일 ('01' ~ '28')
+DAY_LABELS = np.array([f"{day:02d}" for day in range(1, 29)], dtype=object)
+
+
+def _period_strings(years: np.ndarray, months: np.ndarray, day: str) -> np.ndarray:
+    """(년, 월) 배열에 대응하는 'YYYY-MM-DD' 문자열 (기간 수만큼만 포맷)"""
+    keys = years * 100 + months
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    labels = np.array([f"{key // 100}-{key % 100:02d}-{day}" for key in unique_keys], dtype=object)
+    return labels[inverse]
+
+
+def generate_payroll(n_employees: int, months: int = 12, start_year: int = 2025, start_month: int = 1,
+                     turnover: float = 0.02, seed: Optional[int] = None,
+                     details: bool = False) -> SyntheticPayroll:
+    """
+    NumPy 벡터 연산으로 N명 × M개월 급여대장 생성
+    
+    정원 n_employees를 유지하면서 매월 turnover 비율만큼 퇴사자를 새 사번의 입사자로 교체한다.
+    부서/직급/기본급/기술수당은 직원별로 고정되고, 수당과 공제액은 월마다 새로 뽑는다.
+    
+    Args:
+        n_employees (int): 월별 재직 인원
+        months (int): 생성할 개월 수
+        start_year (int): 시작 년도
+        start_month (int): 시작 월
+        turnover (float): 월 이직률 (0~1)
+        seed (Optional[int]): 난수 시드 (같은 시드는 같은 결과)
+        details (bool): overtime_details / productivity_metrics도 생성할지 여부
+        
+    Returns:
+        SyntheticPayroll: 생성된 데이터
+    """
+    rng = np.random.default_rng(seed)
+    
+    # 정원 슬롯별 재직자 세대: 이직이 일어날 때마다 세대가 1 증가하며 새 사번 부여
+    leaves = rng.random((n_employees, months)) < turnover
+    leaves[:, 0] = False
+    generation = np.cumsum(leaves, axis=1)
+    slot = np.broadcast_to(np.arange(n_employees)[:, None], (n_employees, months))
+    employee_key = (generation * n_employees + slot).T.ravel()   # 월 순서로 정렬된 행
+    employees, employee_index = np.unique(employee_key, return_inverse=True)
+    n_unique = len(employees)
+    
+    # 직원별 고정 속성
+    position_index = rng.choice(len(POSITIONS), size=n_unique, p=POSITION_WEIGHTS)
+    department_index = rng.choice(len(DEPARTMENTS), size=n_unique, p=DEPARTMENT_WEIGHTS)
+    salary_low = np.array([BASE_SALARY_RANGES[p][0] for p in POSITIONS])[position_index]
+    salary_high = np.array([BASE_SALARY_RANGES[p][1] for p in POSITIONS])[position_index]
+    base_by_employee = rng.integers(salary_low, salary_high + 1)
+    skill_by_employee = np.where(rng.random(n_unique) < 0.3, rng.integers(5, 31, n_unique) * 10000, 0)
+    ids = np.array([f"E{i + 1001:07d}" for i in range(n_unique)], dtype=object)
+    names = np.array([f"직원{i + 1:07d}" for i in range(n_unique)], dtype=object)
+    
+    # 행 단위 값 (rows = 인원 × 개월)
+    rows = n_employees * months
+    month_offset = np.repeat(np.arange(months), n_employees) + (start_month - 1)
+    years = start_year + month_offset // 12
+    month_values = month_offset % 12 + 1
+    
+    base_salary = base_by_employee[employee_index]
+    overtime_pay = np.where(rng.random(rows) < 0.7, rng.integers(100000, 500001, rows), 0)
+    night_shift_pay = np.where(rng.random(rows) < 0.25, rng.integers(50000, 300001, rows), 0)
+    holiday_pay = np.where(rng.random(rows) < 0.15, rng.integers(80000, 400001, rows), 0)
+    skill_allowance = skill_by_employee[employee_index]
+    allowances = rng.integers(50000, 300001, rows)
+    bonuses = np.where(month_values % 6 == 0, base_salary // 2, rng.integers(0, 200001, rows))
+    gross = base_salary + overtime_pay + night_shift_pay + holiday_pay + skill_allowance + allowances + bonuses
+    deductions = (gross * rng.uniform(0.08, 0.15, rows)).astype(np.int64)
+    
+    payroll = pd.DataFrame({
+        '사번': ids[employee_index],
+        '성명': names[employee_index],
+        '부서': np.array(DEPARTMENTS, dtype=object)[department_index][employee_index],
+        '직급': np.array(POSITIONS, dtype=object)[position_index][employee_index],
+        '기본급': base_salary,
+        '연장근무수당': overtime_pay,
+        '야근수당': night_shift_pay,
+        '휴일근무수당': holiday_pay,
+        '기술수당': skill_allowance,
+        '제수당': allowances,
+        '상여금': bonuses,
+        '공제액': deductions,
+        '실지급액': gross - deductions,
+        '년도': years,
+        '월': month_values,
+        '지급일': _period_strings(years, month_values, '25')
+    })
+    
+    result = SyntheticPayroll(payroll)
+    if details:
+        result.overtime_details = _generate_overtime_details(rng, payroll, base_salary, overtime_pay)
+        result.productivity_metrics = _generate_productivity_metrics(rng, payroll, base_salary)
+    return result
+
+
+def _generate_overtime_details(rng: np.random.Generator, payroll: pd.DataFrame,
+                               base_salary: np.ndarray, overtime_pay: np.ndarray) -> pd.DataFrame:
+    """연장근무수당이 있는 행마다 1~4건의 연장근무 기록 (금액 합계 = 연장근무수당)"""
+    rows = np.flatnonzero(overtime_pay > 0)
+    counts = rng.integers(1, 5, len(rows))
+    row_index = np.repeat(rows, counts)
+    
+    # 행별 연장근무수당을 건수만큼 무작위 비율로 나눔
+    weights = rng.random(len(row_index)) + 0.1
+    weight_sum = np.add.reduceat(weights, np.cumsum(counts) - counts)
+    share = weights / np.repeat(weight_sum, counts)
+    amount = (overtime_pay[row_index] * share).astype(np.int64)
+    
+    hourly_rate = base_salary[row_index] / (40.0 * 4.33)
+    overtime_rate = hourly_rate * 1.5
+    years = payroll['년도'].to_numpy()[row_index]
+    months = payroll['월'].to_numpy()[row_index]
+    days = rng.integers(0, 28, len(row_index))
+    
+    return pd.DataFrame({
+        'employee_id': payroll['사번'].to_numpy()[row_index],
+        'overtime_date': _period_strings(years, months, '') + DAY_LABELS[days],
+        'overtime_hours': np.round(amount / overtime_rate, 2),
+        'overtime_type': np.array(OVERTIME_TYPES, dtype=object)[rng.integers(0, len(OVERTIME_TYPES), len(row_index))],
+        'overtime_rate': np.round(overtime_rate, 2),
+        'overtime_amount': amount,
+        'approval_status': np.where(rng.random(len(row_index)) < 0.95, '승인', '대기').astype(object),
+        'department': payroll['부서'].to_numpy()[row_index],
+        'year': years,
+        'month': months
+    })
+
+
+def _generate_productivity_metrics(rng: np.random.Generator, payroll: pd.DataFrame,
+                                   base_salary: np.ndarray) -> pd.DataFrame:
+    """급여대장 행마다 월간 생산성 지표 1건"""
+    rows = len(payroll)
+    hours_worked = np.round(rng.normal(173.2, 12.0, rows).clip(120, 240), 1)
+    output_units = rng.poisson(hours_worked * 1.2).astype(np.int64)
+    quality_score = np.round(rng.beta(8, 2, rows) * 100, 1)
+    efficiency_rating = np.round(output_units / hours_worked * quality_score / 100, 3)
+    years = payroll['년도'].to_numpy()
+    months = payroll['월'].to_numpy()
+    
+    return pd.DataFrame({
+        'employee_id': payroll['사번'].to_numpy(),
+        'metric_date': _period_strings(years, months, '28'),
+        'hours_worked': hours_worked,
+        'output_units': output_units,
+        'quality_score': quality_score,
+        'efficiency_rating': efficiency_rating,
+        'cost_per_unit': np.round(base_salary / np.maximum(output_units, 1), 1),
+        'department': payroll['부서'].to_numpy(),
+        'year': years,
+        'month': months
+    })
+
+
+def write_synthetic_payroll(data: SyntheticPayroll, output_path: str) -> list:
+    """
+    확장자에 맞는 형식으로 저장 (.xlsx / .csv / .parquet)
+    
+    xlsx는 상세 데이터를 별도 시트로, csv/parquet는 '{이름}_overtime_details{확장자}' 같은
+    별도 파일로 저장한다. 급여대장은 항상 첫 시트/기본 파일이다.
+    
+    Returns:
+        list: 생성된 파일 경로 목록
+    """
+    stem, ext = os.path.splitext(output_path)
+    ext = ext.lower()
+    extra = {'overtime_details': data.overtime_details, 'productivity_metrics': data.productivity_metrics}
+    extra = {name: df for name, df in extra.items() if df is not None}
+    
+    if ext == '.xlsx':
+        too_large = [name for name, df in [('payroll', data.payroll), *extra.items()] if len(df) > EXCEL_MAX_ROWS]
+        if too_large:
+            raise ValueError(f"Excel 시트 최대 행 수({EXCEL_MAX_ROWS:,})를 넘습니다: {too_large} - csv/parquet를 사용하세요")
+        with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
+            data.payroll.to_excel(writer, sheet_name='급여대장', index=False)
+            for name, df in extra.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+        return [output_path]
+    
+    if ext not in ('.csv', '.parquet'):
+        raise ValueError(f"지원하지 않는 형식: {ext} (.xlsx, .csv, .parquet)")
+    
+    paths = []
+    for name, df in [(None, data.payroll), *extra.items()]:
+        path = output_path if name is None else f"{stem}_{name}{ext}"
+        if ext == '.csv':
+            # Excel에서 한글이 깨지지 않도록 BOM 포함
+            df.to_csv(path, index=False, encoding='utf-8-sig')
+        else:
+            df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
 if __name__ == "__main__":
-    create_dummy_payroll_excel()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="PayPulse 더미 급여대장 생성")
+    parser.add_argument('--employees', type=int, help="월별 재직 인원 (지정 시 대용량 생성기 사용)")
+    parser.add_argument('--months', type=int, default=12, help="생성할 개월 수")
+    parser.add_argument('--start', default='2025-01', help="시작 년월 (YYYY-MM)")
+    parser.add_argument('--turnover', type=float, default=0.02, help="월 이직률")
+    parser.add_argument('--seed', type=int, default=None, help="난수 시드")
+    parser.add_argument('--details', action='store_true', help="연장근무 상세 / 생산성 지표 포함")
+    parser.add_argument('--output', default='급여대장_합성.parquet', help="출력 파일 (.xlsx / .csv / .parquet)")
+    args = parser.parse_args()
+    
+    if args.employees is None:
+        create_dummy_payroll_excel()
+    else:
+        start_year, start_month = (int(value) for value in args.start.split('-'))
+        started = time.perf_counter()
+        data = generate_payroll(args.employees, args.months, start_year, start_month,
+                                args.turnover, args.seed, args.details)
+        generated = time.perf_counter() - started
+        paths = write_synthetic_payroll(data, args.output)
+        print(f"✅ 합성 급여대장 생성 완료: {len(data.payroll):,}행 ({generated:.1f}초), "
+              f"저장 {time.perf_counter() - started - generated:.1f}초")
+        for path in paths:
+            print(f"📁 {path}")
\ No newline at end of file
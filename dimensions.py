@@ -0,0 +1,157 @@
+"""
+PayPulse 차원 테이블
+dimensions - 부서/직급/근무형태/원가센터/프로젝트 문자열을 정수 키 사전(dim_*)으로 정규화
+"""
+
+import sqlite3
+from typing import Dict, List, Sequence, Tuple
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class DimensionStore:
+    """
+    원본 테이블 하나의 사전 인코딩 컬럼 묶음
+
+    라벨 컬럼 department는 원본 테이블에 정수 키 department_id로 저장되고,
+    라벨은 dim_department(id, label)에 한 번만 저장된다. 키는 적재 트랜잭션 안에서
+    encode()가 새 라벨을 추가하며 발급하므로 적재가 롤백되면 키 발급도 함께 취소된다.
+
+    조회는 정수 키로 거르고 묶은 뒤 마지막에 dim_* 를 조인하여 라벨을 붙인다.
+    월별 집계 테이블과 조회 결과의 컬럼은 라벨 그대로다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, source_table: str, columns: Sequence[str]):
+        """
+        Args:
+            connection (sqlite3.Connection): 원본 테이블이 있는 작성자 연결
+            source_table (str): 원본 테이블명
+            columns (Sequence[str]): 정수 키로 저장할 라벨 컬럼
+        """
+        self.connection = connection
+        self.source_table = source_table
+        self.columns = list(columns)
+
+    @staticmethod
+    def key(column: str) -> str:
+        """원본 테이블의 정수 키 컬럼명"""
+        return f"{column}_id"
+
+    @staticmethod
+    def table(column: str) -> str:
+        """라벨 사전 테이블명"""
+        return f"dim_{column}"
+
+    @property
+    def tables(self) -> List[str]:
+        return [self.table(col) for col in self.columns]
+
+    def storage_columns(self, columns: Sequence[str]) -> List[str]:
+        """라벨 컬럼을 정수 키 컬럼으로 바꾼 저장 컬럼 목록 (순서 유지)"""
+        return [self.key(col) if col in self.columns else col for col in columns]
+
+    def labeled_select(self, columns: Sequence[str], alias: str) -> Tuple[str, str]:
+        """
+        alias 테이블에서 columns를 라벨로 읽는 SELECT 목록과 조인 절
+
+        Returns:
+            Tuple[str, str]: ("alias.employee_id, department_dim.label AS department, ...",
+                              "LEFT JOIN dim_department AS department_dim ON ...")
+        """
+        select, joins = [], []
+        for col in columns:
+            if col in self.columns:
+                select.append(f"{col}_dim.label AS {col}")
+                joins.append(f"LEFT JOIN {self.table(col)} AS {col}_dim ON {col}_dim.id = {alias}.{self.key(col)}")
+            else:
+                select.append(f"{alias}.{col}")
+        return ", ".join(select), " ".join(joins)
+
+    def ensure_schema(self):
+        """사전 테이블 생성 및 라벨 컬럼으로 저장된 기존 원본 테이블 변환 (커밋은 호출자 담당)"""
+        cursor = self.connection.cursor()
+        for col in self.columns:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table(col)} (
+                    id INTEGER PRIMARY KEY,
+                    label TEXT NOT NULL UNIQUE
+                )
+            """)
+        self.migrate('main')
+
+    def migrate(self, schema: str = 'main') -> List[str]:
+        """
+        schema.source_table의 라벨 컬럼을 정수 키 컬럼으로 변환
+
+        라벨 컬럼을 참조하는 인덱스는 삭제되므로 호출 후 정수 키 기준 인덱스를 다시 만든다.
+        삭제한 컬럼의 공간은 VACUUM해야 파일 크기에 반영된다.
+        보관 파일(archive_YYYY)도 같은 방식으로 변환하며, 사전은 항상 주 데이터베이스에 둔다.
+
+        Args:
+            schema (str): 원본 테이블이 있는 스키마 이름
+
+        Returns:
+            List[str]: 변환한 라벨 컬럼
+        """
+        cursor = self.connection.cursor()
+        table = f"{schema}.{self.source_table}"
+        existing = {row[1] for row in cursor.execute(f"PRAGMA {schema}.table_info({self.source_table})")}
+        legacy = [col for col in self.columns if col in existing and self.key(col) not in existing]
+        if not legacy:
+            return []
+
+        for _, name, *_ in cursor.execute(f"PRAGMA {schema}.index_list({self.source_table})").fetchall():
+            indexed = {row[2] for row in cursor.execute(f"PRAGMA {schema}.index_info({name})")}
+            if indexed & set(legacy):
+                cursor.execute(f"DROP INDEX {schema}.{name}")
+
+        for col in legacy:
+            dim = f"main.{self.table(col)}"
+            cursor.execute(f"INSERT OR IGNORE INTO {dim} (label) "
+                           f"SELECT DISTINCT {col} FROM {table} WHERE {col} IS NOT NULL ORDER BY {col}")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {self.key(col)} INTEGER")
+            cursor.execute(f"UPDATE {table} SET {self.key(col)} = "
+                           f"(SELECT id FROM {dim} WHERE label = {self.source_table}.{col})")
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN {col}")
+
+        logger.info(f"{table}: 라벨 컬럼을 정수 키로 변환 ({', '.join(legacy)}), "
+                    f"파일 크기 반영은 VACUUM 후")
+        return legacy
+
+    def lookup(self, column: str) -> Dict[str, int]:
+        """라벨 → 정수 키 (작성자 연결 기준, 진행 중인 적재 트랜잭션의 새 라벨 포함)"""
+        return dict(self.connection.execute(f"SELECT label, id FROM {self.table(column)}").fetchall())
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        라벨 컬럼을 정수 키 컬럼으로 바꾼 DataFrame (처음 보는 라벨은 사전에 추가)
+
+        라벨은 문자열로 비교한다 (TEXT 컬럼에 저장될 때와 같은 값).
+        결측 라벨은 결측 키(NULL)가 된다.
+
+        Args:
+            df (pd.DataFrame): 정제된 데이터
+
+        Returns:
+            pd.DataFrame: 라벨 컬럼 대신 {column}_id (Int64) 컬럼
+        """
+        present = [col for col in self.columns if col in df.columns]
+        if not present:
+            return df
+
+        cursor = self.connection.cursor()
+        keys = {}
+        for col in present:
+            # 고유 라벨만 사전에서 찾고 행에는 위치 코드로 펼침 (결측은 코드 -1 → 마지막의 NA)
+            codes, uniques = pd.factorize(df[col])
+            labels = [label if isinstance(label, str) else str(label) for label in uniques]
+            if labels:
+                cursor.executemany(f"INSERT OR IGNORE INTO {self.table(col)} (label) VALUES (?)",
+                                   [(label,) for label in labels])
+            lookup = self.lookup(col)
+            ids = pd.array([lookup[label] for label in labels] + [pd.NA], dtype='Int64')
+            keys[self.key(col)] = pd.Series(ids.take(codes), index=df.index)
+        return df.drop(columns=present).assign(**keys)
@@ -8,41 +8,330 @@ import sqlite3
 import numpy as np
 from datetime import datetime, timedelta
 import os
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib import font_manager
-import warnings
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
-warnings.filterwarnings('ignore')
+from bulk_loader import DEFAULT_BATCH_SIZE, BulkLoadResult
+from connection_pool import ConnectionPool, serialized_write
+from columnar_export import ExportedPartition, PartitionedExporter, export_datasets
+from dimensions import DimensionStore
+from employee_history import read_employee_history
+from excel_stream import iter_excel_chunks
+from frame_dtypes import MemoryReport, constant, downcast_integer, fill_category, money, record_stage, to_category
+from instrumentation import MetricsRegistry, default_registry, instrumented
+from ingest_ledger import IngestLedger, MergeResult
+from parallel_ingest import FileIngestReport, list_excel_files, run_parallel_ingest
+from kpi_engine import KpiEngine, KpiResult, MetricDefinition
+from period_catalog import Period, PeriodCatalog, shift_period
+from storage_backend import StorageBackend, create_backend
+from year_archive import YearArchive
+from rollups import RollupSpec, RollupStore
+from query_cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, QueryCache, cached_query
+from report_writer import ReportSheet, ReportWriteResult, StreamingReportWriter
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 시각화 라이브러리는 처음 사용할 때 불러옴 (모듈 import 시간 단축)
+_pyplot = None
+
+
+def get_pyplot():
+    """
+    한글 폰트가 설정된 matplotlib.pyplot 반환 (최초 호출 시 import 및 설정)
+    
+    Returns:
+        module: matplotlib.pyplot
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        
+        plt.rcParams['font.family'] = 'Malgun Gothic'
+        plt.rcParams['axes.unicode_minus'] = False
+        _pyplot = plt
+    return _pyplot
+
+
 class DirectLaborCostManager:
     """직접 인건비 전문 관리 시스템"""
     
-    def __init__(self, db_path: str = "direct_labor.db"):
+    # direct_labor 테이블 저장 컬럼 순서
+    DIRECT_LABOR_COLUMNS = [
+        'employee_id', 'employee_name', 'department', 'position', 'work_type',
+        'base_salary', 'overtime_pay', 'night_shift_pay', 'holiday_pay', 'skill_allowance',
+        'direct_total', 'work_hours', 'overtime_hours', 'hourly_rate', 'overtime_rate',
+        'productivity_score', 'cost_center', 'project_code', 'payment_date', 'year', 'month'
+    ]
+    
+    # 정수 키(dim_* 사전)로 저장하는 라벨 컬럼
+    DIRECT_LABOR_DIMENSIONS = ['department', 'position', 'work_type', 'cost_center', 'project_code']
+    
+    # 월별 집계 테이블 측정값 (평균은 조회 시 합계 * 1.0 / 인원으로 계산)
+    # 집계 컬럼은 NUMERIC이라 정수로 떨어지는 실수 합계는 INTEGER로 저장되므로 * 1.0 없이 나누면 정수 나눗셈
+    # ot_ 접두사는 연장근무가 있는 직원(overtime_hours > 0)만 대상으로 한 값
+    DIRECT_LABOR_MEASURES = {
+        'employee_count': 'COUNT(*)',
+        'total_direct_cost': 'SUM(direct_total)',
+        'total_base_salary': 'SUM(base_salary)',
+        'total_overtime': 'SUM(overtime_pay)',
+        'total_overtime_hours': 'SUM(overtime_hours)',
+        'sum_hourly_rate': 'SUM(hourly_rate)',
+        'sum_productivity': 'SUM(productivity_score)',
+        'ot_employee_count': 'SUM(overtime_hours > 0)',
+        'ot_total_hours': 'SUM(CASE WHEN overtime_hours > 0 THEN overtime_hours ELSE 0 END)',
+        'ot_max_hours': 'MAX(CASE WHEN overtime_hours > 0 THEN overtime_hours END)',
+        'ot_total_pay': 'SUM(CASE WHEN overtime_hours > 0 THEN overtime_pay ELSE 0 END)',
+        'ot_direct_total': 'SUM(CASE WHEN overtime_hours > 0 THEN direct_total ELSE 0 END)'
+    }
+    
+    # 기간 전체 / 부서별 / 직급별 집계 테이블
+    DIRECT_LABOR_ROLLUPS = [
+        RollupSpec('direct_labor_period_rollup', (), DIRECT_LABOR_MEASURES),
+        RollupSpec('direct_labor_dept_rollup', ('department',), DIRECT_LABOR_MEASURES),
+        RollupSpec('direct_labor_position_rollup', ('position',), DIRECT_LABOR_MEASURES)
+    ]
+    
+    # 대시보드 KPI 지표
+    DASHBOARD_METRICS = [
+        MetricDefinition('total_direct_cost', '총 직접 인건비', 'SUM(direct_total)', '원',
+                         '월간 직접 인건비 총액', ','),
+        MetricDefinition('avg_hourly_rate', '평균 시간당 임금', 'AVG(hourly_rate)', '원',
+                         '전체 직원 평균', ',.0f'),
+        MetricDefinition('total_overtime_hours', '총 연장근무 시간', 'SUM(overtime_hours)', '시간',
+                         '월간 총 연장근무', ',.1f'),
+        MetricDefinition('overtime_ratio', '연장근무비 비율', 'SUM(overtime_pay) * 100.0 / SUM(direct_total)', '%',
+                         '직접인건비 대비', '.1f'),
+        MetricDefinition('avg_productivity', '평균 생산성 점수', 'AVG(productivity_score)', '점',
+                         '100점 만점', '.1f')
+    ]
+    
+    # 종합 분석 항목별 조회 (year, month)
+    ANALYSIS_QUERIES = {
+        # 부서별 직접 인건비 분석 (집계 테이블)
+        'department_analysis': """
+            SELECT 
+                department,
+                employee_count,
+                total_direct_cost,
+                total_direct_cost * 1.0 / employee_count as avg_direct_cost,
+                total_base_salary,
+                total_overtime,
+                sum_hourly_rate * 1.0 / employee_count as avg_hourly_rate,
+                sum_productivity * 1.0 / employee_count as avg_productivity
+            FROM direct_labor_dept_rollup 
+            WHERE year = ? AND month = ?
+            ORDER BY total_direct_cost DESC
+        """,
+        # 직급별 분석 (집계 테이블)
+        'position_analysis': """
+            SELECT 
+                position,
+                employee_count,
+                total_base_salary * 1.0 / employee_count as avg_base_salary,
+                total_overtime * 1.0 / employee_count as avg_overtime_pay,
+                sum_hourly_rate * 1.0 / employee_count as avg_hourly_rate,
+                total_overtime_hours * 1.0 / employee_count as avg_overtime_hours
+            FROM direct_labor_position_rollup 
+            WHERE year = ? AND month = ?
+            ORDER BY avg_base_salary DESC
+        """,
+        # 시간당 비용 효율성 분석 (직원별)
+        'efficiency_analysis': """
+            SELECT 
+                d.employee_id,
+                d.employee_name,
+                dept.label as department,
+                pos.label as position,
+                d.hourly_rate,
+                d.productivity_score,
+                (d.direct_total / (d.work_hours + d.overtime_hours)) as cost_per_hour,
+                (d.productivity_score / d.hourly_rate * 100) as efficiency_index
+            FROM direct_labor d
+            LEFT JOIN dim_department dept ON dept.id = d.department_id
+            LEFT JOIN dim_position pos ON pos.id = d.position_id
+            WHERE d.year = ? AND d.month = ?
+            ORDER BY efficiency_index DESC
+        """,
+        # 연장근무 패턴 분석 (부서 키로 묶은 뒤 라벨 조인)
+        'overtime_pattern': """
+            SELECT 
+                dept.label as department,
+                g.overtime_category,
+                g.employee_count,
+                g.avg_overtime_pay
+            FROM (
+                SELECT 
+                    department_id,
+                    CASE 
+                        WHEN overtime_hours = 0 THEN '연장근무 없음'
+                        WHEN overtime_hours <= 10 THEN '연장근무 적음 (≤10h)'
+                        WHEN overtime_hours <= 20 THEN '연장근무 보통 (11-20h)'
+                        ELSE '연장근무 많음 (>20h)'
+                    END as overtime_category,
+                    COUNT(*) as employee_count,
+                    AVG(overtime_pay) as avg_overtime_pay
+                FROM direct_labor 
+                WHERE year = ? AND month = ?
+                GROUP BY department_id, overtime_category
+            ) g
+            LEFT JOIN dim_department dept ON dept.id = g.department_id
+            ORDER BY department, g.overtime_category
+        """
+    }
+    
+    # 부서별 연장근무 추이 (기간 범위, 선택 필터는 {filters} / {page_filter} / {limit}에 삽입)
+    # 증가율은 직전 기간(LAG)과 비교하므로 범위 시작 직전 한 달도 읽은 뒤 결과에서 제외한다.
+    OVERTIME_TREND_QUERY = """
+        WITH trend AS (
+            SELECT 
+                year,
+                month,
+                department,
+                ot_employee_count as employee_count,
+                ot_total_hours as total_overtime_hours,
+                ot_total_hours * 1.0 / ot_employee_count as avg_overtime_hours,
+                ot_total_pay as total_overtime_pay,
+                ot_total_pay * 1.0 / ot_employee_count as avg_overtime_pay,
+                ot_max_hours as max_overtime_hours,
+                (ot_total_pay * 100.0 / ot_direct_total) as overtime_ratio,
+                LAG(ot_total_hours) OVER (PARTITION BY department ORDER BY year, month) as previous_hours
+            FROM direct_labor_dept_rollup
+            WHERE (year, month) BETWEEN (?, ?) AND (?, ?)
+            AND ot_employee_count > 0{filters}
+        )
+        SELECT 
+            year, month, department, employee_count, total_overtime_hours, avg_overtime_hours,
+            total_overtime_pay, avg_overtime_pay, max_overtime_hours, overtime_ratio,
+            (total_overtime_hours - previous_hours) * 100.0 / NULLIF(previous_hours, 0) as overtime_growth
+        FROM trend
+        WHERE (year, month) >= (?, ?){page_filter}
+        ORDER BY department, year, month{limit}
+    """
+    
+    # 시간당 비용 분석 조회 (year, month)
+    HOURLY_COST_QUERY = """
+        SELECT 
+            dept.label as department,
+            pos.label as position,
+            d.employee_name,
+            d.hourly_rate,
+            d.overtime_rate,
+            (d.work_hours + d.overtime_hours) as total_hours,
+            d.direct_total,
+            (d.direct_total / (d.work_hours + d.overtime_hours)) as actual_hourly_cost,
+            d.productivity_score,
+            (d.productivity_score / (d.direct_total / (d.work_hours + d.overtime_hours)) * 100) as cost_efficiency
+        FROM direct_labor d
+        LEFT JOIN dim_department dept ON dept.id = d.department_id
+        LEFT JOIN dim_position pos ON pos.id = d.position_id
+        WHERE d.year = ? AND d.month = ?
+        AND (d.work_hours + d.overtime_hours) > 0
+        ORDER BY cost_efficiency DESC
+    """
+    
+    # 직접 인건비 상세 데이터 조회 (year, month)
+    DETAILED_DIRECT_LABOR_QUERY = """
+        SELECT 
+            d.employee_id,
+            d.employee_name,
+            dept.label as department,
+            pos.label as position,
+            wt.label as work_type,
+            d.base_salary,
+            d.overtime_pay,
+            d.night_shift_pay,
+            d.holiday_pay,
+            d.skill_allowance,
+            d.direct_total,
+            d.work_hours,
+            d.overtime_hours,
+            d.hourly_rate,
+            d.overtime_rate,
+            d.productivity_score,
+            cc.label as cost_center,
+            d.year,
+            d.month
+        FROM direct_labor d
+        LEFT JOIN dim_department dept ON dept.id = d.department_id
+        LEFT JOIN dim_position pos ON pos.id = d.position_id
+        LEFT JOIN dim_work_type wt ON wt.id = d.work_type_id
+        LEFT JOIN dim_cost_center cc ON cc.id = d.cost_center_id
+        WHERE d.year = ? AND d.month = ?
+        ORDER BY department, d.direct_total DESC
+    """
+    
+    # Excel 컬럼명 표준화 매핑
+    COLUMN_MAPPING = {
+        '사번': 'employee_id',
+        '성명': 'employee_name',
+        '이름': 'employee_name',
+        '부서': 'department',
+        '직급': 'position',
+        '직책': 'position',
+        '기본급': 'base_salary',
+        '연장근무수당': 'overtime_pay',
+        '야근수당': 'night_shift_pay',
+        '휴일근무수당': 'holiday_pay',
+        '기술수당': 'skill_allowance',
+        '제수당': 'allowances',
+        '지급일': 'payment_date',
+        '년도': 'year',
+        '월': 'month'
+    }
+    
+    # 필수 컬럼
+    REQUIRED_COLUMNS = ['employee_id', 'employee_name', 'department', 'base_salary']
+    
+    def __init__(self, db_path: str = "direct_labor.db", batch_size: int = DEFAULT_BATCH_SIZE,
+                 cache_size: int = DEFAULT_CACHE_SIZE, cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 metrics: Optional[MetricsRegistry] = None, analytics_backend: str = 'sqlite',
+                 mirror_dir: Optional[str] = None, archive_dir: Optional[str] = None):
         """
         DirectLaborCostManager 초기화
         
         Args:
             db_path (str): SQLite 데이터베이스 파일 경로
+            batch_size (int): 대량 저장 시 executemany 배치 크기
+            cache_size (int): 조회 결과 캐시 항목 수 (0이면 캐시 사용 안 함)
+            cache_ttl (Optional[float]): 조회 결과 캐시 유효 시간(초)
+            metrics (Optional[MetricsRegistry]): 실행 계측 집계기 (None이면 프로세스 공용 default_registry)
+            analytics_backend (str): 분석 조회 백엔드 ('sqlite' 또는 Parquet 미러 위의 'duckdb')
+            mirror_dir (Optional[str]): duckdb 백엔드의 Parquet 미러 디렉터리 (None이면 '{db_path}.mirror')
+            archive_dir (Optional[str]): 연도별 보관 파일 디렉터리 (None이면 '{db_path}.archive')
         """
         self.db_path = db_path
+        self.batch_size = batch_size
+        # 메서드별 실행 시간, SQL 문 수/시간, 캐시 적중 기록 (metrics.to_prometheus()로 출력)
+        self.metrics = metrics if metrics is not None else default_registry
+        self.pool: Optional[ConnectionPool] = None
         self.connection = None
+        self.last_load_result: Optional[BulkLoadResult] = None
+        self.last_merge_result: Optional[MergeResult] = None
+        self.ledger: Optional[IngestLedger] = None
+        self.dimensions: Optional[DimensionStore] = None
+        self.rollups: Optional[RollupStore] = None
+        self.periods: Optional[PeriodCatalog] = None
+        self.kpis: Optional[KpiEngine] = None
+        self.analytics_backend = analytics_backend
+        self.mirror_dir = mirror_dir
+        self.backend: Optional[StorageBackend] = None
+        self.archive_dir = archive_dir
+        self.archive: Optional[YearArchive] = None
+        self.last_report_result: Optional[ReportWriteResult] = None
+        # 마지막 Excel 전체 적재의 정제 단계별 메모리
+        self.last_memory_report: Optional[MemoryReport] = None
+        # 저장 시 invalidate()로 무효화, 다른 연결의 변경은 PRAGMA data_version으로 감지
+        self.cache = QueryCache(cache_size, cache_ttl, external_version=self._data_version)
         self._initialize_database()
         logger.info(f"DirectLaborCostManager 초기화 완료: {db_path}")
     
     def _initialize_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # 작성자 연결은 적재 전용, 조회는 self.reader (스레드별 읽기 전용 연결)
+            self.pool = ConnectionPool(self.db_path, metrics=self.metrics)
+            self.connection = self.pool.writer
             cursor = self.connection.cursor()
             
             # 직접 인건비 테이블 생성
@@ -51,9 +340,9 @@ class DirectLaborCostManager:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     employee_id TEXT NOT NULL,
                     employee_name TEXT NOT NULL,
-                    department TEXT NOT NULL,
-                    position TEXT,
-                    work_type TEXT DEFAULT '정규직',
+                    department_id INTEGER NOT NULL,
+                    position_id INTEGER,
+                    work_type_id INTEGER,
                     base_salary INTEGER,
                     overtime_pay INTEGER DEFAULT 0,
                     night_shift_pay INTEGER DEFAULT 0,
@@ -65,8 +354,8 @@ class DirectLaborCostManager:
                     hourly_rate REAL,
                     overtime_rate REAL,
                     productivity_score REAL DEFAULT 100.0,
-                    cost_center TEXT,
-                    project_code TEXT,
+                    cost_center_id INTEGER,
+                    project_code_id INTEGER,
                     payment_date DATE,
                     year INTEGER,
                     month INTEGER,
@@ -109,24 +398,69 @@ class DirectLaborCostManager:
                 )
             """)
             
+            # 부서/직급/근무형태/원가센터/프로젝트 사전 (라벨 컬럼으로 저장된 기존 테이블은 정수 키로 변환)
+            self.dimensions = DimensionStore(self.connection, 'direct_labor', self.DIRECT_LABOR_DIMENSIONS)
+            self.dimensions.ensure_schema()
+            
             # 인덱스 생성
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_direct_labor_dept_date ON direct_labor(department, year, month)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_direct_labor_dept_date "
+                           "ON direct_labor(department_id, year, month)")
+            # 기간 우선 조회용
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_direct_labor_period "
+                           "ON direct_labor(year, month, department_id, direct_total DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_overtime_employee_date ON overtime_details(employee_id, overtime_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_productivity_date ON productivity_metrics(metric_date)")
             
+            # 적재 원장 (파일/기간/행 해시) 및 (사번, 년, 월) 고유 키
+            self.ledger = IngestLedger(self.connection, 'direct_labor', self.DIRECT_LABOR_COLUMNS,
+                                       batch_size=self.batch_size, dimensions=self.dimensions)
+            self.ledger.ensure_schema()
+            self.ledger.ensure_unique_key()
+            
+            # 월별 집계 테이블 (적재 시 변경된 기간만 갱신)
+            self.rollups = RollupStore(self.connection, 'direct_labor', self.DIRECT_LABOR_ROLLUPS,
+                                       self.dimensions)
+            self.rollups.ensure_schema()
+            # 부서별 연장근무 추이 (부서 필터 / 부서 순 키셋 페이지)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_direct_labor_dept_rollup_department "
+                           "ON direct_labor_dept_rollup(department, year, month)")
+            
+            # 기간 카탈로그 (최신 기간 조회용)
+            self.periods = PeriodCatalog(self.connection, 'direct_labor', reader=self.pool.reader)
+            self.periods.ensure_schema()
+            
+            # 연도별 보관 저장소 (지난 연도는 roll_year()로 별도 파일에 보관)
+            self.archive = YearArchive(self.pool, 'direct_labor', self.archive_dir)
+            self.archive.ensure_schema()
+            
             self.connection.commit()
+            # 변환 전에 보관한 연도 파일도 같은 스키마로 변환
+            self.archive.upgrade(self.dimensions.migrate)
+            
+            # 분석 조회 백엔드 (적재/기간 카탈로그/내보내기는 항상 SQLite)
+            # 읽기 연결이 스키마를 볼 수 있도록 커밋 후 생성
+            self.backend = create_backend(self.analytics_backend, self.pool, 'direct_labor',
+                                          ['direct_labor'] + [spec.table for spec in self.DIRECT_LABOR_ROLLUPS],
+                                          self.mirror_dir, self.archive, lookups=self.dimensions.tables)
+            
+            # 단일 스캔 KPI 엔진
+            self.kpis = KpiEngine(self.connection, 'direct_labor', self.DASHBOARD_METRICS,
+                                  reader=self.backend.reader)
+            
             logger.info("직접 인건비 데이터베이스 테이블 초기화 완료")
             
         except Exception as e:
             logger.error(f"데이터베이스 초기화 오류: {e}")
             raise
     
-    def load_from_excel(self, excel_path: str) -> bool:
+    @instrumented
+    def load_from_excel(self, excel_path: str, chunksize: Optional[int] = None) -> bool:
         """
         Excel 급여대장 파일에서 직접 인건비 데이터 로드
         
         Args:
             excel_path (str): Excel 파일 경로
+            chunksize (Optional[int]): 지정 시 읽기 전용 스트리밍 모드로 청크 단위 적재
             
         Returns:
             bool: 로드 성공 여부
@@ -136,68 +470,159 @@ class DirectLaborCostManager:
                 logger.error(f"파일을 찾을 수 없습니다: {excel_path}")
                 return False
             
+            # 같은 내용의 파일이 적재된 뒤 해당 기간이 바뀌지 않았으면 파싱 없이 생략
+            file_hash = self.ledger.file_hash(excel_path)
+            if self.ledger.is_file_loaded(file_hash):
+                logger.info(f"변경 없는 파일, 적재 생략: {excel_path}")
+                return True
+            
+            if chunksize:
+                return self._load_excel_streaming(excel_path, chunksize, file_hash)
+            
             # Excel 파일 읽기
             df = pd.read_excel(excel_path)
             logger.info(f"Excel 파일 로드 완료: {len(df)}행")
             
-            # 컬럼명 표준화
-            column_mapping = {
-                '사번': 'employee_id',
-                '성명': 'employee_name', 
-                '이름': 'employee_name',
-                '부서': 'department',
-                '직급': 'position',
-                '직책': 'position',
-                '기본급': 'base_salary',
-                '연장근무수당': 'overtime_pay',
-                '야근수당': 'night_shift_pay',
-                '휴일근무수당': 'holiday_pay',
-                '기술수당': 'skill_allowance',
-                '제수당': 'allowances',
-                '지급일': 'payment_date',
-                '년도': 'year',
-                '월': 'month'
-            }
-            
-            # 컬럼명 변경
-            df = df.rename(columns=column_mapping)
-            
-            # 필수 컬럼 확인
-            required_columns = ['employee_id', 'employee_name', 'department', 'base_salary']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                logger.error(f"필수 컬럼이 없습니다: {missing_columns}")
+            report = MemoryReport('direct_labor')
+            df = self._prepare_direct_labor_frame(df, report)
+            if df is None:
                 return False
-            
-            # 직접 인건비 데이터 정제
-            df = self._clean_direct_labor_data(df)
+            self.last_memory_report = report
+            logger.info(report.format())
             
             # 데이터베이스에 저장
-            return self._save_direct_labor_to_database(df)
+            return self._save_direct_labor_to_database(df, file_hash=file_hash, source_path=excel_path)
             
         except Exception as e:
             logger.error(f"Excel 파일 로드 오류: {e}")
             return False
     
-    def _clean_direct_labor_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """직접 인건비 데이터 정제"""
+    @instrumented
+    @serialized_write
+    def _load_excel_streaming(self, excel_path: str, chunksize: int, file_hash: Optional[str] = None) -> bool:
+        """
+        Excel 파일을 청크 단위로 읽어 정제 후 바로 저장 (메모리 사용량 일정)
+        
+        모든 청크는 하나의 트랜잭션으로 저장되며, 중간에 실패하면 전체를 롤백한다.
+        """
+        start = time.perf_counter()
+        total_rows = 0
+        total_batches = 0
         try:
+            self.ledger.begin()
+            for chunk in iter_excel_chunks(excel_path, chunksize):
+                chunk = self._prepare_direct_labor_frame(chunk)
+                if chunk is None:
+                    self.connection.rollback()
+                    return False
+                
+                result = self.ledger.stage(chunk)
+                total_rows += result.rows
+                total_batches += result.batches
+            
+            merge = self.ledger.merge()
+            self._refresh_derived(merge.periods_changed)
+            self._commit_load(total_rows, total_batches, merge, start, file_hash, excel_path)
+            logger.info(f"스트리밍 적재 완료: {total_rows}행, 기록 {merge.rows_written}행, 삭제 {merge.rows_deleted}행, "
+                        f"변경 없음 {merge.rows_unchanged}행 ({self.last_load_result.rows_per_sec:,.0f}행/초)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"스트리밍 적재 오류: {e}")
+            self.connection.rollback()
+            return False
+    
+    @instrumented
+    def load_directory(self, directory: str, workers: Optional[int] = None) -> List[FileIngestReport]:
+        """
+        디렉터리 안의 모든 Excel 급여대장을 병렬로 파싱하여 적재
+        
+        Args:
+            directory (str): Excel 파일이 있는 디렉터리
+            workers (Optional[int]): 파싱 작업자 프로세스 수 (None이면 CPU 수)
+            
+        Returns:
+            List[FileIngestReport]: 파일별 성공/실패 결과
+        """
+        if not os.path.isdir(directory):
+            logger.error(f"디렉터리를 찾을 수 없습니다: {directory}")
+            return []
+        
+        # 이미 적재된 뒤 바뀌지 않았거나 같은 디렉터리 안에서 내용이 중복된 파일은 파싱하지 않음.
+        # 다시 적재할 파일이 하나라도 나오면 같은 기간을 덮어쓸 수 있으므로 이름순으로 그 뒤의 파일도
+        # 모두 적재한다 (같은 기간은 뒤 파일이 최종 결과)
+        file_hashes = {}
+        skipped = []
+        for path in list_excel_files(directory):
+            file_hash = self.ledger.file_hash(path)
+            if file_hash in file_hashes.values() or (not file_hashes and self.ledger.is_file_loaded(file_hash)):
+                skipped.append(FileIngestReport(path, True, skipped=True))
+            else:
+                file_hashes[path] = file_hash
+        
+        def _write(path: str, df: pd.DataFrame) -> bool:
+            return self._save_direct_labor_to_database(df, file_hash=file_hashes[path], source_path=path)
+        
+        reports = run_parallel_ingest(list(file_hashes), _parse_direct_labor_file, _write, workers=workers)
+        reports = sorted(reports + skipped, key=lambda report: report.path)
+        
+        succeeded = sum(1 for report in reports if report.success)
+        logger.info(f"디렉터리 적재 완료: {succeeded}/{len(reports)}개 파일 성공")
+        return reports
+    
+    @classmethod
+    def _prepare_direct_labor_frame(cls, df: pd.DataFrame,
+                                    memory_report: Optional[MemoryReport] = None) -> Optional[pd.DataFrame]:
+        """컬럼명 표준화, 필수 컬럼 확인 후 직접 인건비 데이터 정제 (필수 컬럼 누락 시 None)"""
+        # 컬럼명 변경
+        df = df.rename(columns=cls.COLUMN_MAPPING)
+        
+        # 필수 컬럼 확인
+        missing_columns = [col for col in cls.REQUIRED_COLUMNS if col not in df.columns]
+        
+        if missing_columns:
+            logger.error(f"필수 컬럼이 없습니다: {missing_columns}")
+            return None
+        
+        # 데이터 정제
+        return cls._clean_direct_labor_data(df, memory_report)
+    
+    @classmethod
+    def _clean_direct_labor_data(cls, df: pd.DataFrame,
+                                 memory_report: Optional[MemoryReport] = None) -> pd.DataFrame:
+        """
+        직접 인건비 데이터 정제 (입력을 제자리에서 수정)
+        
+        금액은 축소 정수형, 차원 컬럼과 지급일은 category, 상수 컬럼은 단일 범주/작은 숫자형으로 둔다
+        (frame_dtypes 정책). 시간당 임금 등 계산값은 float64로 유지한다.
+        
+        Args:
+            df (pd.DataFrame): 표준 컬럼명의 급여 데이터
+            memory_report (Optional[MemoryReport]): 지정 시 단계별 메모리 기록
+            
+        Returns:
+            pd.DataFrame: 정제된 데이터
+        """
+        try:
+            record_stage(memory_report, '입력', df)
+            
             # 숫자 컬럼 처리
             numeric_columns = ['base_salary', 'overtime_pay', 'night_shift_pay', 'holiday_pay', 'skill_allowance']
             for col in numeric_columns:
                 if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+                    df[col] = money(df[col])
                 else:
-                    df[col] = 0
+                    df[col] = constant(0, df.index)
             
-            # 직접 인건비 총액 계산
-            df['direct_total'] = (df['base_salary'] + df['overtime_pay'] + 
-                                df['night_shift_pay'] + df['holiday_pay'] + df['skill_allowance'])
+            # 직접 인건비 총액 계산 (축소 정수형 합계 오버플로 방지를 위해 int64로 계산)
+            df['direct_total'] = downcast_integer(
+                df['base_salary'].astype(np.int64) + df['overtime_pay'] +
+                df['night_shift_pay'] + df['holiday_pay'] + df['skill_allowance'])
             
-            # 시간당 임금 계산 (기본 주 40시간 기준)
-            df['work_hours'] = 40.0  # 기본 근무시간
-            df['hourly_rate'] = df['base_salary'] / (df['work_hours'] * 4.33)  # 월 평균 근무시간
+            # 시간당 임금 계산 (기본 주 40시간 기준, 계산은 상수 스칼라로)
+            work_hours = 40.0  # 기본 근무시간
+            df['work_hours'] = constant(work_hours, df.index)
+            df['hourly_rate'] = df['base_salary'] / (work_hours * 4.33)  # 월 평균 근무시간
             
             # 연장근무 시간 추정 (연장근무수당을 시간당 임금의 1.5배로 가정)
             df['overtime_rate'] = df['hourly_rate'] * 1.5
@@ -205,25 +630,27 @@ class DirectLaborCostManager:
                                           df['overtime_pay'] / df['overtime_rate'], 0)
             
             # 생산성 점수 (기본 100점으로 설정)
-            df['productivity_score'] = 100.0
+            df['productivity_score'] = constant(100.0, df.index)
             
             # 년월 정보 처리
             current_date = datetime.now()
-            if 'year' not in df.columns:
-                df['year'] = current_date.year
-            if 'month' not in df.columns:
-                df['month'] = current_date.month
+            df['year'] = downcast_integer(df['year']) if 'year' in df.columns else constant(current_date.year, df.index)
+            df['month'] = (downcast_integer(df['month']) if 'month' in df.columns
+                           else constant(current_date.month, df.index))
             
             # 지급일 처리
             if 'payment_date' not in df.columns:
-                df['payment_date'] = f"{df['year'].iloc[0]}-{df['month'].iloc[0]:02d}-25"
+                df['payment_date'] = constant(f"{df['year'].iloc[0]}-{df['month'].iloc[0]:02d}-25", df.index)
+            record_stage(memory_report, '숫자', df)
             
             # 빈 값 처리
-            df['position'] = df['position'].fillna('일반')
-            df['department'] = df['department'].fillna('미분류')
-            df['work_type'] = '정규직'
+            df['position'] = fill_category(df['position'], '일반')
+            df['department'] = fill_category(df['department'], '미분류')
+            df['work_type'] = constant('정규직', df.index)
             df['cost_center'] = df['department']
-            df['project_code'] = 'DEFAULT'
+            df['project_code'] = constant('DEFAULT', df.index)
+            df['payment_date'] = to_category(df['payment_date'])
+            record_stage(memory_report, '범주', df)
             
             logger.info(f"직접 인건비 데이터 정제 완료: {len(df)}행")
             return df
@@ -232,39 +659,31 @@ class DirectLaborCostManager:
             logger.error(f"데이터 정제 오류: {e}")
             raise
     
-    def _save_direct_labor_to_database(self, df: pd.DataFrame) -> bool:
-        """정제된 직접 인건비 데이터를 데이터베이스에 저장"""
-        try:
-            cursor = self.connection.cursor()
-            
-            # 기존 데이터 삭제 (같은 년월)
-            if not df.empty:
-                year = df['year'].iloc[0]
-                month = df['month'].iloc[0]
-                cursor.execute("DELETE FROM direct_labor WHERE year = ? AND month = ?", (year, month))
-            
-            # 새 데이터 삽입
-            for _, row in df.iterrows():
-                cursor.execute("""
-                    INSERT INTO direct_labor (
-                        employee_id, employee_name, department, position, work_type,
-                        base_salary, overtime_pay, night_shift_pay, holiday_pay, skill_allowance,
-                        direct_total, work_hours, overtime_hours, hourly_rate, overtime_rate,
-                        productivity_score, cost_center, project_code, payment_date, year, month
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['employee_id'], row['employee_name'], row['department'], 
-                    row['position'], row['work_type'],
-                    row['base_salary'], row['overtime_pay'], row['night_shift_pay'],
-                    row['holiday_pay'], row['skill_allowance'], row['direct_total'],
-                    row['work_hours'], row['overtime_hours'], row['hourly_rate'],
-                    row['overtime_rate'], row['productivity_score'],
-                    row['cost_center'], row['project_code'], row['payment_date'],
-                    row['year'], row['month']
-                ))
+    @instrumented
+    @serialized_write
+    def _save_direct_labor_to_database(self, df: pd.DataFrame, file_hash: Optional[str] = None,
+                                       source_path: Optional[str] = None) -> bool:
+        """
+        정제된 직접 인건비 데이터를 데이터베이스에 저장
+        
+        입력에 포함된 모든 (년, 월)을 (사번, 년, 월) 기준으로 upsert 병합한다.
+        적재 원장과 내용이 같은 기간과 행은 건너뛰고, 원본에서 사라진 행은 삭제한다.
+        
+        Args:
+            df (pd.DataFrame): 정제된 데이터
+            file_hash (Optional[str]): 원본 파일 해시 (지정 시 적재 원장에 기록)
+            source_path (Optional[str]): 원본 파일 경로
             
-            self.connection.commit()
-            logger.info(f"직접 인건비 데이터베이스 저장 완료: {len(df)}행")
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            start = time.perf_counter()
+            staged, merge = self._stage_and_merge(df)
+            self._commit_load(len(df), staged.batches, merge, start, file_hash, source_path)
+            logger.info(f"직접 인건비 데이터베이스 저장 완료: {len(df)}행, 기록 {merge.rows_written}행, 삭제 {merge.rows_deleted}행, "
+                        f"변경 없음 {merge.rows_unchanged}행, 생략 기간 {len(merge.periods_skipped)}개 "
+                        f"({self.last_load_result.rows_per_sec:,.0f}행/초)")
             return True
             
         except Exception as e:
@@ -272,41 +691,124 @@ class DirectLaborCostManager:
             self.connection.rollback()
             return False
     
-    def get_overtime_trend(self, months: int = 12) -> pd.DataFrame:
+    @instrumented
+    def _stage_and_merge(self, df: pd.DataFrame) -> Tuple[BulkLoadResult, MergeResult]:
+        """
+        적재 트랜잭션 안에서 스테이징, 병합, 파생 테이블 갱신 (커밋은 호출자)
+        
+        Args:
+            df (pd.DataFrame): 정제된 데이터
+            
+        Returns:
+            Tuple[BulkLoadResult, MergeResult]: 스테이징 결과와 병합 결과
+        """
+        self.ledger.begin()
+        staged = self.ledger.stage(df, complete=True)
+        merge = self.ledger.merge()
+        self._refresh_derived(merge.periods_changed)
+        return staged, merge
+    
+    @instrumented
+    def _commit_load(self, rows: int, batches: int, merge: MergeResult, start: float,
+                     file_hash: Optional[str] = None, source_path: Optional[str] = None):
+        """적재 원장 기록 후 커밋하고 조회 캐시 무효화 및 적재 결과 갱신"""
+        if file_hash:
+            self.ledger.record_file(file_hash, source_path, rows, merge.periods)
+        self.connection.commit()
+        self._finish_load(rows, batches, merge, start)
+    
+    def _finish_load(self, rows: int, batches: int, merge: MergeResult, start: float):
+        """커밋 후 조회 캐시 무효화, 분석 백엔드 동기화 및 적재 결과 갱신"""
+        self.cache.invalidate()
+        self._refresh_backend()
+        self.last_load_result = BulkLoadResult(table='direct_labor', rows=rows, batches=batches,
+                                               elapsed=time.perf_counter() - start)
+        self.last_merge_result = merge
+    
+    def _refresh_derived(self, periods: List[Period]):
+        """적재 트랜잭션 안에서 변경된 기간의 집계 테이블과 기간 카탈로그 갱신"""
+        self.archive.check_writable(periods)
+        self.rollups.refresh(periods)
+        self.periods.refresh(periods)
+    
+    def _refresh_backend(self):
+        """커밋된 변경을 분석 조회 백엔드에 반영 (실패해도 적재는 유지, 다음 커밋에서 다시 동기화)"""
+        try:
+            self.backend.refresh()
+        except Exception as e:
+            logger.error(f"분석 백엔드 동기화 오류 ({self.backend.name}): {e}")
+    
+    @property
+    def reader(self) -> sqlite3.Connection:
+        """호출 스레드 전용 읽기 전용 연결 (메모리 DB는 작성자 연결)"""
+        return self.pool.reader()
+    
+    def _data_version(self) -> int:
+        """
+        다른 연결이 커밋할 때마다 바뀌는 SQLite 데이터 버전
+
+        호출 스레드의 읽기 연결에서 조회하므로 작성자 연결의 커밋도 감지하고,
+        작성자 연결을 기다리거나 다른 스레드의 쓰기 트랜잭션 중간에 끼어들지 않는다.
+        """
+        return self.reader.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _resolve_period(self, year: Optional[int] = None, month: Optional[int] = None) -> Optional[Period]:
+        """조회 대상 (년, 월) 결정 - 년월이 모두 지정되지 않으면 카탈로그의 최신 기간"""
+        if year and month:
+            return (year, month)
+        return self.periods.latest()
+    
+    @instrumented
+    @cached_query
+    def get_overtime_trend(self, months: int = 12, start: Optional[Period] = None, end: Optional[Period] = None,
+                           departments: Optional[Tuple[str, ...]] = None,
+                           after: Optional[Tuple[str, int, int]] = None,
+                           limit: Optional[int] = None) -> pd.DataFrame:
         """
         연장근무 트렌드 분석
         
+        부서별 월 집계에서 기간 범위를 인덱스로 조회하고, 증가율은 SQL 창 함수(LAG)로 계산한다.
+        결과는 (부서, 년, 월) 순이며 after/limit으로 키셋 페이지 조회가 가능하다.
+        
         Args:
-            months (int): 분석할 개월 수
+            months (int): 분석할 개월 수 (start를 지정하지 않을 때 end부터 거슬러 올라갈 개월 수)
+            start (Optional[Period]): 시작 (년, 월) (None이면 end 기준 months개월 전)
+            end (Optional[Period]): 마지막 (년, 월) (None이면 최신 기간)
+            departments (Optional[Tuple[str, ...]]): 조회할 부서 (None이면 전체)
+            after (Optional[Tuple[str, int, int]]): 이전 페이지 마지막 행의 (부서, 년, 월)
+            limit (Optional[int]): 페이지 크기 (None이면 전체)
             
         Returns:
             pd.DataFrame: 연장근무 트렌드 데이터
         """
         try:
-            query = """
-                SELECT 
-                    year,
-                    month,
-                    department,
-                    COUNT(*) as employee_count,
-                    SUM(overtime_hours) as total_overtime_hours,
-                    AVG(overtime_hours) as avg_overtime_hours,
-                    SUM(overtime_pay) as total_overtime_pay,
-                    AVG(overtime_pay) as avg_overtime_pay,
-                    MAX(overtime_hours) as max_overtime_hours,
-                    (SUM(overtime_pay) * 100.0 / SUM(direct_total)) as overtime_ratio
-                FROM direct_labor 
-                WHERE overtime_hours > 0
-                GROUP BY year, month, department
-                ORDER BY year DESC, month DESC, department
-                LIMIT ?
-            """
+            end = tuple(end) if end else self.periods.latest()
+            if end is None:
+                return pd.DataFrame()
+            start = tuple(start) if start else shift_period(end, -(months - 1))
+            
+            params = [*shift_period(start, -1), *end]
+            filters = ""
+            if departments:
+                filters += f"\n            AND department IN ({', '.join('?' * len(departments))})"
+                params.extend(departments)
+            if after:
+                # 같은 부서의 직전 기간은 증가율 계산에 필요하므로 부서 단위로만 거름
+                filters += "\n            AND department >= ?"
+                params.append(after[0])
             
-            df = pd.read_sql_query(query, self.connection, params=[months * 10])
+            params.extend(start)
+            page_filter = ""
+            if after:
+                page_filter = " AND (department, year, month) > (?, ?, ?)"
+                params.extend(after)
+            limit_clause = ""
+            if limit:
+                limit_clause = "\n        LIMIT ?"
+                params.append(limit)
             
-            # 연장근무 증가율 계산
-            df = df.sort_values(['department', 'year', 'month'])
-            df['overtime_growth'] = df.groupby('department')['total_overtime_hours'].pct_change() * 100
+            query = self.OVERTIME_TREND_QUERY.format(filters=filters, page_filter=page_filter, limit=limit_clause)
+            df = self.backend.read_frame(query, params)
             
             logger.info(f"연장근무 트렌드 분석 완료: {len(df)}건")
             return df
@@ -315,84 +817,58 @@ class DirectLaborCostManager:
             logger.error(f"연장근무 트렌드 분석 오류: {e}")
             return pd.DataFrame()
     
-    def get_direct_labor_analysis(self) -> Dict:
-        """직접 인건비 종합 분석"""
-        try:
-            analysis = {}
-            
-            # 1. 부서별 직접 인건비 분석
-            dept_query = """
-                SELECT 
-                    department,
-                    COUNT(*) as employee_count,
-                    SUM(direct_total) as total_direct_cost,
-                    AVG(direct_total) as avg_direct_cost,
-                    SUM(base_salary) as total_base_salary,
-                    SUM(overtime_pay) as total_overtime,
-                    AVG(hourly_rate) as avg_hourly_rate,
-                    AVG(productivity_score) as avg_productivity
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                GROUP BY department
-                ORDER BY total_direct_cost DESC
-            """
-            
-            analysis['department_analysis'] = pd.read_sql_query(dept_query, self.connection)
+    @instrumented
+    @cached_query
+    def get_employee_history(self, employee_ids: Union[str, Sequence[str]], start: Optional[Period] = None,
+                             end: Optional[Period] = None) -> pd.DataFrame:
+        """
+        직원별 직접 인건비 이력
+        
+        (사번, 년, 월) 고유 인덱스 범위 검색으로 조회하므로 저장된 기간이 늘어나도 조회 시간이 일정하다.
+        
+        Args:
+            employee_ids (Union[str, Sequence[str]]): 사번 또는 사번 목록 (수천 건도 일괄 조회)
+            start (Optional[Period]): 시작 (년, 월) (None이면 처음부터)
+            end (Optional[Period]): 종료 (년, 월) (None이면 최신 기간까지)
             
-            # 2. 직급별 분석
-            position_query = """
-                SELECT 
-                    position,
-                    COUNT(*) as employee_count,
-                    AVG(base_salary) as avg_base_salary,
-                    AVG(overtime_pay) as avg_overtime_pay,
-                    AVG(hourly_rate) as avg_hourly_rate,
-                    AVG(overtime_hours) as avg_overtime_hours
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                GROUP BY position
-                ORDER BY avg_base_salary DESC
-            """
+        Returns:
+            pd.DataFrame: (employee_id, year, month) MultiIndex 이력
+        """
+        try:
+            # 조회 범위에 보관 연도가 있으면 해당 연도 파일만 연결
+            periods = [period for period in self.periods.list_periods()
+                       if (start is None or period >= tuple(start)) and (end is None or period <= tuple(end))]
+            df = read_employee_history(self.backend, 'direct_labor', self.DIRECT_LABOR_COLUMNS, employee_ids,
+                                       start, end, periods, self.dimensions)
             
-            analysis['position_analysis'] = pd.read_sql_query(position_query, self.connection)
+            logger.info(f"직원 이력 조회 완료: {df.index.get_level_values('employee_id').nunique()}명, {len(df)}건")
+            return df
             
-            # 3. 시간당 비용 효율성 분석
-            efficiency_query = """
-                SELECT 
-                    employee_id,
-                    employee_name,
-                    department,
-                    position,
-                    hourly_rate,
-                    productivity_score,
-                    (direct_total / (work_hours + overtime_hours)) as cost_per_hour,
-                    (productivity_score / hourly_rate * 100) as efficiency_index
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                ORDER BY efficiency_index DESC
-            """
+        except Exception as e:
+            logger.error(f"직원 이력 조회 오류: {e}")
+            return pd.DataFrame()
+    
+    @instrumented
+    @cached_query
+    def get_direct_labor_analysis(self, year: Optional[int] = None, month: Optional[int] = None) -> Dict:
+        """
+        직접 인건비 종합 분석
+        
+        Args:
+            year (Optional[int]): 조회할 년도 (년월 미지정 시 최신)
+            month (Optional[int]): 조회할 월 (년월 미지정 시 최신)
             
-            analysis['efficiency_analysis'] = pd.read_sql_query(efficiency_query, self.connection)
+        Returns:
+            Dict: 분석 항목별 DataFrame
+        """
+        try:
+            analysis = {}
             
-            # 4. 연장근무 패턴 분석
-            overtime_pattern_query = """
-                SELECT 
-                    department,
-                    CASE 
-                        WHEN overtime_hours = 0 THEN '연장근무 없음'
-                        WHEN overtime_hours <= 10 THEN '연장근무 적음 (≤10h)'
-                        WHEN overtime_hours <= 20 THEN '연장근무 보통 (11-20h)'
-                        ELSE '연장근무 많음 (>20h)'
-                    END as overtime_category,
-                    COUNT(*) as employee_count,
-                    AVG(overtime_pay) as avg_overtime_pay
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                GROUP BY department, overtime_category
-                ORDER BY department, overtime_category
-            """
+            # 대상 기간은 한 번만 조회하여 모든 쿼리에 사용
+            params = list(self._resolve_period(year, month) or (None, None))
             
-            analysis['overtime_pattern'] = pd.read_sql_query(overtime_pattern_query, self.connection)
+            for key, query in self.ANALYSIS_QUERIES.items():
+                analysis[key] = self.backend.read_frame(query, params, periods=[params])
             
             logger.info("직접 인건비 종합 분석 완료")
             return analysis
@@ -401,19 +877,29 @@ class DirectLaborCostManager:
             logger.error(f"직접 인건비 분석 오류: {e}")
             return {}
     
-    def generate_detailed_report(self, output_path: str = "직접인건비_상세보고서.xlsx") -> bool:
+    @instrumented
+    def generate_detailed_report(self, output_path: str = "직접인건비_상세보고서.xlsx",
+                                 streaming: bool = False) -> bool:
         """
         직접 인건비 상세 Excel 보고서 생성
         
         Args:
             output_path (str): 출력 파일 경로
+            streaming (bool): True이면 직원별 시트를 커서에서 행 단위로 기록하는 저메모리 모드
             
         Returns:
             bool: 생성 성공 여부
         """
         try:
+            # 대상 기간은 한 번만 조회하여 모든 시트에 사용
+            period = self._resolve_period()
+            year, month = period or (None, None)
+            
+            if streaming:
+                return self._generate_streaming_report(output_path, period)
+            
             # 분석 데이터 수집
-            analysis = self.get_direct_labor_analysis()
+            analysis = self.get_direct_labor_analysis(year, month)
             overtime_trend = self.get_overtime_trend()
             
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
@@ -439,17 +925,17 @@ class DirectLaborCostManager:
                     overtime_trend.to_excel(writer, sheet_name='연장근무트렌드', index=False)
                 
                 # 6. 시간당 비용 분석
-                hourly_cost_analysis = self._get_hourly_cost_analysis()
+                hourly_cost_analysis = self._get_hourly_cost_analysis(period)
                 if not hourly_cost_analysis.empty:
                     hourly_cost_analysis.to_excel(writer, sheet_name='시간당비용분석', index=False)
                 
                 # 7. 직접 인건비 상세 데이터
-                detailed_data = self._get_detailed_direct_labor()
+                detailed_data = self._get_detailed_direct_labor(period)
                 if not detailed_data.empty:
                     detailed_data.to_excel(writer, sheet_name='직접인건비상세', index=False)
                 
                 # 8. 대시보드 요약
-                dashboard_summary = self._create_dashboard_summary()
+                dashboard_summary = self._create_dashboard_summary(period)
                 if not dashboard_summary.empty:
                     dashboard_summary.to_excel(writer, sheet_name='대시보드요약', index=False)
             
@@ -460,123 +946,173 @@ class DirectLaborCostManager:
             logger.error(f"상세 보고서 생성 오류: {e}")
             return False
     
-    def _get_hourly_cost_analysis(self) -> pd.DataFrame:
-        """시간당 비용 분석"""
+    @instrumented
+    def _generate_streaming_report(self, output_path: str, period: Optional[Period]) -> bool:
+        """xlsxwriter constant_memory 모드로 보고서 작성 (직원별 시트는 커서에서 스트리밍)"""
+        params = list(period or (None, None))
+        
+        def analysis_frame(key: str):
+            return lambda: self.backend.read_frame(self.ANALYSIS_QUERIES[key], params, periods=[params])
+        
+        sheets = [
+            ReportSheet('부서별분석', frame=analysis_frame('department_analysis')),
+            ReportSheet('직급별분석', frame=analysis_frame('position_analysis')),
+            ReportSheet('효율성분석', query=self.ANALYSIS_QUERIES['efficiency_analysis'], params=params),
+            ReportSheet('연장근무패턴', frame=analysis_frame('overtime_pattern')),
+            ReportSheet('연장근무트렌드', frame=self.get_overtime_trend),
+            ReportSheet('시간당비용분석', query=self.HOURLY_COST_QUERY, params=params),
+            ReportSheet('직접인건비상세', query=self.DETAILED_DIRECT_LABOR_QUERY, params=params),
+            ReportSheet('대시보드요약', frame=lambda: self._create_dashboard_summary(period))
+        ]
+        # 보관 연도 보고서는 작업자 스레드 연결에도 해당 연도 파일을 연결
+        periods = [period] if period else None
+        writer = StreamingReportWriter(self.db_path, connection=self.archive.reader(periods),
+                                       connect=lambda: self.archive.connect(periods))
+        self.last_report_result = writer.write(output_path, sheets)
+        return True
+    
+    @instrumented
+    def export_columnar(self, output_dir: str, fmt: str = 'parquet',
+                        periods: Optional[List[Period]] = None) -> List[ExportedPartition]:
+        """
+        직접 인건비 상세, 월별 집계 테이블, 분석 결과를 기간 파티션 단위로 내보내기
+        
+        Args:
+            output_dir (str): 출력 최상위 디렉터리
+            fmt (str): 'parquet', 'arrow'(Arrow IPC), 'csv'(gzip) 중 하나
+            periods (Optional[List[Period]]): 내보낼 (년, 월) 목록 (None이면 전체 기간)
+            
+        Returns:
+            List[ExportedPartition]: 저장된 파티션 목록
+        """
         try:
-            query = """
-                SELECT 
-                    department,
-                    position,
-                    employee_name,
-                    hourly_rate,
-                    overtime_rate,
-                    (work_hours + overtime_hours) as total_hours,
-                    direct_total,
-                    (direct_total / (work_hours + overtime_hours)) as actual_hourly_cost,
-                    productivity_score,
-                    (productivity_score / (direct_total / (work_hours + overtime_hours)) * 100) as cost_efficiency
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                AND (work_hours + overtime_hours) > 0
-                ORDER BY cost_efficiency DESC
-            """
+            periods = self.periods.list_periods() if periods is None else periods
+            exporter = PartitionedExporter(self.archive.reader(periods), output_dir, fmt)
             
-            return pd.read_sql_query(query, self.connection)
+            queries = {'direct_labor': self.DETAILED_DIRECT_LABOR_QUERY,
+                       'hourly_cost_analysis': self.HOURLY_COST_QUERY}
+            queries.update(self.ANALYSIS_QUERIES)
+            queries.update({spec.table: f"SELECT * FROM {spec.table} WHERE year = ? AND month = ?"
+                            for spec in self.DIRECT_LABOR_ROLLUPS})
+            frames = {'dashboard_summary': lambda period: self.kpis.compute_one(period).to_frame()}
+            return export_datasets(exporter, periods, queries, frames)
+            
+        except Exception as e:
+            logger.error(f"내보내기 오류: {e}")
+            return []
+    
+    def _get_hourly_cost_analysis(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """시간당 비용 분석 (period가 없으면 최신 기간)"""
+        try:
+            params = list(period or self._resolve_period() or (None, None))
+            return self.backend.read_frame(self.HOURLY_COST_QUERY, params, periods=[params])
             
         except Exception as e:
             logger.error(f"시간당 비용 분석 오류: {e}")
             return pd.DataFrame()
     
-    def _get_detailed_direct_labor(self) -> pd.DataFrame:
-        """직접 인건비 상세 데이터"""
+    def _get_detailed_direct_labor(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """직접 인건비 상세 데이터 (period가 없으면 최신 기간)"""
         try:
-            query = """
-                SELECT 
-                    employee_id,
-                    employee_name,
-                    department,
-                    position,
-                    work_type,
-                    base_salary,
-                    overtime_pay,
-                    night_shift_pay,
-                    holiday_pay,
-                    skill_allowance,
-                    direct_total,
-                    work_hours,
-                    overtime_hours,
-                    hourly_rate,
-                    overtime_rate,
-                    productivity_score,
-                    cost_center,
-                    year,
-                    month
-                FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-                ORDER BY department, direct_total DESC
-            """
-            
-            return pd.read_sql_query(query, self.connection)
+            params = list(period or self._resolve_period() or (None, None))
+            return self.backend.read_frame(self.DETAILED_DIRECT_LABOR_QUERY, params, periods=[params])
             
         except Exception as e:
             logger.error(f"상세 데이터 조회 오류: {e}")
             return pd.DataFrame()
     
-    def _create_dashboard_summary(self) -> pd.DataFrame:
-        """대시보드 요약 생성"""
-        try:
-            summary_data = []
-            
-            # 총 직접 인건비
-            total_cost = pd.read_sql_query("""
-                SELECT SUM(direct_total) as value FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-            """, self.connection)['value'].iloc[0]
-            
-            summary_data.append(['총 직접 인건비', f"{total_cost:,}원", '월간 직접 인건비 총액'])
-            
-            # 평균 시간당 임금
-            avg_hourly = pd.read_sql_query("""
-                SELECT AVG(hourly_rate) as value FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-            """, self.connection)['value'].iloc[0]
-            
-            summary_data.append(['평균 시간당 임금', f"{avg_hourly:,.0f}원", '전체 직원 평균'])
-            
-            # 총 연장근무 시간
-            total_overtime = pd.read_sql_query("""
-                SELECT SUM(overtime_hours) as value FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-            """, self.connection)['value'].iloc[0]
+    @instrumented
+    @cached_query
+    def get_kpis(self, periods: Optional[List[Period]] = None) -> Dict[Period, KpiResult]:
+        """
+        대시보드 KPI를 기간별로 한 번의 스캔으로 계산
+        
+        Args:
+            periods (Optional[List[Period]]): 계산할 (년, 월) 목록 (None이면 최신 기간)
             
-            summary_data.append(['총 연장근무 시간', f"{total_overtime:,.1f}시간", '월간 총 연장근무'])
+        Returns:
+            Dict[Period, KpiResult]: 기간별 KPI 결과
+        """
+        try:
+            if periods is None:
+                latest = self._resolve_period()
+                periods = [latest] if latest else []
+            return self.kpis.compute(periods)
             
-            # 연장근무 비율
-            overtime_ratio = pd.read_sql_query("""
-                SELECT (SUM(overtime_pay) * 100.0 / SUM(direct_total)) as value FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-            """, self.connection)['value'].iloc[0]
+        except Exception as e:
+            logger.error(f"KPI 계산 오류: {e}")
+            return {}
+    
+    def _create_dashboard_summary(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """대시보드 요약 생성 (period가 없으면 최신 기간)"""
+        try:
+            period = period or self._resolve_period()
+            if period is None:
+                return pd.DataFrame()
+            return self.kpis.compute_one(period).to_display_frame()
             
-            summary_data.append(['연장근무비 비율', f"{overtime_ratio:.1f}%", '직접인건비 대비'])
+        except Exception as e:
+            logger.error(f"대시보드 요약 생성 오류: {e}")
+            return pd.DataFrame()
+    
+    @instrumented
+    @serialized_write
+    def roll_year(self, year: int, vacuum: bool = False) -> bool:
+        """
+        지난 연도 원본 행을 연도별 보관 파일로 이동
+        
+        최신 기간 조회와 적재는 주 데이터베이스만 사용하고, 보관 연도 기간을 조회하면
+        해당 파일만 ATTACH하여 같은 쿼리로 읽는다. 집계 테이블과 기간 목록은 그대로 유지된다.
+        
+        Args:
+            year (int): 보관할 연도 (최신 연도 이전)
+            vacuum (bool): 이동 후 주 데이터베이스 VACUUM 여부
             
-            # 평균 생산성 점수
-            avg_productivity = pd.read_sql_query("""
-                SELECT AVG(productivity_score) as value FROM direct_labor 
-                WHERE (year, month) = (SELECT year, month FROM direct_labor ORDER BY year DESC, month DESC LIMIT 1)
-            """, self.connection)['value'].iloc[0]
+        Returns:
+            bool: 보관 성공 여부
+        """
+        try:
+            self.archive.roll_year(year, vacuum=vacuum)
+            self.cache.invalidate()
+            return True
             
-            summary_data.append(['평균 생산성 점수', f"{avg_productivity:.1f}점", '100점 만점'])
+        except Exception as e:
+            logger.error(f"연도 보관 오류: {e}")
+            return False
+    
+    @instrumented
+    @serialized_write
+    def restore_year(self, year: int) -> bool:
+        """
+        보관 연도를 주 데이터베이스로 복원 (보관 연도 데이터를 다시 적재하기 전에 사용)
+        
+        Args:
+            year (int): 복원할 연도
             
-            return pd.DataFrame(summary_data, columns=['지표', '값', '설명'])
+        Returns:
+            bool: 복원 성공 여부
+        """
+        try:
+            self.archive.restore_year(year)
+            self.cache.invalidate()
+            return True
             
         except Exception as e:
-            logger.error(f"대시보드 요약 생성 오류: {e}")
-            return pd.DataFrame()
+            logger.error(f"연도 복원 오류: {e}")
+            return False
     
     def close(self):
         """데이터베이스 연결 종료"""
-        if self.connection:
-            self.connection.close()
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            self.connection = None
             logger.info("직접 인건비 데이터베이스 연결 종료")
 
     def __del__(self):
@@ -584,8 +1120,19 @@ class DirectLaborCostManager:
         self.close()
 
 
+def _parse_direct_labor_file(excel_path: str) -> pd.DataFrame:
+    """프로세스 풀 작업자용: Excel 파일을 읽어 정제된 직접 인건비 데이터 반환"""
+    df = DirectLaborCostManager._prepare_direct_labor_frame(pd.read_excel(excel_path))
+    if df is None:
+        raise ValueError(f"필수 컬럼이 없습니다: {excel_path}")
+    return df
+
+
 # 사용 예제
 if __name__ == "__main__":
+    # 로깅 설정
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     # 직접인건비 전문 관리자
     direct_manager = DirectLaborCostManager("direct_labor.db")
     
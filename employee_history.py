@@ -0,0 +1,86 @@
+"""
+PayPulse 직원별 이력 조회
+employee_history - 사번 목록의 기간별 급여 이력을 (사번, 년, 월) 인덱스 조회로 가져옴
+"""
+
+from typing import Iterable, List, Optional, Sequence, Union
+import logging
+
+import pandas as pd
+
+from dimensions import DimensionStore
+from period_catalog import Period
+from storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# IN 목록 한 번에 넣을 사번 수 (SQLite 파라미터 수 제한 999보다 충분히 작게)
+LOOKUP_BATCH_SIZE = 500
+
+# 결과 프레임 인덱스
+HISTORY_INDEX = ['employee_id', 'year', 'month']
+
+# 반복 값이 많은 문자열 컬럼 (category로 변환)
+CATEGORY_COLUMNS = ('employee_name', 'department', 'position', 'work_type', 'cost_center', 'project_code')
+
+
+def normalize_employee_ids(employee_ids: Union[str, Iterable[str]]) -> List[str]:
+    """사번 하나 또는 목록을 중복 없는 문자열 목록으로 (입력 순서 유지)"""
+    if isinstance(employee_ids, str):
+        employee_ids = [employee_ids]
+    return list(dict.fromkeys(str(employee_id).strip() for employee_id in employee_ids if employee_id is not None))
+
+
+def read_employee_history(backend: StorageBackend, source_table: str, columns: Sequence[str],
+                          employee_ids: Union[str, Iterable[str]], start: Optional[Period] = None,
+                          end: Optional[Period] = None,
+                          periods: Optional[Sequence[Period]] = None,
+                          dimensions: Optional[DimensionStore] = None) -> pd.DataFrame:
+    """
+    사번 목록의 기간별 이력
+
+    (employee_id, year, month) 고유 인덱스를 사번별 범위 검색으로 사용하므로
+    저장된 기간 수와 관계없이 사번 수 × 조회 기간 수만큼만 읽는다.
+    사번은 LOOKUP_BATCH_SIZE개씩 나누어 IN 목록으로 조회한다.
+
+    Args:
+        backend (StorageBackend): 조회 백엔드
+        source_table (str): 원본 테이블명
+        columns (Sequence[str]): 가져올 컬럼 (HISTORY_INDEX 제외)
+        employee_ids (Union[str, Iterable[str]]): 사번 또는 사번 목록
+        start (Optional[Period]): 시작 (년, 월) (None이면 처음부터)
+        end (Optional[Period]): 종료 (년, 월) (None이면 끝까지)
+        periods (Optional[Sequence[Period]]): 조회 범위의 기간 목록 (보관 연도 연결 판단용)
+        dimensions (Optional[DimensionStore]): 원본 테이블의 사전 인코딩 컬럼 (라벨 조인)
+
+    Returns:
+        pd.DataFrame: (employee_id, year, month) MultiIndex, 사번·기간 순 정렬
+    """
+    employee_ids = normalize_employee_ids(employee_ids)
+    select_columns = HISTORY_INDEX + [col for col in columns if col not in HISTORY_INDEX]
+    if dimensions is not None:
+        select, joins = dimensions.labeled_select(select_columns, 'f')
+    else:
+        select, joins = ", ".join(f"f.{col}" for col in select_columns), ""
+    start = tuple(start) if start else (0, 0)
+    end = tuple(end) if end else (9999, 12)
+
+    frames = []
+    for offset in range(0, len(employee_ids), LOOKUP_BATCH_SIZE):
+        batch = employee_ids[offset:offset + LOOKUP_BATCH_SIZE]
+        query = f"""
+            SELECT {select}
+            FROM {source_table} f {joins}
+            WHERE f.employee_id IN ({", ".join("?" * len(batch))})
+              AND (f.year, f.month) BETWEEN (?, ?) AND (?, ?)
+            ORDER BY f.employee_id, f.year, f.month
+        """
+        frames.append(backend.read_frame(query, [*batch, *start, *end], periods=periods))
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=select_columns)
+    df = df.astype({col: 'category' for col in CATEGORY_COLUMNS if col in df.columns})
+    df = df.astype({'year': 'int16', 'month': 'int8'})
+    return df.set_index(HISTORY_INDEX).sort_index()
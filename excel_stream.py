@@ -0,0 +1,79 @@
+"""
+PayPulse 스트리밍 Excel 리더
+excel_stream - 읽기 전용 행 순회로 대용량 급여대장을 고정 크기 청크로 분할
+"""
+
+from typing import Iterator, List, Optional, Union
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 스트리밍 적재 시 기본 청크 행 수
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _normalize_header(values: tuple) -> List[str]:
+    """헤더 행을 pandas.read_excel과 같은 규칙의 컬럼명 목록으로 변환"""
+    header = []
+    for idx, value in enumerate(values):
+        if value is None or str(value).strip() == '':
+            header.append(f"Unnamed: {idx}")
+        else:
+            header.append(str(value).strip())
+    return header
+
+
+def iter_excel_chunks(excel_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      sheet_name: Optional[Union[str, int]] = 0) -> Iterator[pd.DataFrame]:
+    """
+    Excel 시트를 읽기 전용 모드로 순회하며 청크 단위 DataFrame 생성
+
+    워크북 전체를 메모리에 올리지 않으므로 최대 메모리 사용량은
+    원본 행 수와 무관하게 chunk_size에 비례한다.
+
+    Args:
+        excel_path (str): Excel 파일 경로
+        chunk_size (int): 청크당 행 수
+        sheet_name (Optional[Union[str, int]]): 시트 이름 또는 순번 (기본: 첫 시트)
+
+    Yields:
+        pd.DataFrame: 첫 행을 헤더로 사용한 청크
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size는 1 이상이어야 합니다: {chunk_size}")
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        if isinstance(sheet_name, int):
+            worksheet = workbook.worksheets[sheet_name]
+        else:
+            worksheet = workbook[sheet_name]
+
+        rows = worksheet.iter_rows(values_only=True)
+        header = None
+        for values in rows:
+            if any(value is not None for value in values):
+                header = _normalize_header(values)
+                break
+        if header is None:
+            logger.warning(f"빈 시트입니다: {excel_path}")
+            return
+
+        width = len(header)
+        buffer = []
+        for values in rows:
+            if not any(value is not None for value in values):
+                continue
+            # 읽기 전용 모드에서는 끝쪽 빈 셀이 잘린 행이 올 수 있다
+            buffer.append(tuple(values[:width]) + (None,) * (width - len(values)))
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame.from_records(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=header)
+    finally:
+        workbook.close()
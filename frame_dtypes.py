@@ -0,0 +1,151 @@
+"""
+PayPulse DataFrame 자료형 정책
+frame_dtypes - 정제 단계의 범주형/축소 폭 숫자/상수 컬럼 변환과 단계별 메모리 보고
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 정수 축소 후보 (작은 폭부터)
+INTEGER_WIDTHS = (np.int8, np.int16, np.int32)
+
+
+# ----------------------------------------------------------------------
+# 자료형 정책
+# ----------------------------------------------------------------------
+# - 차원(부서/직급/근무형태/원가센터/프로젝트)과 지급일 문자열: category (행마다 1~2바이트 코드)
+# - 금액: int64로 계산(합계 오버플로 방지) 후 값 범위에 맞는 가장 작은 정수형
+# - 실수: float32로 값이 그대로 보존될 때만 float32 (시간당 임금 등 계산값은 float64 유지)
+# - 상수: 단일 범주 category 또는 가장 작은 숫자형으로 채움 (객체 문자열 배열을 만들지 않음)
+# 저장 값과 적재 원장 해시는 정책 적용 전과 같다 (IngestLedger.row_hashes가 숫자 폭을 64비트로 맞춤).
+
+
+def to_category(series: pd.Series) -> pd.Series:
+    """문자열 컬럼을 category로 (이미 category이거나 숫자/날짜형이면 그대로)"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype != object:
+        return series
+    return series.astype('category')
+
+
+def fill_category(series: pd.Series, value: str) -> pd.Series:
+    """결측을 value로 채운 category 컬럼"""
+    series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if not series.hasnans:
+        return series
+    if value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def downcast_integer(series: pd.Series) -> pd.Series:
+    """정수 컬럼을 값 범위에 맞는 가장 작은 부호 있는 정수형으로 (정수형이 아니면 그대로)"""
+    if series.dtype.kind not in 'iu' or series.empty:
+        return series
+    low, high = series.min(), series.max()
+    for dtype in INTEGER_WIDTHS:
+        if dtype().itemsize >= series.dtype.itemsize:
+            break
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def downcast_float(series: pd.Series) -> pd.Series:
+    """float32로 바꿔도 모든 값이 같으면 float32, 아니면 그대로"""
+    if series.dtype != np.float64:
+        return series
+    narrow = series.astype(np.float32)
+    if np.array_equal(narrow.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+        return narrow
+    return series
+
+
+def money(series: pd.Series) -> pd.Series:
+    """금액 컬럼: 숫자 변환, 결측 0, 소수점 버림 후 축소 정수형"""
+    return downcast_integer(pd.to_numeric(series, errors='coerce').fillna(0).astype(np.int64))
+
+
+def constant(value: Any, index: pd.Index) -> pd.Series:
+    """
+    모든 행이 같은 값인 컬럼
+
+    문자열은 범주 하나짜리 category(행당 1바이트 코드), 숫자는 값을 보존하는 가장 작은 숫자형으로 만든다.
+
+    Args:
+        value (Any): 채울 값
+        index (pd.Index): 대상 DataFrame의 인덱스
+    """
+    if isinstance(value, str):
+        codes = np.zeros(len(index), dtype=np.int8)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=[value]), index=index)
+    series = pd.Series(np.full(len(index), value), index=index)
+    return downcast_float(downcast_integer(series))
+
+
+# ----------------------------------------------------------------------
+# 단계별 메모리 보고
+# ----------------------------------------------------------------------
+
+@dataclass
+class StageMemory:
+    """정제 단계 하나의 DataFrame 메모리"""
+    stage: str
+    rows: int
+    columns: int
+    bytes: int
+
+    @property
+    def megabytes(self) -> float:
+        return self.bytes / (1024 * 1024)
+
+
+class MemoryReport:
+    """
+    정제 단계별 DataFrame 메모리 (memory_usage(deep=True), 문자열 본문 포함)
+
+    정제 함수에 넘기면 단계마다 record()가 호출된다. deep 계산은 문자열 컬럼 전체를
+    훑으므로 필요할 때만 만들어 넘긴다.
+    """
+
+    def __init__(self, label: str = ''):
+        """
+        Args:
+            label (str): 보고서 이름 (로그 표시용)
+        """
+        self.label = label
+        self.stages: List[StageMemory] = []
+
+    def record(self, stage: str, df: pd.DataFrame):
+        """현재 DataFrame 메모리 기록"""
+        self.stages.append(StageMemory(stage, len(df), len(df.columns),
+                                       int(df.memory_usage(index=True, deep=True).sum())))
+
+    @property
+    def peak(self) -> int:
+        """단계 중 최대 바이트"""
+        return max((stage.bytes for stage in self.stages), default=0)
+
+    def to_frame(self) -> pd.DataFrame:
+        """단계별 메모리 표 (stage, rows, columns, bytes, megabytes)"""
+        return pd.DataFrame([{'stage': stage.stage, 'rows': stage.rows, 'columns': stage.columns,
+                              'bytes': stage.bytes, 'megabytes': round(stage.megabytes, 3)}
+                             for stage in self.stages])
+
+    def format(self) -> str:
+        """로그용 한 줄 요약"""
+        parts = ", ".join(f"{stage.stage} {stage.megabytes:,.2f}MB" for stage in self.stages)
+        return f"{self.label} 정제 메모리: {parts}" if self.label else f"정제 메모리: {parts}"
+
+
+def record_stage(report: Optional[MemoryReport], stage: str, df: pd.DataFrame):
+    """report가 있으면 단계 기록 (정제 함수에서 보고서 없이 호출해도 비용 없음)"""
+    if report is not None:
+        report.record(stage, df)
+
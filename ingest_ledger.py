@@ -0,0 +1,380 @@
+"""
+PayPulse 적재 원장
+ingest_ledger - 원본 파일 해시와 (년, 월)별 행 집합 해시를 기록하여 변경분만 반영
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from bulk_loader import DEFAULT_BATCH_SIZE, BulkLoadResult, bulk_insert
+from dimensions import DimensionStore
+
+logger = logging.getLogger(__name__)
+
+_UINT64_MASK = (1 << 64) - 1
+
+# 대상 테이블의 행 식별 키
+KEY_COLUMNS = ('employee_id', 'year', 'month')
+
+
+@dataclass
+class MergeResult:
+    """스테이징 데이터 반영 결과"""
+    rows_written: int = 0
+    rows_deleted: int = 0
+    rows_unchanged: int = 0
+    periods_changed: List[Tuple[int, int]] = field(default_factory=list)
+    periods_skipped: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def periods(self) -> List[Tuple[int, int]]:
+        """적재 데이터에 들어 있던 모든 기간 (변경 + 생략)"""
+        return sorted(self.periods_changed + self.periods_skipped)
+
+
+class IngestLedger:
+    """
+    대상 테이블 하나에 대한 적재 원장
+
+    사용 순서는 begin() → stage(df) (여러 번 가능) → merge() 이며,
+    커밋은 호출자가 담당한다. 행은 (employee_id, year, month)로 식별한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, target_table: str,
+                 columns: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                 dimensions: Optional[DimensionStore] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): 대상 테이블이 있는 연결
+            target_table (str): 반영할 테이블명
+            columns (Sequence[str]): 저장 및 해시 대상 컬럼 (employee_id, year, month 포함)
+            batch_size (int): 스테이징 적재 배치 크기
+            dimensions (Optional[DimensionStore]): 지정 시 라벨 컬럼을 정수 키로 바꾸어 저장
+                (행 해시는 라벨 기준이므로 키 발급 순서와 무관)
+        """
+        self.connection = connection
+        self.target_table = target_table
+        self.columns = list(columns)
+        self.dimensions = dimensions
+        # 스테이징/대상 테이블에 쓰는 컬럼 (사전 인코딩 컬럼은 {column}_id)
+        self.storage_columns = dimensions.storage_columns(columns) if dimensions else list(columns)
+        self.batch_size = batch_size
+        self.staging_table = f"temp.{target_table}_staging"
+        self._digests: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._skipped: List[Tuple[int, int]] = []
+
+    def ensure_schema(self):
+        """원장 테이블 생성 (커밋은 호출자 담당)"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_files (
+                target_table TEXT NOT NULL,
+                file_hash TEXT NOT NULL,
+                source_path TEXT,
+                row_count INTEGER,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (target_table, file_hash)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_periods (
+                target_table TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                rowset_hash TEXT NOT NULL,
+                row_count INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (target_table, year, month)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_file_periods (
+                target_table TEXT NOT NULL,
+                file_hash TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                rowset_hash TEXT NOT NULL,
+                PRIMARY KEY (target_table, file_hash, year, month)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_row_hashes (
+                target_table TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                employee_id TEXT NOT NULL,
+                row_hash INTEGER NOT NULL,
+                PRIMARY KEY (target_table, year, month, employee_id)
+            ) WITHOUT ROWID
+        """)
+
+    def ensure_unique_key(self):
+        """
+        대상 테이블에 (employee_id, year, month) 고유 인덱스 생성 (커밋은 호출자 담당)
+
+        고유 키 도입 전 여러 기간이 중복 적재된 데이터베이스는 같은 키의
+        가장 최근 행만 남기고 정리한다.
+        """
+        cursor = self.connection.cursor()
+        index_name = f"idx_{self.target_table}_employee_period"
+        exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                                (index_name,)).fetchone()
+        if exists:
+            return
+
+        cursor.execute(f"""
+            DELETE FROM {self.target_table} WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM {self.target_table} GROUP BY employee_id, year, month
+            )
+        """)
+        if cursor.rowcount > 0:
+            logger.warning(f"{self.target_table}: 중복 적재된 {cursor.rowcount}행 정리")
+        cursor.execute(f"CREATE UNIQUE INDEX {index_name} ON {self.target_table}(employee_id, year, month)")
+
+    # ------------------------------------------------------------------
+    # 파일 단위
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """파일 내용의 SHA-256 해시"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_file_loaded(self, file_hash: str) -> bool:
+        """
+        같은 내용의 파일이 이미 적재되었고 그 뒤 다른 적재로 바뀌지 않았는지 확인
+
+        파일이 담은 기간 중 하나라도 현재 행 집합 해시가 적재 당시와 다르면(다른 파일이 같은 기간을
+        덮어쓴 경우) 다시 적재해야 하므로 False다. 기간 기록이 없는 파일(기간별 기록 도입 전 적재,
+        빈 파일)도 False이며, 다시 적재하면 바뀐 기간이 없어도 기록된다.
+        """
+        row = self.connection.execute("""
+            SELECT EXISTS (
+                       SELECT 1 FROM ingest_file_periods WHERE target_table = ? AND file_hash = ?
+                   )
+               AND NOT EXISTS (
+                       SELECT 1 FROM ingest_file_periods f
+                       LEFT JOIN ingest_periods p
+                         ON p.target_table = f.target_table AND p.year = f.year AND p.month = f.month
+                       WHERE f.target_table = ? AND f.file_hash = ? AND p.rowset_hash IS NOT f.rowset_hash
+                   )
+        """, (self.target_table, file_hash, self.target_table, file_hash)).fetchone()
+        return bool(row[0])
+
+    def record_file(self, file_hash: str, source_path: str, row_count: int,
+                    periods: Sequence[Tuple[int, int]] = ()):
+        """
+        적재 완료된 파일과 파일이 담은 기간의 현재 행 집합 해시 기록 (merge() 후 같은 트랜잭션에서 호출)
+
+        Args:
+            file_hash (str): 파일 내용 해시
+            source_path (str): 원본 파일 경로
+            row_count (int): 파일 행 수
+            periods (Sequence[Tuple[int, int]]): 파일이 담은 (년, 월) 목록 (MergeResult.periods)
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO ingest_files (target_table, file_hash, source_path, row_count)
+            VALUES (?, ?, ?, ?)
+        """, (self.target_table, file_hash, source_path, row_count))
+        cursor.execute("DELETE FROM ingest_file_periods WHERE target_table = ? AND file_hash = ?",
+                       (self.target_table, file_hash))
+        cursor.executemany("""
+            INSERT INTO ingest_file_periods (target_table, file_hash, year, month, rowset_hash)
+            SELECT target_table, ?, year, month, rowset_hash FROM ingest_periods
+            WHERE target_table = ? AND year = ? AND month = ?
+        """, [(file_hash, self.target_table, *period) for period in periods])
+
+    # ------------------------------------------------------------------
+    # 행 단위
+    # ------------------------------------------------------------------
+
+    def row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        저장 컬럼 기준 행별 64비트 해시 (SQLite INTEGER로 저장 가능한 int64)
+
+        해시는 값과 자료형 폭에 따라 달라지므로 정제 단계에서 줄인 정수/실수 폭은 64비트로 되돌려
+        같은 값이면 자료형 정책과 무관하게 같은 해시가 되도록 한다 (category는 값 기준 해시).
+        """
+        frame = df[self.columns]
+        widen = {col: np.int64 if dtype.kind in 'iu' else np.float64 for col, dtype in frame.dtypes.items()
+                 if isinstance(dtype, np.dtype) and dtype.kind in 'iuf' and dtype.itemsize < 8}
+        hashes = pd.util.hash_pandas_object(frame.astype(widen) if widen else frame, index=False)
+        return hashes.to_numpy().view(np.int64)
+
+    def _period_digests(self, df: pd.DataFrame, hashes: np.ndarray) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """(년, 월)별 (행 수, 행 해시 합 mod 2^64) - 행 순서와 무관"""
+        grouped = pd.DataFrame({
+            'year': df['year'].to_numpy(),
+            'month': df['month'].to_numpy(),
+            'hash': hashes.view(np.uint64)
+        }).groupby(['year', 'month'])['hash']
+        counts = grouped.size()
+        digests = {}
+        for (year, month), values in grouped:
+            total = int(values.to_numpy().sum(dtype=np.uint64))
+            digests[(int(year), int(month))] = (int(counts[(year, month)]), total)
+        return digests
+
+    @staticmethod
+    def _format_digest(digest: Tuple[int, int]) -> str:
+        count, total = digest
+        return f"{count}:{total & _UINT64_MASK:016x}"
+
+    def _stored_digest(self, period: Tuple[int, int]) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT rowset_hash FROM ingest_periods WHERE target_table = ? AND year = ? AND month = ?",
+            (self.target_table, *period)).fetchone()
+        return row[0] if row else None
+
+    def begin(self):
+        """스테이징 테이블 초기화"""
+        cursor = self.connection.cursor()
+        columns = ", ".join(self.storage_columns)
+        cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {self.target_table}_staging "
+                       f"({columns}, row_hash INTEGER, unchanged INTEGER DEFAULT 0)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS temp.idx_{self.target_table}_staging_key "
+                       f"ON {self.target_table}_staging(employee_id, year, month)")
+        cursor.execute(f"DELETE FROM {self.staging_table}")
+        self._digests = {}
+        self._skipped = []
+
+    def stage(self, df: pd.DataFrame, complete: bool = False) -> BulkLoadResult:
+        """
+        정제된 데이터를 스테이징 테이블에 적재
+
+        Args:
+            df (pd.DataFrame): 정제된 데이터 (self.columns 포함)
+            complete (bool): df가 각 (년, 월)의 전체 행을 담고 있으면 True.
+                이 경우 원장과 해시가 같은 기간은 스테이징 전에 바로 제외한다.
+
+        Returns:
+            BulkLoadResult: 스테이징 적재 결과
+        """
+        if df.empty:
+            return BulkLoadResult(table=self.staging_table, rows=0, batches=0, elapsed=0.0)
+
+        hashes = self.row_hashes(df)
+        digests = self._period_digests(df, hashes)
+
+        if complete:
+            unchanged = [period for period, digest in digests.items()
+                         if self._stored_digest(period) == self._format_digest(digest)]
+            if unchanged:
+                periods = pd.MultiIndex.from_frame(df[['year', 'month']].astype(int))
+                keep = ~periods.isin(unchanged)
+                df, hashes = df[keep], hashes[keep]
+                for period in unchanged:
+                    digests.pop(period)
+                self._skipped.extend(unchanged)
+
+        for period, (count, total) in digests.items():
+            prev_count, prev_total = self._digests.get(period, (0, 0))
+            self._digests[period] = (prev_count + count, (prev_total + total) & _UINT64_MASK)
+
+        if self.dimensions is not None:
+            df = self.dimensions.encode(df)
+        return bulk_insert(self.connection, self.staging_table, df.assign(row_hash=hashes),
+                           self.storage_columns + ['row_hash'], batch_size=self.batch_size)
+
+    def merge(self) -> MergeResult:
+        """
+        스테이징 데이터를 대상 테이블에 집합 단위로 병합
+
+        스테이징된 모든 기간을 한 번에 처리한다. 해시가 같은 기간은 건너뛰고,
+        변경된 기간에서는 새로 생기거나 바뀐 행만 upsert 하며 원본에서 사라진 행은
+        삭제하므로 같은 데이터를 다시 적재해도 결과가 같다.
+        대상 테이블에는 ensure_unique_key()로 만든 고유 인덱스가 있어야 한다.
+        """
+        cursor = self.connection.cursor()
+        staging = self.staging_table
+        target = self.target_table
+        result = MergeResult(periods_skipped=list(self._skipped))
+
+        # 1. 행 집합 해시가 같은 기간 제외
+        changed = []
+        for period, digest in sorted(self._digests.items()):
+            if self._stored_digest(period) == self._format_digest(digest):
+                cursor.execute(f"DELETE FROM {staging} WHERE year = ? AND month = ?", period)
+                result.periods_skipped.append(period)
+            else:
+                changed.append(period)
+        result.periods_changed = changed
+        if not changed:
+            return result
+
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS ingest_changed_periods (year INTEGER, month INTEGER)")
+        cursor.execute("DELETE FROM temp.ingest_changed_periods")
+        cursor.executemany("INSERT INTO temp.ingest_changed_periods VALUES (?, ?)", changed)
+
+        # 2. 같은 키가 중복되면 마지막 행만 사용
+        cursor.execute(f"""
+            DELETE FROM {staging} WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM {staging} GROUP BY employee_id, year, month
+            )
+        """)
+        if cursor.rowcount > 0:
+            logger.warning(f"{target}: 중복 (사번, 년, 월) {cursor.rowcount}행은 마지막 행만 반영")
+
+        # 3. 원본에서 사라진 행 삭제
+        cursor.execute(f"""
+            DELETE FROM {target}
+            WHERE (year, month) IN (SELECT year, month FROM temp.ingest_changed_periods)
+              AND NOT EXISTS (
+                  SELECT 1 FROM {staging} s
+                  WHERE s.employee_id = {target}.employee_id
+                    AND s.year = {target}.year AND s.month = {target}.month
+              )
+        """)
+        result.rows_deleted = max(cursor.rowcount, 0)
+
+        # 4. 원장의 행 해시와 같은 행 표시
+        cursor.execute(f"""
+            UPDATE {staging} SET unchanged = 1
+            WHERE EXISTS (
+                SELECT 1 FROM ingest_row_hashes h
+                WHERE h.target_table = ? AND h.year = {staging}.year AND h.month = {staging}.month
+                  AND h.employee_id = {staging}.employee_id AND h.row_hash = {staging}.row_hash
+            )
+        """, (target,))
+        result.rows_unchanged = max(cursor.rowcount, 0)
+
+        # 5. 변경 기간의 행 해시 교체
+        cursor.execute("""
+            DELETE FROM ingest_row_hashes
+            WHERE target_table = ? AND (year, month) IN (SELECT year, month FROM temp.ingest_changed_periods)
+        """, (target,))
+        cursor.execute(f"""
+            INSERT INTO ingest_row_hashes (target_table, year, month, employee_id, row_hash)
+            SELECT ?, year, month, employee_id, row_hash FROM {staging}
+        """, (target,))
+
+        # 6. 새로 생기거나 바뀐 행만 (사번, 년, 월) 기준 upsert
+        columns = ", ".join(self.storage_columns)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in self.storage_columns if col not in KEY_COLUMNS)
+        cursor.execute(f"""
+            INSERT INTO {target} ({columns})
+            SELECT {columns} FROM {staging} WHERE unchanged = 0
+            ON CONFLICT (employee_id, year, month) DO UPDATE SET {updates}
+        """)
+        result.rows_written = max(cursor.rowcount, 0)
+
+        # 7. 기간별 행 집합 해시 기록
+        cursor.executemany("""
+            INSERT OR REPLACE INTO ingest_periods (target_table, year, month, rowset_hash, row_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [(target, *period, self._format_digest(self._digests[period]), self._digests[period][0])
+              for period in changed])
+
+        cursor.execute(f"DELETE FROM {staging}")
+        return result
@@ -0,0 +1,387 @@
+"""
+PayPulse 실행 계측
+instrumentation - 관리자 메서드별 실행 시간, SQL 문 수/시간, 읽기/쓰기 행 수, 캐시 적중 집계 및 Prometheus 출력
+"""
+
+import functools
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 지표 이름 접두사
+METRIC_PREFIX = 'paypulse'
+
+# SQL 문 지문 최대 길이 (Prometheus 라벨 및 집계 키)
+STATEMENT_LABEL_LENGTH = 120
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def statement_fingerprint(sql: str) -> str:
+    """공백을 정리하고 잘라낸 SQL 문 (같은 쿼리를 하나로 집계하는 키)"""
+    return _WHITESPACE.sub(' ', sql).strip()[:STATEMENT_LABEL_LENGTH]
+
+
+@dataclass
+class CallRecord:
+    """메서드 호출 1회의 계측 결과 (훅에 전달됨)"""
+    manager: str
+    method: str
+    elapsed: float = 0.0
+    success: bool = True
+    rows_read: int = 0          # SELECT 결과로 가져온 행 수
+    rows_written: int = 0       # INSERT/UPDATE/DELETE 영향 행 수
+    sql_count: int = 0
+    sql_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class MethodStats:
+    """메서드별 누적 통계"""
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows_read: int = 0
+    rows_written: int = 0
+    sql_count: int = 0
+    sql_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+@dataclass
+class StatementStats:
+    """SQL 문별 누적 통계"""
+    statement: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    callers: Dict[str, int] = field(default_factory=dict)   # 'Manager.method' -> 실행 횟수
+
+
+class MetricsRegistry:
+    """
+    계측 결과 집계기
+
+    - 메서드 호출은 instrumented 데코레이터가, SQL 문은 계측 연결(InstrumentedConnection)이 기록한다.
+    - 호출 중 실행된 SQL과 캐시 조회는 같은 스레드의 가장 안쪽 호출에 귀속되고,
+      호출이 끝나면 바깥 호출에도 합산된다.
+    - 다른 스레드(스트리밍 보고서 생산자 등)에서 실행된 SQL은 SQL 문별 통계에만 반영된다.
+    - add_hook()으로 등록한 함수는 호출이 끝날 때마다 CallRecord를 받는다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled (bool): False이면 기록하지 않음 (연결 계측도 생략)
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._methods: Dict[Tuple[str, str], MethodStats] = {}
+        self._statements: Dict[str, StatementStats] = {}
+        self._hooks: List[Callable[[CallRecord], None]] = []
+
+    # -- 훅 -----------------------------------------------------------------
+
+    def add_hook(self, hook: Callable[[CallRecord], None]):
+        """호출 종료 시 CallRecord를 받을 함수 등록 (훅 오류는 기록만 하고 무시)"""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[CallRecord], None]):
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    # -- 기록 ---------------------------------------------------------------
+
+    def _stack(self) -> List[CallRecord]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_call(self) -> Optional[CallRecord]:
+        """호출 스레드에서 실행 중인 가장 안쪽 계측 호출"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def begin_call(self, manager: str, method: str) -> CallRecord:
+        record = CallRecord(manager, method)
+        self._stack().append(record)
+        return record
+
+    def end_call(self, record: CallRecord):
+        """호출 종료: 바깥 호출에 합산하고 누적 통계 갱신 후 훅 실행"""
+        stack = self._stack()
+        if stack and stack[-1] is record:
+            stack.pop()
+        if stack:
+            outer = stack[-1]
+            outer.rows_read += record.rows_read
+            outer.rows_written += record.rows_written
+            outer.sql_count += record.sql_count
+            outer.sql_time += record.sql_time
+            outer.cache_hits += record.cache_hits
+            outer.cache_misses += record.cache_misses
+
+        with self._lock:
+            stats = self._methods.setdefault((record.manager, record.method), MethodStats())
+            stats.calls += 1
+            stats.errors += 0 if record.success else 1
+            stats.total_time += record.elapsed
+            stats.max_time = max(stats.max_time, record.elapsed)
+            stats.rows_read += record.rows_read
+            stats.rows_written += record.rows_written
+            stats.sql_count += record.sql_count
+            stats.sql_time += record.sql_time
+            stats.cache_hits += record.cache_hits
+            stats.cache_misses += record.cache_misses
+            hooks = list(self._hooks)
+
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                logger.error(f"계측 훅 오류: {e}")
+
+    def record_sql(self, sql: str, elapsed: float, rows_read: int = 0, rows_written: int = 0):
+        """SQL 문 실행(또는 결과 가져오기) 1회 기록"""
+        call = self.current_call()
+        if call is not None:
+            call.sql_time += elapsed
+            call.rows_read += rows_read
+            call.rows_written += rows_written
+
+        statement = statement_fingerprint(sql)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats(statement)
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.rows += rows_read + rows_written
+
+    def count_statement(self, sql: str):
+        """SQL 문 실행 횟수 기록 (가져오기 단계는 시간/행만 더하므로 분리)"""
+        call = self.current_call()
+        if call is not None:
+            call.sql_count += 1
+        statement = statement_fingerprint(sql)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats(statement)
+            stats.count += 1
+            if call is not None:
+                caller = f"{call.manager}.{call.method}"
+                stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+    def record_cache(self, hit: bool):
+        """cached_query 조회 결과를 현재 호출에 기록"""
+        call = self.current_call()
+        if call is None:
+            return
+        if hit:
+            call.cache_hits += 1
+        else:
+            call.cache_misses += 1
+
+    # -- 조회 / 출력 ----------------------------------------------------------
+
+    def method_stats(self) -> Dict[Tuple[str, str], MethodStats]:
+        """(관리자, 메서드)별 누적 통계 복사본"""
+        with self._lock:
+            return {key: MethodStats(**vars(stats)) for key, stats in self._methods.items()}
+
+    def top_statements(self, limit: int = 20) -> List[StatementStats]:
+        """누적 실행 시간이 긴 SQL 문 순서"""
+        with self._lock:
+            statements = [StatementStats(s.statement, s.count, s.total_time, s.max_time, s.rows, dict(s.callers))
+                          for s in self._statements.values()]
+        return sorted(statements, key=lambda s: s.total_time, reverse=True)[:limit]
+
+    def reset(self):
+        """누적 통계 초기화 (훅은 유지)"""
+        with self._lock:
+            self._methods.clear()
+            self._statements.clear()
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식(0.0.4) 출력"""
+        methods = self.method_stats()
+        statements = self.top_statements(limit=len(self._statements))
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[Tuple[str, Dict[str, str], float]]):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{suffix}{{{label_text}}} {_format_value(value)}")
+
+        def per_method(attr: str) -> List[Tuple[str, Dict[str, str], float]]:
+            return [('', {'manager': manager, 'method': method}, getattr(stats, attr))
+                    for (manager, method), stats in sorted(methods.items())]
+
+        duration = []
+        for (manager, method), stats in sorted(methods.items()):
+            labels = {'manager': manager, 'method': method}
+            duration.append(('_sum', labels, stats.total_time))
+            duration.append(('_count', labels, stats.calls))
+        family('method_duration_seconds', 'summary', 'Wall time of manager method calls.', duration)
+        family('method_duration_seconds_max', 'gauge', 'Slowest single call.', per_method('max_time'))
+        family('method_errors_total', 'counter', 'Failed manager method calls.', per_method('errors'))
+        family('method_rows_read_total', 'counter', 'Rows fetched by SQL within the method.',
+               per_method('rows_read'))
+        family('method_rows_written_total', 'counter', 'Rows inserted/updated/deleted within the method.',
+               per_method('rows_written'))
+        family('method_sql_statements_total', 'counter', 'SQL statements executed within the method.',
+               per_method('sql_count'))
+        family('method_sql_seconds_total', 'counter', 'Time spent in SQL within the method.',
+               per_method('sql_time'))
+        family('method_cache_hits_total', 'counter', 'Query cache hits.', per_method('cache_hits'))
+        family('method_cache_misses_total', 'counter', 'Query cache misses.', per_method('cache_misses'))
+
+        sql_duration = []
+        for stats in statements:
+            labels = {'statement': stats.statement}
+            sql_duration.append(('_sum', labels, stats.total_time))
+            sql_duration.append(('_count', labels, stats.count))
+        family('sql_duration_seconds', 'summary', 'Execution and fetch time per SQL statement.', sql_duration)
+        family('sql_rows_total', 'counter', 'Rows read or written per SQL statement.',
+               [('', {'statement': stats.statement}, stats.rows) for stats in statements])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(value) if isinstance(value, int) else f"{value:.6f}"
+
+
+# 관리자에 registry를 주지 않으면 사용하는 프로세스 공용 집계기
+default_registry = MetricsRegistry()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """실행/가져오기 시간과 행 수를 연결의 registry에 기록하는 커서"""
+
+    def execute(self, sql, parameters=()):
+        registry = self.connection.metrics
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._last_sql = sql
+            registry.count_statement(sql)
+            registry.record_sql(sql, time.perf_counter() - start, rows_written=max(self.rowcount, 0))
+
+    def executemany(self, sql, seq_of_parameters):
+        registry = self.connection.metrics
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._last_sql = sql
+            registry.count_statement(sql)
+            registry.record_sql(sql, time.perf_counter() - start, rows_written=max(self.rowcount, 0))
+
+    def executescript(self, sql_script):
+        registry = self.connection.metrics
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._last_sql = sql_script
+            registry.count_statement(sql_script)
+            registry.record_sql(sql_script, time.perf_counter() - start)
+
+    def _record_fetch(self, start: float, rows: int):
+        # SELECT는 가져오는 동안 실제로 실행되므로 가져오기 시간도 해당 SQL 문에 합산
+        self.connection.metrics.record_sql(getattr(self, '_last_sql', ''), time.perf_counter() - start,
+                                           rows_read=rows)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._record_fetch(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._record_fetch(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._record_fetch(start, len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    모든 SQL 실행을 InstrumentedCursor로 처리하는 연결
+
+    sqlite3.connect(..., factory=InstrumentedConnection) 후 metrics 속성에 registry를 지정한다.
+    커서를 for 문으로 순회해 가져온 행은 rows_read에 포함되지 않는다.
+    """
+
+    metrics: MetricsRegistry = default_registry
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def instrumented(method: Callable) -> Callable:
+    """
+    self.metrics(MetricsRegistry)에 호출 시간과 SQL/캐시 통계를 기록하는 메서드 데코레이터
+
+    bool False를 반환하거나 예외가 발생하면 실패로 기록한다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        registry: Optional[MetricsRegistry] = getattr(self, 'metrics', None)
+        if registry is None or not registry.enabled:
+            return method(self, *args, **kwargs)
+
+        record = registry.begin_call(type(self).__name__, method.__name__)
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+            record.success = result is not False
+            return result
+        except BaseException as e:
+            record.success = False
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.elapsed = time.perf_counter() - start
+            registry.end_call(record)
+
+    return wrapper
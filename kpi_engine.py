@@ -0,0 +1,121 @@
+"""
+PayPulse KPI 엔진
+kpi_engine - 여러 지표를 기간별로 한 번의 스캔으로 계산
+"""
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+
+import pandas as pd
+
+from period_catalog import Period
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MetricDefinition:
+    """KPI 지표 정의"""
+    key: str                 # 결과 키 (SQL 별칭으로도 사용)
+    label: str               # 표시 이름
+    expression: str          # 원본 테이블 기준 집계식 (예: SUM(direct_total))
+    unit: str = ''           # 단위
+    description: str = ''    # 설명
+    fmt: str = ',.0f'        # 표시용 format spec
+
+
+@dataclass
+class KpiResult:
+    """한 기간의 KPI 계산 결과 (데이터가 없으면 period가 None일 수 있음)"""
+    period: Optional[Period]
+    values: Dict[str, Optional[float]]
+    metrics: List[MetricDefinition] = field(repr=False, default_factory=list)
+
+    def __getitem__(self, key: str) -> Optional[float]:
+        return self.values[key]
+
+    def to_frame(self) -> pd.DataFrame:
+        """metric / value / unit 형식의 숫자 표"""
+        return pd.DataFrame(
+            [[metric.label, self.values.get(metric.key), metric.unit] for metric in self.metrics],
+            columns=['metric', 'value', 'unit'])
+
+    def to_display_frame(self) -> pd.DataFrame:
+        """지표 / 값 / 설명 형식의 표시용 표"""
+        rows = []
+        for metric in self.metrics:
+            value = self.values.get(metric.key)
+            text = '-' if value is None else f"{value:{metric.fmt}}{metric.unit}"
+            rows.append([metric.label, text, metric.description])
+        return pd.DataFrame(rows, columns=['지표', '값', '설명'])
+
+
+class KpiEngine:
+    """
+    원본 테이블 하나에 대한 KPI 계산기
+
+    등록된 모든 지표를 하나의 SELECT ... GROUP BY year, month로 계산하므로
+    지표 수와 관계없이 기간마다 한 번만 스캔한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, source_table: str,
+                 metrics: Sequence[MetricDefinition] = (),
+                 reader: Optional[Callable[[Sequence[Period]], sqlite3.Connection]] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): 원본 테이블이 있는 연결
+            source_table (str): 집계 대상 원본 테이블명
+            metrics (Sequence[MetricDefinition]): 초기 지표 목록
+            reader (Optional[Callable]): 계산할 기간 목록을 받아 조회용 연결을 반환하는 함수 (None이면 connection 사용)
+        """
+        self.connection = connection
+        self.reader = reader or (lambda periods: self.connection)
+        self.source_table = source_table
+        self.metrics: List[MetricDefinition] = []
+        for metric in metrics:
+            self.register(metric)
+
+    def register(self, metric: MetricDefinition):
+        """지표 추가 (같은 key는 교체)"""
+        if not metric.key.isidentifier():
+            raise ValueError(f"지표 key는 식별자 형식이어야 합니다: {metric.key}")
+        self.metrics = [m for m in self.metrics if m.key != metric.key] + [metric]
+
+    def compute(self, periods: Sequence[Period]) -> Dict[Period, KpiResult]:
+        """
+        기간별 KPI 계산
+
+        Args:
+            periods (Sequence[Period]): 계산할 (년, 월) 목록
+
+        Returns:
+            Dict[Period, KpiResult]: 기간별 결과 (데이터가 없는 기간은 값이 모두 None)
+        """
+        periods = list(dict.fromkeys((int(year), int(month)) for year, month in periods))
+        if not periods or not self.metrics:
+            return {period: KpiResult(period, {}, list(self.metrics)) for period in periods}
+
+        expressions = ", ".join(f"{metric.expression} AS {metric.key}" for metric in self.metrics)
+        conditions = " OR ".join("(year = ? AND month = ?)" for _ in periods)
+        query = f"""
+            SELECT year, month, {expressions}
+            FROM {self.source_table}
+            WHERE {conditions}
+            GROUP BY year, month
+        """
+        params = [value for period in periods for value in period]
+
+        rows = {(row[0], row[1]): row[2:] for row in self.reader(periods).execute(query, params).fetchall()}
+        results = {}
+        for period in periods:
+            values = rows.get(period, (None,) * len(self.metrics))
+            results[period] = KpiResult(
+                period, {metric.key: value for metric, value in zip(self.metrics, values)},
+                list(self.metrics))
+        return results
+
+    def compute_one(self, period: Period) -> KpiResult:
+        """한 기간의 KPI 계산"""
+        return self.compute([period])[tuple(int(value) for value in period)]
@@ -0,0 +1,100 @@
+"""
+PayPulse 병렬 파일 적재
+parallel_ingest - 프로세스 풀에서 여러 급여대장을 파싱/정제하고 단일 작성자가 저장
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 디렉터리 적재 대상 확장자
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+
+@dataclass
+class FileIngestReport:
+    """파일별 적재 결과"""
+    path: str
+    success: bool
+    rows: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+def list_excel_files(directory: str) -> List[str]:
+    """디렉터리 안의 Excel 파일 목록 (이름순, Office 임시 파일 제외)"""
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(EXCEL_EXTENSIONS) and not name.startswith('~$')
+    )
+
+
+def _timed_parse(parse_fn: Callable[[str], pd.DataFrame], path: str):
+    """작업자 프로세스에서 파싱 시간과 함께 결과 반환"""
+    start = time.perf_counter()
+    df = parse_fn(path)
+    return df, time.perf_counter() - start
+
+
+def run_parallel_ingest(paths: List[str], parse_fn: Callable[[str], pd.DataFrame],
+                        write_fn: Callable[[str, pd.DataFrame], bool],
+                        workers: Optional[int] = None) -> List[FileIngestReport]:
+    """
+    파일 파싱은 프로세스 풀에서 병렬로, 저장은 호출 프로세스에서 순서대로 수행
+
+    저장은 입력 순서대로 이루어지므로 같은 년월이 여러 파일에 있으면
+    뒤에 오는 파일이 최종 결과가 된다. 한 파일의 실패는 다른 파일에 영향을 주지 않는다.
+
+    Args:
+        paths (List[str]): 적재할 파일 경로 목록
+        parse_fn (Callable): 파일 경로를 받아 정제된 DataFrame을 반환하는 모듈 수준 함수
+        write_fn (Callable): 파일 경로와 정제된 DataFrame을 받아 저장하고 성공 여부를 반환하는 함수
+        workers (Optional[int]): 작업자 프로세스 수 (None이면 CPU 수)
+
+    Returns:
+        List[FileIngestReport]: 파일별 적재 결과
+    """
+    workers = workers or os.cpu_count() or 1
+    reports = []
+
+    def _write(path: str, df: pd.DataFrame, parse_elapsed: float) -> FileIngestReport:
+        start = time.perf_counter()
+        if not write_fn(path, df):
+            return FileIngestReport(path, False, error="데이터베이스 저장 실패")
+        return FileIngestReport(path, True, rows=len(df),
+                                elapsed=parse_elapsed + time.perf_counter() - start)
+
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                df, parse_elapsed = _timed_parse(parse_fn, path)
+                reports.append(_write(path, df, parse_elapsed))
+            except Exception as e:
+                reports.append(FileIngestReport(path, False, error=str(e)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            futures = [(path, executor.submit(_timed_parse, parse_fn, path)) for path in paths]
+            for path, future in futures:
+                try:
+                    df, parse_elapsed = future.result()
+                    reports.append(_write(path, df, parse_elapsed))
+                except Exception as e:
+                    reports.append(FileIngestReport(path, False, error=str(e)))
+
+    for report in reports:
+        if report.skipped:
+            logger.info(f"변경 없는 파일, 적재 생략: {report.path}")
+        elif report.success:
+            logger.info(f"파일 적재 완료: {report.path} ({report.rows}행, {report.elapsed:.2f}초)")
+        else:
+            logger.error(f"파일 적재 실패: {report.path} - {report.error}")
+    return reports
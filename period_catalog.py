@@ -0,0 +1,103 @@
+"""
+PayPulse 기간 카탈로그
+period_catalog - 원본 테이블에 존재하는 (년, 월) 목록을 쓰기 시점에 유지
+"""
+
+import sqlite3
+from typing import Callable, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Period = Tuple[int, int]
+
+
+def shift_period(period: Period, months: int) -> Period:
+    """(년, 월)을 months개월 이동 (음수는 과거)"""
+    ordinal = period[0] * 12 + (period[1] - 1) + months
+    return (ordinal // 12, ordinal % 12 + 1)
+
+
+class PeriodCatalog:
+    """
+    원본 테이블 하나의 기간 목록
+
+    최신 기간 조회를 원본 테이블 정렬 대신 작은 카탈로그의 기본 키 조회로 처리한다.
+    refresh()는 적재 트랜잭션 안에서 호출하며 커밋은 호출자가 담당한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, source_table: str,
+                 reader: Optional[Callable[[], sqlite3.Connection]] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): 원본 테이블이 있는 연결 (갱신용)
+            source_table (str): 기간을 추적할 원본 테이블명
+            reader (Optional[Callable]): 조회용 연결을 반환하는 함수 (None이면 connection 사용)
+        """
+        self.connection = connection
+        self.source_table = source_table
+        self.reader = reader or (lambda: self.connection)
+
+    def ensure_schema(self):
+        """카탈로그 테이블 생성, 비어 있으면 원본 테이블로 채움"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS period_catalog (
+                source_table TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source_table, year, month)
+            ) WITHOUT ROWID
+        """)
+        tracked = cursor.execute("SELECT 1 FROM period_catalog WHERE source_table = ? LIMIT 1",
+                                 (self.source_table,)).fetchone()
+        if not tracked:
+            periods = cursor.execute(f"SELECT DISTINCT year, month FROM {self.source_table}").fetchall()
+            self.refresh(periods)
+
+    def refresh(self, periods: Iterable[Period]):
+        """지정한 기간의 행 수를 원본에서 다시 세고, 행이 없으면 카탈로그에서 제거"""
+        cursor = self.connection.cursor()
+        for year, month in periods:
+            row_count = cursor.execute(
+                f"SELECT COUNT(*) FROM {self.source_table} WHERE year = ? AND month = ?",
+                (year, month)).fetchone()[0]
+            if row_count:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO period_catalog (source_table, year, month, row_count, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (self.source_table, year, month, row_count))
+            else:
+                cursor.execute("DELETE FROM period_catalog WHERE source_table = ? AND year = ? AND month = ?",
+                               (self.source_table, year, month))
+
+    def latest(self) -> Optional[Period]:
+        """가장 최근 (년, 월), 데이터가 없으면 None"""
+        row = self.reader().execute("""
+            SELECT year, month FROM period_catalog
+            WHERE source_table = ?
+            ORDER BY year DESC, month DESC
+            LIMIT 1
+        """, (self.source_table,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def list_periods(self) -> List[Period]:
+        """전체 기간 (오래된 순)"""
+        rows = self.reader().execute("""
+            SELECT year, month FROM period_catalog
+            WHERE source_table = ?
+            ORDER BY year, month
+        """, (self.source_table,)).fetchall()
+        return [(year, month) for year, month in rows]
+
+    def recent(self, count: int) -> List[Period]:
+        """최근 count개 기간 (오래된 순)"""
+        rows = self.reader().execute("""
+            SELECT year, month FROM period_catalog
+            WHERE source_table = ?
+            ORDER BY year DESC, month DESC
+            LIMIT ?
+        """, (self.source_table, count)).fetchall()
+        return [(year, month) for year, month in reversed(rows)]
@@ -0,0 +1,326 @@
+"""
+PayPulse 쿼리 실행 계획 점검
+query_advisor - 관리자가 실행한 SQL을 EXPLAIN QUERY PLAN으로 검사하여 전체 스캔/임시 B-tree 정렬을 찾고 인덱스 제안
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 행 수가 원장 크기에 비례하는 테이블 (전체 스캔 금지 대상)
+FACT_TABLES = ('payroll', 'direct_labor', 'overtime_details', 'productivity_metrics')
+
+# 점검 대상 SQL 문 (스키마 변경, 트랜잭션 제어, PRAGMA, 단순 VALUES 삽입 제외)
+_CHECKED_STATEMENT = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE|INSERT\b(?!.*\bVALUES\b))', re.IGNORECASE | re.DOTALL)
+
+_SCAN = re.compile(r'^SCAN (\S+)(?: AS \S+)?(?: USING (?:COVERING )?INDEX (\S+))?')
+_SEARCH = re.compile(r'^SEARCH (\S+)')
+_TEMP_BTREE = re.compile(r'^USE TEMP B-TREE FOR (.+)$')
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+([\w.]+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_CLAUSE_END = r'(?=\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bHAVING\b|\bUNION\b|\)\s*$|$)'
+_KEYWORDS = {'WHERE', 'GROUP', 'ORDER', 'LIMIT', 'ON', 'SET', 'VALUES', 'SELECT', 'LEFT', 'INNER', 'JOIN',
+             'HAVING', 'UNION', 'AND', 'OR'}
+
+
+@dataclass(frozen=True)
+class IndexSuggestion:
+    """제안 인덱스"""
+    table: str
+    columns: Tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"[:60]
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+
+@dataclass
+class PlanFinding:
+    """
+    실행 계획 점검 결과
+
+    kind:
+        full_scan  - 원장 테이블 전체 스캔 (인덱스 순서 스캔 포함)
+        temp_btree - 정렬/그룹화/DISTINCT용 임시 B-tree
+    bounded가 True인 임시 B-tree는 인덱스로 한정된 기간 행만 정렬하므로 참고용이다.
+    """
+    statement: str
+    kind: str
+    table: str
+    detail: str
+    bounded: bool = False
+    suggestion: Optional[IndexSuggestion] = None
+
+    @property
+    def is_regression(self) -> bool:
+        """테스트 실패 대상 여부 (전체 스캔이거나 한정되지 않은 정렬)"""
+        return self.kind == 'full_scan' or not self.bounded
+
+
+class QueryPlanAdvisor:
+    """
+    SQL 실행 계획 점검 및 인덱스 제안
+
+    capture()로 실제 실행된 SQL(매개변수가 채워진 형태)을 모으고, check()로 각 문장을
+    EXPLAIN QUERY PLAN 하여 원장 테이블의 전체 스캔과 임시 B-tree 정렬을 찾는다.
+    temp 스테이징 테이블을 참조하는 문장도 있으므로 점검 연결은 적재에 쓴 작성자 연결이어야 한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, tables: Sequence[str] = FACT_TABLES):
+        """
+        Args:
+            connection (sqlite3.Connection): EXPLAIN을 실행할 연결 (작성자 연결)
+            tables (Sequence[str]): 점검 대상 원장 테이블
+        """
+        self.connection = connection
+        self.tables = tuple(tables)
+
+    @staticmethod
+    @contextmanager
+    def capture(*connections: sqlite3.Connection) -> Iterator[List[str]]:
+        """블록 안에서 주어진 연결로 실행된 SQL 문을 모음 (trace callback 사용)"""
+        statements: List[str] = []
+        for connection in connections:
+            connection.set_trace_callback(statements.append)
+        try:
+            yield statements
+        finally:
+            for connection in connections:
+                connection.set_trace_callback(None)
+
+    def explain(self, sql: str) -> List[str]:
+        """EXPLAIN QUERY PLAN 각 단계 설명"""
+        return [row[-1] for row in self.connection.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+
+    def check(self, statements: Iterable[str]) -> List[PlanFinding]:
+        """
+        SQL 문 목록 점검 (리터럴만 다른 문장은 한 번만)
+
+        Args:
+            statements (Iterable[str]): 점검할 SQL 문
+
+        Returns:
+            List[PlanFinding]: 원장 테이블 관련 점검 결과
+        """
+        findings = []
+        seen = set()
+        for sql in statements:
+            sql = ' '.join(sql.split())
+            shape = _LITERAL.sub('?', sql)
+            if shape in seen or not _CHECKED_STATEMENT.match(sql) or 'sqlite_master' in sql:
+                continue
+            seen.add(shape)
+            try:
+                plan = self.explain(sql)
+            except sqlite3.Error as e:
+                # 이미 삭제된 임시 테이블 등
+                logger.debug(f"실행 계획 조회 생략: {e} - {sql[:80]}")
+                continue
+            findings.extend(self._check_plan(sql, plan))
+        return findings
+
+    def _check_plan(self, sql: str, plan: List[str]) -> List[PlanFinding]:
+        aliases = self._aliases(sql)
+        scanned, searched = [], []
+        for detail in plan:
+            match = _SCAN.match(detail) or _SEARCH.match(detail)
+            if not match:
+                continue
+            table = aliases.get(match.group(1), match.group(1))
+            if table in self.tables:
+                (scanned if detail.startswith('SCAN') else searched).append(table)
+
+        findings = []
+        for detail in plan:
+            match = _SCAN.match(detail)
+            if match and aliases.get(match.group(1), match.group(1)) in self.tables:
+                table = aliases.get(match.group(1), match.group(1))
+                findings.append(PlanFinding(sql, 'full_scan', table, detail,
+                                            suggestion=self._suggest(sql, table, sort=False)))
+                continue
+            match = _TEMP_BTREE.match(detail)
+            if match and (scanned or searched):
+                table = (scanned or searched)[0]
+                findings.append(PlanFinding(sql, 'temp_btree', table, detail, bounded=not scanned,
+                                            suggestion=self._suggest(sql, table, sort=True)))
+        return findings
+
+    @staticmethod
+    def _aliases(sql: str) -> Dict[str, str]:
+        """FROM/JOIN 절의 별칭 -> 테이블 이름"""
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(sql):
+            table = table.split('.')[-1]
+            aliases[table] = table
+            if alias and alias.upper() not in _KEYWORDS:
+                aliases[alias] = table
+        return aliases
+
+    def _columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})").fetchall()]
+
+    def _suggest(self, sql: str, table: str, sort: bool) -> Optional[IndexSuggestion]:
+        """
+        WHERE 조건의 동등 비교 컬럼 + (범위 컬럼 또는 GROUP BY/ORDER BY 컬럼) 순서의 인덱스 제안
+
+        이미 같은 컬럼으로 시작하는 인덱스가 있으면 제안하지 않는다.
+        """
+        columns = self._columns(table)
+        if not columns:
+            return None
+        names = '|'.join(re.escape(column) for column in columns)
+        where = re.search(rf'\bWHERE\b(.*?){_CLAUSE_END}', sql, re.IGNORECASE | re.DOTALL)
+        where_text = where.group(1) if where else ''
+
+        equality = re.findall(rf'(?<![\w.])(?:\w+\.)?({names})\s*(?:=|\bIN\b)', where_text, re.IGNORECASE)
+        ranged = re.findall(rf'(?<![\w.])(?:\w+\.)?({names})\s*(?:<|>|\bBETWEEN\b)', where_text, re.IGNORECASE)
+        index_columns = list(dict.fromkeys(equality))
+        if sort:
+            ordering = re.search(r'\b(?:GROUP|ORDER) BY\b(.*?)(?=\bORDER BY\b|\bLIMIT\b|\bHAVING\b|\)|$)', sql,
+                                 re.IGNORECASE | re.DOTALL)
+            for term in (ordering.group(1).split(',') if ordering else []):
+                term = re.sub(r'\s+(ASC|DESC)\s*$', '', term.strip(), flags=re.IGNORECASE).split('.')[-1]
+                if term not in columns:
+                    # 계산식 정렬은 인덱스로 대체할 수 없음
+                    break
+                index_columns.append(term)
+        elif ranged:
+            index_columns.append(ranged[0])
+
+        index_columns = list(dict.fromkeys(index_columns))
+        if not index_columns or self._has_index_prefix(table, index_columns):
+            return None
+        return IndexSuggestion(table, tuple(index_columns))
+
+    def _has_index_prefix(self, table: str, columns: List[str]) -> bool:
+        for index in self.connection.execute(f"PRAGMA index_list({table})").fetchall():
+            indexed = [row[2] for row in self.connection.execute(f"PRAGMA index_info({index[1]})").fetchall()]
+            if indexed[:len(columns)] == columns:
+                return True
+        return False
+
+    @staticmethod
+    def suggestions(findings: Iterable[PlanFinding]) -> List[IndexSuggestion]:
+        """중복을 제거한 인덱스 제안 목록"""
+        return list(dict.fromkeys(f.suggestion for f in findings if f.suggestion is not None))
+
+    def apply(self, suggestions: Iterable[IndexSuggestion]) -> List[str]:
+        """
+        제안 인덱스 생성
+
+        Returns:
+            List[str]: 생성한 인덱스 이름
+        """
+        created = []
+        try:
+            for suggestion in suggestions:
+                self.connection.execute(suggestion.ddl)
+                created.append(suggestion.name)
+                logger.info(f"인덱스 생성: {suggestion.ddl}")
+            self.connection.commit()
+        except Exception as e:
+            logger.error(f"인덱스 생성 오류: {e}")
+            self.connection.rollback()
+            return []
+        return created
+
+
+def run_manager_workload(total, direct, output_dir: str):
+    """
+    두 관리자의 조회/보고서/내보내기/직원 이력 메서드를 한 번씩 실행 (점검용 SQL 수집)
+
+    보고서는 같은 스레드의 연결에서 실행되도록 메모리 내 방식만 사용하고,
+    스트리밍 보고서의 조회문(DETAILED_*_QUERY)은 직접 실행한다.
+    """
+    total.cache.clear()
+    direct.cache.clear()
+    total.get_department_summary()
+    total.get_monthly_trend()
+    total.get_kpis()
+    total.generate_report(os.path.join(output_dir, 'payroll_report.xlsx'))
+    total.export_columnar(os.path.join(output_dir, 'payroll_export'), 'csv')
+    direct.get_overtime_trend()
+    direct.get_direct_labor_analysis()
+    direct.get_kpis()
+    direct.generate_detailed_report(os.path.join(output_dir, 'direct_report.xlsx'))
+    direct.export_columnar(os.path.join(output_dir, 'direct_export'), 'csv')
+    for manager, query in ((total, total.DETAILED_PAYROLL_QUERY), (direct, direct.DETAILED_DIRECT_LABOR_QUERY)):
+        period = manager.periods.latest()
+        if period:
+            cursor = manager.reader.execute(query, period)
+            key = [column[0] for column in cursor.description].index('employee_id')
+            employee_ids = [row[key] for row in cursor.fetchall()[:3]]
+            manager.get_employee_history(employee_ids)
+
+
+def advise(total, direct, apply: bool = False, statements: Iterable[str] = ()) -> List[PlanFinding]:
+    """
+    관리자 작업 부하를 실행하며 수집한 SQL 점검 (apply=True이면 제안 인덱스 생성)
+
+    Args:
+        total: TotalLaborCostManager
+        direct: DirectLaborCostManager
+        apply (bool): 제안 인덱스 생성 여부
+        statements (Iterable[str]): 함께 점검할 SQL (적재 중 capture()로 수집한 문장 등)
+
+    Returns:
+        List[PlanFinding]: 두 데이터베이스의 점검 결과
+    """
+    managers = (total, direct)
+    with QueryPlanAdvisor.capture(*(c for m in managers for c in (m.connection, m.reader))) as captured, \
+            tempfile.TemporaryDirectory() as output_dir:
+        run_manager_workload(total, direct, output_dir)
+    statements = list(statements) + captured
+
+    findings = []
+    for manager in managers:
+        advisor = QueryPlanAdvisor(manager.connection)
+        own = [sql for sql in statements if re.search(rf'\b{manager.ledger.target_table}\b', sql)]
+        manager_findings = advisor.check(own)
+        if apply:
+            advisor.apply(advisor.suggestions(manager_findings))
+        findings.extend(manager_findings)
+    return findings
+
+
+def format_findings(findings: List[PlanFinding]) -> str:
+    lines = []
+    for finding in findings:
+        mark = '❌' if finding.is_regression else 'ℹ️'
+        lines.append(f"{mark} [{finding.kind}] {finding.table}: {finding.detail}")
+        lines.append(f"    {finding.statement[:160]}")
+        if finding.suggestion:
+            lines.append(f"    제안: {finding.suggestion.ddl}")
+    return '\n'.join(lines) if lines else "문제 없음"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from direct_labor_cost_manager import DirectLaborCostManager
+    from total_labor_cost_manager import TotalLaborCostManager
+
+    parser = argparse.ArgumentParser(description="PayPulse 쿼리 실행 계획 점검")
+    parser.add_argument('--total-db', default='labor_costs.db', help="종합 인건비 데이터베이스")
+    parser.add_argument('--direct-db', default='direct_labor.db', help="직접 인건비 데이터베이스")
+    parser.add_argument('--apply', action='store_true', help="제안 인덱스 생성")
+    args = parser.parse_args()
+
+    total = TotalLaborCostManager(args.total_db)
+    direct = DirectLaborCostManager(args.direct_db)
+    try:
+        print(format_findings(advise(total, direct, apply=args.apply)))
+    finally:
+        total.close()
+        direct.close()
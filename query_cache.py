@@ -0,0 +1,180 @@
+"""
+PayPulse 조회 결과 캐시
+query_cache - 데이터 버전 기반 무효화를 지원하는 프로세스 내 LRU 캐시
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 크기 / 유효 시간(초)
+DEFAULT_CACHE_SIZE = 128
+DEFAULT_CACHE_TTL = 300.0
+
+
+@dataclass
+class CacheStats:
+    """캐시 적중 통계"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    version: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _copy_result(value: Any) -> Any:
+    """호출자가 결과를 수정해도 캐시가 오염되지 않도록 DataFrame은 복사본 반환"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    """빈 결과 여부 (조회 오류 시 반환되는 빈 결과는 캐시하지 않음)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, dict):
+        return not value
+    return value is None
+
+
+class QueryCache:
+    """
+    조회 결과 LRU 캐시
+
+    키에 데이터 버전을 포함하므로 저장 후 invalidate()로 버전을 올리면
+    이전 결과는 더 이상 조회되지 않고 LRU 순서에 따라 밀려난다.
+    external_version은 다른 연결/프로세스의 변경을 감지하는 값
+    (예: SQLite PRAGMA data_version)을 반환하는 함수로, 키에 함께 포함된다.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 external_version: Optional[Callable[[], Hashable]] = None):
+        """
+        Args:
+            maxsize (int): 최대 항목 수 (0이면 캐시 사용 안 함)
+            ttl (Optional[float]): 항목 유효 시간(초), None이면 만료 없음
+            external_version (Optional[Callable]): 외부 데이터 버전을 반환하는 함수
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.external_version = external_version
+        self._version = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @property
+    def version(self) -> Hashable:
+        """현재 데이터 버전 (내부 카운터 + 외부 버전)"""
+        if self.external_version is None:
+            return self._version
+        return (self._version, self.external_version())
+
+    def invalidate(self):
+        """데이터 버전을 올려 기존 결과를 모두 무효화"""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+        logger.debug(f"조회 캐시 무효화: 버전 {self._version}")
+
+    def clear(self):
+        """항목과 통계 초기화 (버전은 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+    def make_key(self, name: str, args: tuple, kwargs: dict) -> Hashable:
+        key = (name, args, tuple(sorted(kwargs.items())), self.version)
+        hash(key)
+        return key
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        캐시 조회
+
+        Returns:
+            Tuple[bool, Any]: (적중 여부, 결과 복사본)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+        return True, _copy_result(value)
+
+    def put(self, key: Hashable, value: Any):
+        """결과 저장, 크기를 넘으면 가장 오래 사용하지 않은 항목 제거"""
+        if not self.enabled or _is_empty(value):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), _copy_result(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """현재 통계 스냅샷"""
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions,
+                              self._stats.expirations, len(self._entries), self._version)
+
+
+def cached_query(method: Callable) -> Callable:
+    """
+    self.cache(QueryCache)를 사용하는 조회 메서드 데코레이터
+
+    메서드 이름, 인자, 데이터 버전을 키로 결과를 캐시한다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache: Optional[QueryCache] = getattr(self, 'cache', None)
+        if cache is None or not cache.enabled:
+            return method(self, *args, **kwargs)
+
+        try:
+            key = cache.make_key(method.__name__, args, kwargs)
+        except Exception:
+            # 해시할 수 없는 인자이거나 버전을 읽을 수 없으면 캐시하지 않음
+            return method(self, *args, **kwargs)
+
+        hit, value = cache.get(key)
+        metrics = getattr(self, 'metrics', None)
+        if metrics is not None:
+            metrics.record_cache(hit)
+        if hit:
+            return value
+        value = method(self, *args, **kwargs)
+        cache.put(key, value)
+        return value
+
+    return wrapper
@@ -0,0 +1,227 @@
+"""
+PayPulse 스트리밍 Excel 보고서 작성기
+report_writer - 조회 커서를 행 단위로 xlsxwriter constant_memory 통합문서에 기록
+"""
+
+import math
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 커서에서 한 번에 가져올 행 수 / 작성 대기열에 쌓아 둘 최대 배치 수
+DEFAULT_FETCH_SIZE = 5000
+DEFAULT_PREFETCH = 4
+
+_END = object()
+
+
+@dataclass
+class ReportSheet:
+    """
+    보고서 시트 정의
+
+    frame이 있으면 집계 결과처럼 작은 DataFrame을 그대로 기록하고,
+    query가 있으면 별도 연결의 커서에서 배치 단위로 읽어 스트리밍한다.
+    """
+    name: str
+    frame: Optional[Callable[[], pd.DataFrame]] = None
+    query: Optional[str] = None
+    params: Sequence = ()
+
+
+@dataclass
+class ReportWriteResult:
+    """보고서 작성 결과"""
+    path: str
+    sheet_rows: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(self.sheet_rows.values())
+
+
+def _cell(value):
+    """DataFrame 값을 xlsxwriter가 기록할 수 있는 값으로 변환 (NaN/None은 빈 셀)"""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+
+class StreamingReportWriter:
+    """
+    xlsxwriter constant_memory 모드 보고서 작성기
+
+    스트리밍 시트의 쿼리는 시트마다 작업자 스레드가 읽기 전용 연결을 열어
+    미리 실행하고, 결과 배치를 크기가 제한된 대기열로 넘긴다.
+    작은 시트 계산과 큰 시트 조회가 겹쳐서 진행되며, 통합문서 기록은 호출 스레드에서
+    시트 순서대로 한 행씩 이루어지므로 메모리 사용량은 (배치 크기 × 대기열 길이)로 제한된다.
+    """
+
+    def __init__(self, db_path: str, fetch_size: int = DEFAULT_FETCH_SIZE,
+                 prefetch: int = DEFAULT_PREFETCH, connection: Optional[sqlite3.Connection] = None,
+                 connect: Optional[Callable[[], sqlite3.Connection]] = None):
+        """
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            fetch_size (int): 커서에서 한 번에 가져올 행 수
+            prefetch (int): 시트별 작성 대기열에 쌓아 둘 최대 배치 수
+            connection (Optional[sqlite3.Connection]): 메모리 DB처럼 별도 연결을 열 수 없을 때
+                호출 스레드에서 직접 사용할 연결
+            connect (Optional[Callable]): 작업자 스레드용 새 연결을 여는 함수 (None이면 db_path를 읽기 전용으로 열기)
+        """
+        self.db_path = db_path
+        self.fetch_size = fetch_size
+        self.prefetch = prefetch
+        self.connection = connection
+        self.connect = connect
+
+    @property
+    def _parallel(self) -> bool:
+        return self.db_path != ':memory:' and not self.db_path.startswith('file::memory:')
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        if self.connect is not None:
+            return self.connect()
+        return sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+    @staticmethod
+    def _put(batches: "queue.Queue", item, cancel: threading.Event) -> bool:
+        """대기열에 넣기, 작성이 중단되면 False"""
+        while not cancel.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, sheet: ReportSheet, batches: "queue.Queue", cancel: threading.Event):
+        """작업자 스레드: 쿼리 결과를 배치 단위로 대기열에 넣음"""
+        try:
+            connection = self._connect_reader()
+            try:
+                cursor = connection.execute(sheet.query, list(sheet.params))
+                if not self._put(batches, [column[0] for column in cursor.description], cancel):
+                    return
+                while True:
+                    rows = cursor.fetchmany(self.fetch_size)
+                    if not rows:
+                        break
+                    if not self._put(batches, rows, cancel):
+                        return
+            finally:
+                connection.close()
+            self._put(batches, _END, cancel)
+        except Exception as e:
+            self._put(batches, e, cancel)
+
+    def _iter_local(self, sheet: ReportSheet):
+        """별도 연결 없이 호출 스레드의 연결로 스트리밍"""
+        cursor = self.connection.execute(sheet.query, list(sheet.params))
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(self.fetch_size)
+            if not rows:
+                break
+            yield rows
+
+    @staticmethod
+    def _iter_queue(batches: "queue.Queue"):
+        while True:
+            item = batches.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def write(self, output_path: str, sheets: List[ReportSheet]) -> ReportWriteResult:
+        """
+        보고서 작성 (결과가 비어 있는 시트는 만들지 않음)
+
+        Args:
+            output_path (str): 출력 파일 경로
+            sheets (List[ReportSheet]): 시트 정의 (통합문서의 시트 순서)
+
+        Returns:
+            ReportWriteResult: 시트별 기록 행 수와 소요 시간
+        """
+        import xlsxwriter
+
+        start = time.perf_counter()
+        result = ReportWriteResult(output_path)
+
+        # 스트리밍 시트 조회를 먼저 시작하여 작은 시트 계산과 겹치게 함
+        streams = {}
+        threads = []
+        cancel = threading.Event()
+        for sheet in sheets:
+            if sheet.query is None:
+                continue
+            if self._parallel:
+                batches = queue.Queue(maxsize=self.prefetch)
+                thread = threading.Thread(target=self._produce, args=(sheet, batches, cancel),
+                                          name=f"report-{sheet.name}", daemon=True)
+                thread.start()
+                threads.append(thread)
+                streams[sheet.name] = self._iter_queue(batches)
+            else:
+                streams[sheet.name] = self._iter_local(sheet)
+
+        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'nan_inf_to_errors': True})
+        header_format = workbook.add_format({'bold': True})
+        try:
+            for sheet in sheets:
+                if sheet.query is None:
+                    df = sheet.frame()
+                    if df is None or df.empty:
+                        continue
+                    header = [str(column) for column in df.columns]
+                    row_batches = [[[_cell(value) for value in row]
+                                    for row in df.astype(object).values.tolist()]]
+                else:
+                    stream = streams[sheet.name]
+                    header = next(stream)
+                    first = next(stream, None)
+                    if first is None:
+                        continue
+                    row_batches = self._chain(first, stream)
+
+                worksheet = workbook.add_worksheet(sheet.name)
+                worksheet.write_row(0, 0, header, header_format)
+                row_index = 0
+                for rows in row_batches:
+                    for row in rows:
+                        row_index += 1
+                        worksheet.write_row(row_index, 0, row)
+                result.sheet_rows[sheet.name] = row_index
+        finally:
+            # 작성 중 오류가 나도 작업자 스레드가 대기열에서 막히지 않도록 중단 신호
+            cancel.set()
+            for thread in threads:
+                thread.join()
+            workbook.close()
+
+        result.elapsed = time.perf_counter() - start
+        logger.info(f"스트리밍 보고서 작성 완료: {output_path} "
+                    f"({len(result.sheet_rows)}개 시트, {result.rows}행, {result.elapsed:.2f}초)")
+        return result
+
+    @staticmethod
+    def _chain(first, rest):
+        yield first
+        yield from rest
@@ -0,0 +1,118 @@
+"""
+PayPulse 월별 집계 테이블
+rollups - 적재 트랜잭션 안에서 변경된 (년, 월)만 다시 집계하여 유지
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+from dimensions import DimensionStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RollupSpec:
+    """집계 테이블 정의"""
+    table: str
+    group_columns: Tuple[str, ...]
+    measures: Dict[str, str]  # 집계 컬럼명 → 원본 테이블 기준 집계식
+
+
+class RollupStore:
+    """
+    원본 테이블 하나에 대한 집계 테이블 묶음
+
+    각 집계 테이블은 (year, month, 그룹 컬럼...)을 기본 키로 가지며,
+    refresh()는 지정한 기간만 원본에서 다시 집계한다. 커밋은 호출자가 담당한다.
+    사전 인코딩된 그룹 컬럼은 정수 키로 묶은 뒤 라벨을 조인하여 라벨로 저장한다.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, source_table: str, specs: Sequence[RollupSpec],
+                 dimensions: Optional[DimensionStore] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): 원본 테이블이 있는 연결
+            source_table (str): 집계 대상 원본 테이블명
+            specs (Sequence[RollupSpec]): 집계 테이블 정의 목록
+            dimensions (Optional[DimensionStore]): 원본 테이블의 사전 인코딩 컬럼
+        """
+        self.connection = connection
+        self.source_table = source_table
+        self.specs = list(specs)
+        self.dimensions = dimensions
+
+    @staticmethod
+    def _expected_columns(spec: RollupSpec) -> List[str]:
+        return ['year', 'month', *spec.group_columns, *spec.measures]
+
+    def ensure_schema(self):
+        """
+        집계 테이블 생성
+
+        새로 만들었거나 정의가 바뀌어 다시 만든 테이블은 원본 전체 기간으로 채운다.
+        """
+        cursor = self.connection.cursor()
+        rebuilt = []
+        for spec in self.specs:
+            existing = [row[1] for row in cursor.execute(f"PRAGMA table_info({spec.table})")]
+            if existing == self._expected_columns(spec):
+                continue
+            if existing:
+                logger.info(f"집계 테이블 정의 변경, 재생성: {spec.table}")
+                cursor.execute(f"DROP TABLE {spec.table}")
+
+            group_defs = "".join(f"{col} TEXT, " for col in spec.group_columns)
+            measure_defs = ", ".join(f"{col} NUMERIC" for col in spec.measures)
+            key = ", ".join(['year', 'month', *spec.group_columns])
+            cursor.execute(f"""
+                CREATE TABLE {spec.table} (
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    {group_defs}{measure_defs},
+                    PRIMARY KEY ({key})
+                )
+            """)
+            rebuilt.append(spec)
+
+        if rebuilt:
+            periods = cursor.execute(f"SELECT DISTINCT year, month FROM {self.source_table}").fetchall()
+            self._refresh_specs(rebuilt, periods)
+
+    def refresh(self, periods: Iterable[Tuple[int, int]]):
+        """지정한 (년, 월)의 집계를 원본에서 다시 계산"""
+        self._refresh_specs(self.specs, list(periods))
+
+    def _refresh_specs(self, specs: Sequence[RollupSpec], periods: List[Tuple[int, int]]):
+        if not periods:
+            return
+
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS rollup_periods (year INTEGER, month INTEGER)")
+        cursor.execute("DELETE FROM temp.rollup_periods")
+        cursor.executemany("INSERT INTO temp.rollup_periods VALUES (?, ?)", periods)
+
+        for spec in specs:
+            cursor.execute(f"""
+                DELETE FROM {spec.table}
+                WHERE (year, month) IN (SELECT year, month FROM temp.rollup_periods)
+            """)
+            keys = ['year', 'month', *spec.group_columns]
+            if self.dimensions is not None:
+                keys = self.dimensions.storage_columns(keys)
+            groups = ", ".join(keys)
+            measures = ", ".join(f"{expr} AS {col}" for col, expr in spec.measures.items())
+            query = f"""
+                SELECT {groups}, {measures}
+                FROM {self.source_table}
+                WHERE (year, month) IN (SELECT year, month FROM temp.rollup_periods)
+                GROUP BY {groups}
+            """
+            if keys != ['year', 'month', *spec.group_columns]:
+                # 정수 키로 묶은 결과에 라벨 조인
+                select, joins = self.dimensions.labeled_select(self._expected_columns(spec), 'g')
+                query = f"SELECT {select} FROM ({query}) AS g {joins}"
+            cursor.execute(f"INSERT INTO {spec.table} ({', '.join(self._expected_columns(spec))}) {query}")
+        logger.debug(f"{self.source_table} 집계 갱신: {len(periods)}개 기간")
@@ -0,0 +1,267 @@
+"""
+PayPulse 조회 백엔드
+storage_backend - 분석 조회를 실행하는 저장소 (SQLite 기본, 선택적으로 Parquet 미러 위의 DuckDB)
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import logging
+
+import pandas as pd
+
+from columnar_export import PartitionedExporter
+from connection_pool import ConnectionPool
+from period_catalog import Period
+from year_archive import YearArchive
+
+logger = logging.getLogger(__name__)
+
+# 사용할 수 있는 백엔드 이름
+BACKENDS = ('sqlite', 'duckdb')
+
+# 파티션 경로(year=2025/month=01)에서 읽는 컬럼의 자료형
+# (지정하지 않으면 DuckDB가 month=01을 VARCHAR '01'로 추론하여 정수 비교/행 값 비교가 깨짐)
+HIVE_TYPES = "{'year': 'INTEGER', 'month': 'INTEGER'}"
+
+
+class StorageBackend:
+    """
+    분석 조회 백엔드 공통 인터페이스
+
+    적재와 스키마 관리는 항상 SQLite 작성자 연결이 담당하고, 백엔드는 조회만 처리한다.
+    관리자의 분석 쿼리는 백엔드와 무관하게 같은 SQL(? 파라미터)로 실행된다.
+    """
+
+    name = 'base'
+
+    def read_frame(self, query: str, params: Sequence[Any] = (),
+                   periods: Optional[Iterable[Period]] = None) -> pd.DataFrame:
+        """
+        쿼리 결과 DataFrame
+
+        Args:
+            query (str): 조회 SQL
+            params (Sequence[Any]): ? 파라미터
+            periods (Optional[Iterable[Period]]): 원본 테이블에서 읽는 (년, 월) 목록 (보관 연도 연결 판단용)
+        """
+        raise NotImplementedError
+
+    def reader(self, periods: Optional[Iterable[Period]] = None):
+        """execute(query, params).fetchall()을 지원하는 호출 스레드 전용 연결"""
+        raise NotImplementedError
+
+    def refresh(self):
+        """적재 커밋 후 호출 (조회 저장소를 원본과 맞춤)"""
+
+    def close(self):
+        """백엔드 자원 정리"""
+
+
+class SQLiteBackend(StorageBackend):
+    """원본 SQLite 데이터베이스의 스레드별 읽기 전용 연결에서 조회 (보관 연도는 필요할 때만 연결)"""
+
+    name = 'sqlite'
+
+    def __init__(self, pool: ConnectionPool, archive: Optional[YearArchive] = None):
+        self.pool = pool
+        self.archive = archive
+
+    def read_frame(self, query: str, params: Sequence[Any] = (),
+                   periods: Optional[Iterable[Period]] = None) -> pd.DataFrame:
+        return pd.read_sql_query(query, self.reader(periods), params=list(params))
+
+    def reader(self, periods: Optional[Iterable[Period]] = None):
+        if self.archive is None:
+            return self.pool.reader()
+        return self.archive.reader(periods)
+
+
+class DuckDBBackend(StorageBackend):
+    """
+    Parquet 미러 위의 DuckDB 조회 백엔드 (내장형, 별도 서비스 없음)
+
+    원본 테이블과 집계 테이블을 {mirror_dir}/{table}/year=YYYY/month=MM/part.parquet로 미러링하고
+    같은 이름의 DuckDB 뷰로 노출하므로 관리자의 분석 SQL을 그대로 실행한다.
+    여러 해에 걸친 GROUP BY가 컬럼 단위 벡터 스캔으로 처리된다.
+
+    미러는 적재 원장(ingest_periods)의 기간별 내용 해시를 manifest.json과 비교하여
+    바뀐 기간만 다시 쓴다. 원본 테이블의 컬럼이 바뀌면(사전 인코딩 변환 등) 전체를 다시 쓴다.
+    라벨 사전(dim_*)처럼 기간 컬럼이 없는 작은 테이블은 동기화할 때마다 DuckDB 테이블로 통째로 복사한다.
+    관리자가 커밋할 때마다 refresh()가 호출되며, 다른 프로세스가 적재한 경우 sync()를 직접 호출한다.
+    """
+
+    name = 'duckdb'
+
+    MANIFEST_FILE = 'manifest.json'
+    # 매니페스트에 기록하는 원본 테이블 컬럼 목록 키
+    SCHEMA_KEY = '_columns'
+
+    def __init__(self, pool: ConnectionPool, source_table: str, tables: Sequence[str], mirror_dir: str,
+                 threads: Optional[int] = None, archive: Optional[YearArchive] = None,
+                 lookups: Sequence[str] = ()):
+        """
+        Args:
+            pool (ConnectionPool): 원본 SQLite 연결 풀
+            source_table (str): 적재 원장 기준 원본 테이블 (payroll / direct_labor)
+            tables (Sequence[str]): 미러링할 테이블 (원본 + 집계 테이블, 모두 year/month 컬럼 보유)
+            mirror_dir (str): Parquet 미러 디렉터리
+            threads (Optional[int]): DuckDB 작업 스레드 수 (None이면 DuckDB 기본값)
+            archive (Optional[YearArchive]): 보관 연도 저장소 (보관 연도도 미러에 포함)
+            lookups (Sequence[str]): 통째로 복사할 라벨 사전 테이블
+        """
+        if importlib.util.find_spec('duckdb') is None:
+            raise ImportError("duckdb 백엔드를 사용하려면 duckdb가 필요합니다 (pip install duckdb)")
+        if importlib.util.find_spec('pyarrow') is None:
+            raise ImportError("duckdb 백엔드의 Parquet 미러에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        import duckdb
+
+        self.pool = pool
+        self.source_table = source_table
+        self.tables = list(tables)
+        self.lookups = list(lookups)
+        self.mirror_dir = mirror_dir
+        self.archive = archive
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connection = duckdb.connect(database=':memory:')
+        if threads:
+            self._connection.execute(f"SET threads = {int(threads)}")
+        os.makedirs(mirror_dir, exist_ok=True)
+        self.sync()
+
+    # -- 조회 ---------------------------------------------------------------
+
+    def reader(self, periods: Optional[Iterable[Period]] = None):
+        # DuckDB 연결은 스레드 간 공유할 수 없으므로 스레드마다 cursor()로 복제
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._local.cursor = self._connection.cursor()
+        return cursor
+
+    def read_frame(self, query: str, params: Sequence[Any] = (),
+                   periods: Optional[Iterable[Period]] = None) -> pd.DataFrame:
+        return self.reader().execute(query, list(params)).df()
+
+    # -- 미러 ---------------------------------------------------------------
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.mirror_dir, self.MANIFEST_FILE)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if not os.path.exists(self._manifest_path()):
+            return {}
+        with open(self._manifest_path(), encoding='utf-8') as f:
+            return json.load(f)
+
+    def sync(self) -> List[tuple]:
+        """
+        내용이 바뀐 기간의 파티션을 다시 쓰고 뷰 갱신
+
+        Returns:
+            List[tuple]: 다시 쓰거나 삭제한 (년, 월) 목록
+        """
+        with self._lock:
+            current = {f"{year}-{month:02d}": rowset_hash for year, month, rowset_hash in self.pool.reader().execute(
+                "SELECT year, month, rowset_hash FROM ingest_periods WHERE target_table = ?",
+                (self.source_table,)).fetchall()}
+            columns = self._column_list()
+            manifest = self._load_manifest()
+            if manifest.pop(self.SCHEMA_KEY, None) != columns:
+                # 원본 테이블 컬럼이 바뀌면 모든 기간을 다시 씀
+                manifest = dict.fromkeys(manifest, '')
+            changed = [key for key, digest in current.items() if manifest.get(key) != digest]
+            removed = [key for key in manifest if key not in current]
+
+            periods = [tuple(int(part) for part in key.split('-')) for key in changed]
+            source = self.archive.reader(periods) if self.archive else self.pool.reader()
+            exporter = PartitionedExporter(source, self.mirror_dir, 'parquet')
+            for key in removed:
+                year, month = (int(part) for part in key.split('-'))
+                for table in self.tables:
+                    shutil.rmtree(os.path.dirname(exporter.partition_path(table, (year, month))),
+                                  ignore_errors=True)
+            for table in self.tables:
+                for period in periods:
+                    # 기간 행이 모두 삭제된 경우 이전 파티션이 남지 않도록 먼저 제거
+                    path = exporter.partition_path(table, period)
+                    if os.path.exists(path):
+                        os.remove(path)
+                exporter.export_query(table, f"SELECT * FROM {table} WHERE year = ? AND month = ?", periods)
+
+            with open(self._manifest_path(), 'w', encoding='utf-8') as f:
+                json.dump({self.SCHEMA_KEY: columns, **current}, f)
+            self._create_views()
+            self._copy_lookups()
+
+        if changed or removed:
+            logger.info(f"DuckDB 미러 동기화: {self.source_table} 갱신 {len(changed)}개, 삭제 {len(removed)}개 기간")
+        return [tuple(int(part) for part in key.split('-')) for key in changed + removed]
+
+    def _column_list(self) -> str:
+        return ", ".join(row[1] for row in self.pool.reader().execute(f"PRAGMA table_info({self.source_table})"))
+
+    def _copy_lookups(self):
+        """라벨 사전 테이블을 DuckDB 테이블로 복사"""
+        for table in self.lookups:
+            frame = pd.read_sql_query(f"SELECT * FROM {table}", self.pool.reader())
+            self._connection.register('_lookup_frame', frame)
+            self._connection.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM _lookup_frame")
+            self._connection.unregister('_lookup_frame')
+
+    def _create_views(self):
+        """테이블별 Parquet 파티션을 읽는 뷰 (파티션이 없으면 같은 컬럼의 빈 테이블)"""
+        for table in self.tables:
+            pattern = os.path.join(self.mirror_dir, table, '*', '*', '*.parquet')
+            has_files = os.path.isdir(os.path.join(self.mirror_dir, table)) and any(
+                name.endswith('.parquet') for _, _, names in os.walk(os.path.join(self.mirror_dir, table))
+                for name in names)
+            if has_files:
+                self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self._connection.execute(
+                    f"CREATE OR REPLACE VIEW {table} AS "
+                    f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, "
+                    f"hive_types = {HIVE_TYPES}, union_by_name = true)")
+            else:
+                empty = pd.read_sql_query(f"SELECT * FROM {table} LIMIT 0", self.pool.reader())
+                self._connection.execute(f"DROP VIEW IF EXISTS {table}")
+                self._connection.register('_empty_frame', empty)
+                self._connection.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM _empty_frame")
+                self._connection.unregister('_empty_frame')
+
+    def refresh(self):
+        self.sync()
+
+    def close(self):
+        self._connection.close()
+
+
+def create_backend(name: str, pool: ConnectionPool, source_table: str, tables: Sequence[str],
+                   mirror_dir: Optional[str] = None, archive: Optional[YearArchive] = None,
+                   lookups: Sequence[str] = ()) -> StorageBackend:
+    """
+    이름으로 조회 백엔드 생성
+
+    Args:
+        name (str): 'sqlite' 또는 'duckdb'
+        pool (ConnectionPool): 원본 SQLite 연결 풀
+        source_table (str): 원본 테이블
+        tables (Sequence[str]): duckdb 미러 대상 테이블
+        mirror_dir (Optional[str]): duckdb Parquet 미러 디렉터리 (None이면 '{db_path}.mirror')
+        archive (Optional[YearArchive]): 보관 연도 저장소
+        lookups (Sequence[str]): duckdb로 통째로 복사할 라벨 사전 테이블
+
+    Returns:
+        StorageBackend: 조회 백엔드
+    """
+    if name == 'sqlite':
+        return SQLiteBackend(pool, archive)
+    if name == 'duckdb':
+        if pool.in_memory:
+            raise ValueError("메모리 DB는 duckdb 백엔드를 사용할 수 없습니다")
+        return DuckDBBackend(pool, source_table, tables, mirror_dir or f"{pool.db_path}.mirror",
+                             archive=archive, lookups=lookups)
+    raise ValueError(f"지원하지 않는 백엔드: {name} (가능: {', '.join(BACKENDS)})")
@@ -0,0 +1,82 @@
+"""
+분석 백엔드 결과 일치 검사
+
+합성 급여대장을 두 저장소에 적재한 뒤 같은 DB를 sqlite 백엔드와 duckdb 백엔드(Parquet 미러)로
+각각 열어 관리자의 분석 메서드 결과를 비교한다. duckdb/pyarrow가 없으면 건너뛴다.
+
+    python -m pytest test_analytics_backends.py
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+from create_dummy_excel import generate_payroll, write_synthetic_payroll
+from direct_labor_cost_manager import DirectLaborCostManager
+from total_labor_cost_manager import TotalLaborCostManager
+from unified_ingest import UnifiedIngest
+
+# 이력 조회 대상 사번 (합성 데이터의 앞쪽 사번)
+HISTORY_EMPLOYEE_IDS = ['E0001001', 'E0001002', 'E0001003']
+
+
+def _analysis_results(total: TotalLaborCostManager, direct: DirectLaborCostManager) -> dict:
+    """관리자 분석 메서드 결과 (이름 → DataFrame)"""
+    period = total.periods.latest()
+    results = {
+        'department_summary': total.get_department_summary(),
+        'department_summary_period': total.get_department_summary(*period),
+        'monthly_trend': total.get_monthly_trend(),
+        'position_analysis': total._get_position_analysis(),
+        'summary_statistics': total._get_summary_statistics(),
+        'detailed_payroll': total._get_detailed_payroll(period).drop(columns=['id', 'created_at']),
+        'payroll_history': total.get_employee_history(HISTORY_EMPLOYEE_IDS).reset_index(),
+        'payroll_kpis': pd.DataFrame({key: result.values for key, result in total.get_kpis().items()}),
+        'overtime_trend': direct.get_overtime_trend(),
+        'hourly_cost': direct._get_hourly_cost_analysis(),
+        'direct_history': direct.get_employee_history(HISTORY_EMPLOYEE_IDS).reset_index(),
+        'direct_kpis': pd.DataFrame({key: result.values for key, result in direct.get_kpis().items()}),
+    }
+    for name, frame in direct.get_direct_labor_analysis().items():
+        results[f"direct_{name}"] = frame
+    return results
+
+
+@pytest.fixture(scope='module')
+def results(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('backends')
+    excel_path = os.path.join(workdir, 'payroll.xlsx')
+    write_synthetic_payroll(generate_payroll(200, 3, seed=11), excel_path)
+    total_db = os.path.join(workdir, 'labor_costs.db')
+    direct_db = os.path.join(workdir, 'direct_labor.db')
+
+    by_backend = {}
+    for backend in ('sqlite', 'duckdb'):
+        total = TotalLaborCostManager(total_db, analytics_backend=backend)
+        direct = DirectLaborCostManager(direct_db, analytics_backend=backend)
+        if backend == 'sqlite':
+            assert UnifiedIngest(total, direct).load_from_excel(excel_path).success
+        by_backend[backend] = _analysis_results(total, direct)
+        total.close()
+        direct.close()
+    return by_backend
+
+
+def test_analysis_results_match_across_backends(results):
+    expected, actual = results['sqlite'], results['duckdb']
+    assert expected.keys() == actual.keys()
+    for name, frame in expected.items():
+        assert not frame.empty, name
+        pd.testing.assert_frame_equal(actual[name].reset_index(drop=True), frame.reset_index(drop=True),
+                                      check_dtype=False, check_categorical=False, rtol=1e-9,
+                                      obj=name)
+
+
+def test_duckdb_period_columns_are_integers(results):
+    trend = results['duckdb']['monthly_trend']
+    assert pd.api.types.is_integer_dtype(trend['year'])
+    assert pd.api.types.is_integer_dtype(trend['month'])
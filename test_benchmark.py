@@ -0,0 +1,450 @@
+"""
+적재 / 분석 / 보고서 벤치마크
+
+합성 급여대장(create_dummy_excel.generate_payroll)을 크기별로 만들어 두 관리자의
+적재, 저장, 분석 조회, 보고서 생성 시간을 측정한다. 항목마다 새 인터프리터에서 실행하므로
+최대 RSS는 해당 항목만의 값이다. 결과는 JSON 기준선과 비교하여 회귀를 표시한다.
+
+    PAYPULSE_BENCH=1 python -m pytest test_benchmark.py     # 1천 행 기준선 대비 회귀 검사
+    python test_benchmark.py --sizes 1000 100000 1000000    # 측정 결과 출력
+    python test_benchmark.py --sizes 1000 --update-baseline # 기준선 갱신
+
+pytest 기본 실행에서는 측정하지 않는다 (PAYPULSE_BENCH=1일 때만). 측정하더라도 기준선에
+해당 크기가 없거나 기준선의 Python/pandas 버전(주.부)이 다르면 비교할 수 없으므로 건너뛴다.
+
+환경 변수:
+    PAYPULSE_BENCH            1이면 pytest에서 벤치마크 실행
+    PAYPULSE_BENCH_SIZES      pytest에서 측정할 행 수 (쉼표 구분, 기본 1000)
+    PAYPULSE_BENCH_BASELINE   기준선 파일 (기본 benchmark_baseline.json)
+    PAYPULSE_BENCH_TOLERANCE  허용 저하 비율 (기본 0.25)
+    PAYPULSE_BENCH_DIR        데이터셋/작업 디렉터리 (기본 임시 디렉터리)
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 기본 측정 크기 (행 수)
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+BASELINE_PATH = os.environ.get('PAYPULSE_BENCH_BASELINE', os.path.join(ROOT, 'benchmark_baseline.json'))
+
+# 기준선 대비 허용 저하 비율 (p50 지연 / 최대 RSS)
+TOLERANCE = float(os.environ.get('PAYPULSE_BENCH_TOLERANCE', '0.25'))
+
+# 이보다 작은 절대 차이는 측정 잡음으로 보고 회귀로 치지 않음 (p50 초 / RSS MB)
+NOISE_FLOOR = {'p50': 0.005, 'peak_rss_mb': 10.0}
+
+# 데이터셋 난수 시드 (같은 시드는 같은 데이터)
+SEED = 20250101
+
+# 반복 횟수: 조회는 여러 번, 적재/보고서는 크기에 따라
+QUERY_REPEAT = 20
+HEAVY_REPEAT = 3
+
+# 이 행 수 이하에서는 적재/보고서도 조회만큼 반복 (수십 ms 측정은 3회 중앙값으로는 잡음이 커서)
+SMALL_MAX_ROWS = 10000
+
+# 이 행 수를 넘으면 전체 읽기 적재 / 메모리 내 보고서는 측정하지 않음 (스트리밍만)
+IN_MEMORY_MAX_ROWS = 100000
+
+# 스트리밍 적재 청크 크기
+STREAM_CHUNK_SIZE = 50000
+
+# 직원 이력 조회 대상 (합성 데이터의 앞쪽 사번, 모든 크기에 존재)
+HISTORY_EMPLOYEE_IDS = tuple(f"E{i + 1001:07d}" for i in range(50))
+
+
+# ---------------------------------------------------------------------------
+# 측정 항목 (자식 프로세스에서 실행)
+# ---------------------------------------------------------------------------
+
+def _fresh_db(workdir: str, name: str) -> str:
+    path = os.path.join(workdir, f"{name}.db")
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return path
+
+
+def _managers(workdir: str):
+    from direct_labor_cost_manager import DirectLaborCostManager
+    from total_labor_cost_manager import TotalLaborCostManager
+    return (TotalLaborCostManager(os.path.join(workdir, 'total.db')),
+            DirectLaborCostManager(os.path.join(workdir, 'direct.db')))
+
+
+def _time_ingest(workdir: str, repeat: int, run: Callable[[str], bool]) -> List[float]:
+    """매 반복마다 빈 데이터베이스에 적재"""
+    latencies = []
+    for _ in range(repeat):
+        db_path = _fresh_db(workdir, 'ingest')
+        start = time.perf_counter()
+        ok = run(db_path)
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            raise RuntimeError("적재 실패")
+    return latencies
+
+
+def _case_load(manager_class: str, chunksize: Optional[int]):
+    def case(workdir: str, repeat: int) -> List[float]:
+        import direct_labor_cost_manager
+        import total_labor_cost_manager
+        cls = {'total': total_labor_cost_manager.TotalLaborCostManager,
+               'direct': direct_labor_cost_manager.DirectLaborCostManager}[manager_class]
+        excel_path = os.path.join(workdir, 'dataset.xlsx')
+
+        def run(db_path: str) -> bool:
+            manager = cls(db_path)
+            try:
+                return manager.load_from_excel(excel_path, chunksize)
+            finally:
+                manager.close()
+        return _time_ingest(workdir, repeat, run)
+    return case
+
+
+def _case_save(manager_class: str):
+    def case(workdir: str, repeat: int) -> List[float]:
+        from direct_labor_cost_manager import DirectLaborCostManager
+        from total_labor_cost_manager import TotalLaborCostManager
+        raw = pd.read_pickle(os.path.join(workdir, 'dataset.pkl'))
+        if manager_class == 'total':
+            cls, save = TotalLaborCostManager, '_save_to_database'
+            df = TotalLaborCostManager._prepare_payroll_frame(raw)
+        else:
+            cls, save = DirectLaborCostManager, '_save_direct_labor_to_database'
+            df = DirectLaborCostManager._prepare_direct_labor_frame(raw)
+
+        def run(db_path: str) -> bool:
+            manager = cls(db_path)
+            try:
+                return getattr(manager, save)(df)
+            finally:
+                manager.close()
+        return _time_ingest(workdir, repeat, run)
+    return case
+
+
+def _case_query(manager_index: int, method: str, latest_period: bool = False, **kwargs):
+    """캐시를 비운 상태에서 반복 조회"""
+    def case(workdir: str, repeat: int) -> List[float]:
+        managers = _managers(workdir)
+        manager = managers[manager_index]
+        args = ()
+        if latest_period:
+            args = tuple(manager.periods.latest())
+        latencies = []
+        try:
+            for _ in range(repeat):
+                manager.cache.clear()
+                start = time.perf_counter()
+                getattr(manager, method)(*args, **kwargs)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            for m in managers:
+                m.close()
+        return latencies
+    return case
+
+
+def _case_report(manager_index: int, method: str, streaming: bool):
+    def case(workdir: str, repeat: int) -> List[float]:
+        managers = _managers(workdir)
+        manager = managers[manager_index]
+        output_path = os.path.join(workdir, f"{method}.xlsx")
+        latencies = []
+        try:
+            for _ in range(repeat):
+                manager.cache.clear()
+                start = time.perf_counter()
+                ok = getattr(manager, method)(output_path, streaming=streaming)
+                latencies.append(time.perf_counter() - start)
+                if not ok:
+                    raise RuntimeError("보고서 생성 실패")
+        finally:
+            for m in managers:
+                m.close()
+        return latencies
+    return case
+
+
+def _case_prepare(workdir: str, repeat: int) -> List[float]:
+    """분석/보고서 측정용 데이터베이스 준비 (측정 대상 아님)"""
+    from direct_labor_cost_manager import DirectLaborCostManager
+    from total_labor_cost_manager import TotalLaborCostManager
+    from unified_ingest import UnifiedIngest
+    total = TotalLaborCostManager(_fresh_db(workdir, 'total'))
+    direct = DirectLaborCostManager(_fresh_db(workdir, 'direct'))
+    start = time.perf_counter()
+    try:
+        result = UnifiedIngest(total, direct).load_from_excel(os.path.join(workdir, 'dataset.xlsx'),
+                                                              STREAM_CHUNK_SIZE)
+        if not result.success:
+            raise RuntimeError("데이터베이스 준비 실패")
+    finally:
+        total.close()
+        direct.close()
+    return [time.perf_counter() - start]
+
+
+# 이름: (측정 함수, 종류) - 종류는 반복 횟수와 처리량 기준을 정한다
+CASES: Dict[str, tuple] = {
+    'total.load_from_excel': (_case_load('total', None), 'ingest'),
+    'total.load_from_excel[stream]': (_case_load('total', STREAM_CHUNK_SIZE), 'ingest'),
+    'total._save_to_database': (_case_save('total'), 'ingest'),
+    'direct.load_from_excel': (_case_load('direct', None), 'ingest'),
+    'direct.load_from_excel[stream]': (_case_load('direct', STREAM_CHUNK_SIZE), 'ingest'),
+    'direct._save_direct_labor_to_database': (_case_save('direct'), 'ingest'),
+    'total.get_department_summary': (_case_query(0, 'get_department_summary', latest_period=True), 'query'),
+    'total.get_monthly_trend': (_case_query(0, 'get_monthly_trend'), 'query'),
+    'total.get_kpis': (_case_query(0, 'get_kpis'), 'query'),
+    'direct.get_overtime_trend': (_case_query(1, 'get_overtime_trend'), 'query'),
+    'direct.get_direct_labor_analysis': (_case_query(1, 'get_direct_labor_analysis', latest_period=True),
+                                         'query'),
+    'direct.get_kpis': (_case_query(1, 'get_kpis'), 'query'),
+    'total.get_employee_history': (_case_query(0, 'get_employee_history', employee_ids=HISTORY_EMPLOYEE_IDS),
+                                   'query'),
+    'direct.get_employee_history': (_case_query(1, 'get_employee_history', employee_ids=HISTORY_EMPLOYEE_IDS),
+                                    'query'),
+    'total.generate_report': (_case_report(0, 'generate_report', False), 'report'),
+    'total.generate_report[stream]': (_case_report(0, 'generate_report', True), 'report'),
+    'direct.generate_detailed_report': (_case_report(1, 'generate_detailed_report', False), 'report'),
+    'direct.generate_detailed_report[stream]': (_case_report(1, 'generate_detailed_report', True), 'report'),
+}
+
+# 전체 데이터를 메모리에 올리는 항목 (대용량에서는 생략)
+IN_MEMORY_CASES = {'total.load_from_excel', 'direct.load_from_excel',
+                   'total.generate_report', 'direct.generate_detailed_report'}
+
+
+def _run_case(name: str, workdir: str, repeat: int) -> dict:
+    """자식 프로세스 진입점: 측정 후 지연 시간과 최대 RSS 반환"""
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    sys.path.insert(0, ROOT)
+    fn = _case_prepare if name == 'prepare' else CASES[name][0]
+    latencies = fn(workdir, repeat)
+    return {'latencies': latencies, 'peak_rss_mb': _peak_rss_mb()}
+
+
+def _peak_rss_mb() -> float:
+    """
+    현재 프로세스의 최대 RSS(MB)
+
+    ru_maxrss는 fork/exec 후에도 부모 값이 이어지므로 리눅스에서는 exec 시 초기화되는
+    /proc/self/status의 VmHWM을 우선 사용한다.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# 실행 / 기준선 비교
+# ---------------------------------------------------------------------------
+
+def prepare_dataset(rows: int, base_dir: Optional[str] = None) -> str:
+    """크기별 데이터셋 작업 디렉터리 (데이터셋 파일은 재사용)"""
+    from create_dummy_excel import generate_payroll, write_synthetic_payroll
+
+    base_dir = base_dir or os.environ.get('PAYPULSE_BENCH_DIR') or os.path.join(tempfile.gettempdir(),
+                                                                                 'paypulse_bench')
+    workdir = os.path.join(base_dir, f"{rows}_{SEED}")
+    os.makedirs(workdir, exist_ok=True)
+    excel_path = os.path.join(workdir, 'dataset.xlsx')
+    if not os.path.exists(excel_path):
+        months = 12 if rows >= 12 else 1
+        data = generate_payroll(max(rows // months, 1), months, seed=SEED)
+        data.payroll.to_pickle(os.path.join(workdir, 'dataset.pkl'))
+        write_synthetic_payroll(data, excel_path + '.tmp.xlsx')
+        os.replace(excel_path + '.tmp.xlsx', excel_path)
+    return workdir
+
+
+def _spawn(name: str, workdir: str, repeat: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--case', name, '--workdir', workdir, '--repeat', str(repeat)],
+        cwd=ROOT, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"{name} 측정 실패:\n{output.stderr[-2000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def summarize(latencies: List[float], rows: int, peak_rss_mb: float) -> dict:
+    """지연 시간 목록을 p50/p95/처리량으로 요약"""
+    p50 = float(np.percentile(latencies, 50))
+    return {
+        'runs': len(latencies),
+        'p50': round(p50, 6),
+        'p95': round(float(np.percentile(latencies, 95)), 6),
+        'rows_per_sec': round(rows / p50, 1) if p50 > 0 else None,
+        'peak_rss_mb': round(peak_rss_mb, 1)
+    }
+
+
+def run_benchmarks(sizes: List[int], cases: Optional[List[str]] = None,
+                   base_dir: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+    """
+    크기별 벤치마크 실행
+
+    Args:
+        sizes (List[int]): 데이터셋 행 수 목록
+        cases (Optional[List[str]]): 측정할 항목 (None이면 전체)
+        base_dir (Optional[str]): 데이터셋 디렉터리
+
+    Returns:
+        Dict[str, Dict[str, dict]]: {행 수: {항목: 요약}}
+    """
+    results = {}
+    for rows in sizes:
+        workdir = prepare_dataset(rows, base_dir)
+        actual_rows = len(pd.read_pickle(os.path.join(workdir, 'dataset.pkl')))
+        _spawn('prepare', workdir, 1)
+
+        size_results = {}
+        for name, (_, kind) in CASES.items():
+            if cases and name not in cases:
+                continue
+            if name in IN_MEMORY_CASES and rows > IN_MEMORY_MAX_ROWS:
+                continue
+            if kind == 'query' or rows <= SMALL_MAX_ROWS:
+                repeat = QUERY_REPEAT
+            else:
+                repeat = HEAVY_REPEAT if rows <= IN_MEMORY_MAX_ROWS else 1
+            measured = _spawn(name, workdir, repeat)
+            size_results[name] = summarize(measured['latencies'], actual_rows, measured['peak_rss_mb'])
+        results[str(rows)] = size_results
+    return results
+
+
+def read_baseline(path: str = BASELINE_PATH) -> dict:
+    """기준선 파일 전체 (python, pandas, tolerance, results), 없으면 빈 dict"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    return read_baseline(path).get('results', {})
+
+
+def _minor_version(version: str) -> str:
+    return '.'.join(version.split('.')[:2])
+
+
+def baseline_mismatch(baseline: dict, sizes: List[int]) -> Optional[str]:
+    """기준선과 비교할 수 없는 이유 (비교 가능하면 None)"""
+    if not baseline:
+        return f"기준선 파일이 없습니다: {BASELINE_PATH} (--update-baseline으로 생성)"
+    missing = [size for size in sizes if str(size) not in baseline.get('results', {})]
+    if missing:
+        return f"기준선에 {missing}행 결과가 없습니다: {BASELINE_PATH}"
+    current = {'python': sys.version.split()[0], 'pandas': pd.__version__}
+    for name, version in current.items():
+        if _minor_version(baseline.get(name, '')) != _minor_version(version):
+            return f"기준선의 {name} 버전({baseline.get(name)})이 현재({version})와 다릅니다"
+    return None
+
+
+def save_baseline(results: dict, path: str = BASELINE_PATH):
+    """기존 기준선에 측정한 크기만 덮어써서 저장"""
+    merged = load_baseline(path)
+    merged.update(results)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'pandas': pd.__version__,
+                   'tolerance': TOLERANCE, 'results': merged}, f, ensure_ascii=False, indent=2)
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> List[str]:
+    """기준선보다 p50 지연 또는 최대 RSS가 허용 비율 이상 나빠진 항목"""
+    regressions = []
+    for size, size_results in results.items():
+        for name, current in size_results.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            for metric in ('p50', 'peak_rss_mb'):
+                if (previous[metric] and current[metric] > previous[metric] * (1 + tolerance)
+                        and current[metric] - previous[metric] > NOISE_FLOOR[metric]):
+                    regressions.append(f"{size}행 {name} {metric}: {previous[metric]} → {current[metric]}")
+    return regressions
+
+
+def format_results(results: dict, baseline: Optional[dict] = None) -> str:
+    lines = []
+    for size, size_results in results.items():
+        lines.append(f"\n== {int(size):,}행 ==")
+        lines.append(f"{'항목':<42}{'p50(s)':>10}{'p95(s)':>10}{'행/초':>14}{'RSS(MB)':>10}{'기준 대비':>10}")
+        for name, r in size_results.items():
+            previous = (baseline or {}).get(size, {}).get(name)
+            change = f"{r['p50'] / previous['p50'] - 1:+.0%}" if previous and previous['p50'] else '-'
+            lines.append(f"{name:<42}{r['p50']:>10.4f}{r['p95']:>10.4f}{r['rows_per_sec'] or 0:>14,.0f}"
+                         f"{r['peak_rss_mb']:>10.1f}{change:>10}")
+    return '\n'.join(lines)
+
+
+def test_benchmark_no_regressions():
+    import pytest
+
+    if os.environ.get('PAYPULSE_BENCH') != '1':
+        pytest.skip("벤치마크는 PAYPULSE_BENCH=1일 때만 실행")
+    sizes = [int(size) for size in os.environ.get('PAYPULSE_BENCH_SIZES', '1000').split(',')]
+    baseline = read_baseline()
+    reason = baseline_mismatch(baseline, sizes)
+    if reason:
+        pytest.skip(reason)
+
+    results = run_benchmarks(sizes)
+    for size_results in results.values():
+        assert set(size_results) >= {name for name in CASES if name not in IN_MEMORY_CASES}
+    regressions = find_regressions(results, baseline['results'])
+    assert not regressions, "성능 회귀:\n" + '\n'.join(regressions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PayPulse 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="데이터셋 행 수")
+    parser.add_argument('--cases', nargs='+', help="측정할 항목 (기본 전체)")
+    parser.add_argument('--update-baseline', action='store_true', help="측정 결과를 기준선으로 저장")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--repeat', type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(_run_case(args.case, args.workdir, args.repeat)))
+        sys.exit(0)
+
+    baseline = load_baseline()
+    results = run_benchmarks(args.sizes, args.cases)
+    print(format_results(results, baseline))
+    regressions = find_regressions(results, baseline)
+    if regressions:
+        print("\n⚠️ 성능 회귀:")
+        for line in regressions:
+            print(f"  {line}")
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"\n기준선 저장: {BASELINE_PATH}")
+    sys.exit(1 if regressions and not args.update_baseline else 0)
@@ -0,0 +1,71 @@
+"""
+연결 풀 회귀 검사
+
+스레드별 읽기 연결이 스레드 종료 시 닫히는지, 캐시된 조회가 호출 스레드의 읽기 연결로
+데이터 버전을 확인하여 작성자 연결의 직접 커밋도 감지하는지 점검한다.
+
+    python -m pytest test_connection_pool.py
+"""
+
+import gc
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from connection_pool import ConnectionPool
+from create_dummy_excel import generate_payroll, write_synthetic_payroll
+from total_labor_cost_manager import TotalLaborCostManager
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(os.path.join(tmp_path, 'pool.db'))
+    pool.writer.execute("CREATE TABLE t (x INTEGER)")
+    pool.writer.commit()
+    yield pool
+    pool.close()
+
+
+def _run_in_thread(target):
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    gc.collect()
+
+
+def test_reader_of_finished_thread_is_closed(pool):
+    opened = []
+    _run_in_thread(lambda: opened.append(pool.reader()))
+
+    assert len(pool.readers) == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_close_closes_live_thread_readers(pool):
+    reader = pool.reader()
+    assert pool.reader() is reader and len(pool.readers) == 1
+    pool.close()
+    assert len(pool.readers) == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        reader.execute("SELECT 1")
+
+
+def test_cached_query_sees_writer_commit(tmp_path):
+    excel_path = os.path.join(tmp_path, 'payroll.xlsx')
+    write_synthetic_payroll(generate_payroll(20, 1, seed=3), excel_path)
+    manager = TotalLaborCostManager(os.path.join(tmp_path, 'labor.db'))
+    try:
+        assert manager.load_from_excel(excel_path)
+        employee_id = manager.reader.execute("SELECT MIN(employee_id) FROM payroll").fetchone()[0]
+        before = manager.get_employee_history(employee_id)['base_salary'].sum()
+
+        # 관리자 메서드를 거치지 않은 작성자 연결의 커밋 (캐시 무효화 없음)
+        manager.connection.execute("UPDATE payroll SET base_salary = base_salary + 1 WHERE employee_id = ?",
+                                   (employee_id,))
+        manager.connection.commit()
+        assert manager.get_employee_history(employee_id)['base_salary'].sum() == before + 1
+    finally:
+        manager.close()
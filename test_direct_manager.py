@@ -1,5 +1,10 @@
+import logging
+
 from direct_labor_cost_manager import DirectLaborCostManager
 
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
 # 직접인건비 전문 관리자
 direct_manager = DirectLaborCostManager("direct_labor.db")
 
@@ -0,0 +1,65 @@
+"""
+관리자 모듈 콜드 스타트 벤치마크
+
+새 인터프리터에서 모듈 import 시간을 측정하여, 필수 의존성(pandas) import 시간 대비
+추가 시간이 예산을 넘거나 시각화/Excel 라이브러리가 import 시점에 로드되면 실패한다.
+
+    python -m pytest test_import_time.py
+    python test_import_time.py          # 측정 결과 출력
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# pandas import 이후 모듈별로 허용하는 추가 import 시간(초)
+IMPORT_BUDGET = float(os.environ.get('PAYPULSE_IMPORT_BUDGET', '0.35'))
+
+# 측정 반복 횟수 (최솟값 사용)
+REPEAT = 3
+
+MANAGER_MODULES = ['total_labor_cost_manager', 'direct_labor_cost_manager']
+
+# import 시점에 로드되면 안 되는 무거운 모듈
+LAZY_MODULES = ['matplotlib', 'seaborn', 'openpyxl', 'xlsxwriter']
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """새 인터프리터에서 module import 시간 측정 (REPEAT회 중 최솟값)"""
+    results = []
+    for _ in range(REPEAT):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, lazy=LAZY_MODULES)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result['elapsed'])
+
+
+def test_manager_cold_start():
+    baseline = measure_import('pandas')['elapsed']
+    for module in MANAGER_MODULES:
+        result = measure_import(module)
+        assert not result['loaded'], f"{module} import 시 로드됨: {result['loaded']}"
+        overhead = result['elapsed'] - baseline
+        assert overhead <= IMPORT_BUDGET, (
+            f"{module} import 시간 초과: {result['elapsed']:.3f}초 "
+            f"(pandas {baseline:.3f}초 + 예산 {IMPORT_BUDGET:.2f}초)")
+
+
+if __name__ == "__main__":
+    baseline = measure_import('pandas')['elapsed']
+    print(f"pandas: {baseline:.3f}초")
+    for module in MANAGER_MODULES:
+        result = measure_import(module)
+        print(f"{module}: {result['elapsed']:.3f}초 (추가 {result['elapsed'] - baseline:.3f}초), "
+              f"지연 로드 위반: {result['loaded'] or '없음'}")
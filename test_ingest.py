@@ -0,0 +1,189 @@
+"""
+적재 트랜잭션 / 적재 원장 회귀 검사
+
+합성 급여대장으로 통합 적재와 관리자 적재를 실행하여 커밋 범위와 파일 단위 생략을 점검한다.
+파일 단위 생략은 그 파일이 담은 기간이 다른 적재로 바뀌지 않았을 때만 일어나야 한다 (A → B → A).
+
+    python -m pytest test_ingest.py
+"""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import unified_ingest
+from create_dummy_excel import generate_payroll, write_synthetic_payroll
+from direct_labor_cost_manager import DirectLaborCostManager
+from total_labor_cost_manager import TotalLaborCostManager
+from unified_ingest import UnifiedIngest
+
+
+@pytest.fixture(scope='module')
+def excel_path(tmp_path_factory):
+    path = os.path.join(tmp_path_factory.mktemp('ingest'), 'payroll.xlsx')
+    write_synthetic_payroll(generate_payroll(100, 2, seed=5), path)
+    return path
+
+
+@pytest.fixture
+def shared_managers(tmp_path):
+    db_path = os.path.join(tmp_path, 'labor.db')
+    total = TotalLaborCostManager(db_path)
+    direct = DirectLaborCostManager(db_path)
+    yield total, direct
+    total.close()
+    direct.close()
+
+
+def _stored(total: TotalLaborCostManager):
+    reader = total.pool.reader()
+    return {
+        'payroll': reader.execute("SELECT COUNT(*) FROM payroll").fetchone()[0],
+        'direct_labor': reader.execute("SELECT COUNT(*) FROM direct_labor").fetchone()[0],
+        'files': sorted(row[0] for row in reader.execute("SELECT target_table FROM ingest_files")),
+    }
+
+
+@pytest.mark.parametrize('chunksize', [None, 64])
+def test_shared_database_rolls_back_both_tables(shared_managers, excel_path, monkeypatch, chunksize):
+    total, direct = shared_managers
+    ingest = UnifiedIngest(total, direct)
+    assert ingest.shared_database
+
+    def fail(periods):
+        raise RuntimeError("집계 갱신 실패")
+
+    monkeypatch.setattr(direct.rollups, 'refresh', fail)
+    assert not ingest.load_from_excel(excel_path, chunksize=chunksize).success
+    assert _stored(total) == {'payroll': 0, 'direct_labor': 0, 'files': []}
+
+    monkeypatch.undo()
+    assert direct.ledger.connection is direct.pool.writer
+    result = ingest.load_from_excel(excel_path, chunksize=chunksize)
+    assert result.success and result.targets == ['payroll', 'direct_labor']
+    assert _stored(total) == {'payroll': 200, 'direct_labor': 200, 'files': ['direct_labor', 'payroll']}
+
+
+def test_shared_database_streams_workbook_once(shared_managers, excel_path, monkeypatch):
+    total, direct = shared_managers
+    opened = []
+    iter_excel_chunks = unified_ingest.iter_excel_chunks
+
+    def counting_chunks(path, *args, **kwargs):
+        opened.append(path)
+        return iter_excel_chunks(path, *args, **kwargs)
+
+    monkeypatch.setattr(unified_ingest, 'iter_excel_chunks', counting_chunks)
+    assert UnifiedIngest(total, direct).load_from_excel(excel_path, chunksize=64).success
+    assert opened == [excel_path]
+    assert _stored(total)['direct_labor'] == 200
+
+
+class _FailingCommit:
+    """commit()만 실패하는 연결 대리 객체"""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def commit(self):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+@pytest.mark.parametrize('chunksize', [None, 64])
+def test_separate_databases_report_partial_commit(tmp_path, excel_path, monkeypatch, chunksize):
+    total = TotalLaborCostManager(os.path.join(tmp_path, 'labor_costs.db'))
+    direct = DirectLaborCostManager(os.path.join(tmp_path, 'direct_labor.db'))
+    try:
+        ingest = UnifiedIngest(total, direct)
+        assert not ingest.shared_database
+        monkeypatch.setattr(direct, 'connection', _FailingCommit(direct.connection))
+
+        # 종합 인건비는 커밋된 뒤 직접 인건비 커밋이 실패: 커밋된 저장소만 결과에 남음
+        result = ingest.load_from_excel(excel_path, chunksize=chunksize)
+        assert not result.success
+        assert result.targets == ['payroll']
+        assert result.payroll_merge is not None and result.direct_merge is None
+        assert _base_salary_total(total) is not None and _base_salary_total(direct) is None
+
+        monkeypatch.undo()
+        retry = ingest.load_from_excel(excel_path, chunksize=chunksize)
+        assert retry.success and retry.targets == ['direct_labor']
+        assert direct.pool.reader().execute("SELECT COUNT(*) FROM direct_labor").fetchone()[0] == 200
+    finally:
+        total.close()
+        direct.close()
+
+
+@pytest.fixture(scope='module')
+def revised_pair(tmp_path_factory):
+    """같은 기간의 원본 A와 기본급만 1000원씩 올린 B"""
+    workdir = tmp_path_factory.mktemp('revised')
+    original = generate_payroll(50, 1, seed=9)
+    path_a = os.path.join(workdir, 'a.xlsx')
+    write_synthetic_payroll(original, path_a)
+    original.payroll['기본급'] += 1000
+    path_b = os.path.join(workdir, 'b.xlsx')
+    write_synthetic_payroll(original, path_b)
+    return path_a, path_b
+
+
+def _base_salary_total(manager) -> int:
+    table = manager.ledger.target_table
+    return manager.pool.reader().execute(f"SELECT SUM(base_salary) FROM {table}").fetchone()[0]
+
+
+@pytest.mark.parametrize('manager_class', [TotalLaborCostManager, DirectLaborCostManager])
+def test_reloading_replaced_file_restores_its_data(tmp_path, revised_pair, manager_class):
+    path_a, path_b = revised_pair
+    manager = manager_class(os.path.join(tmp_path, 'labor.db'))
+    try:
+        assert manager.load_from_excel(path_a)
+        total_a = _base_salary_total(manager)
+        assert manager.load_from_excel(path_b)
+        assert _base_salary_total(manager) == total_a + 50 * 1000
+
+        # A의 기간이 B로 바뀌었으므로 A는 생략되지 않고 다시 반영된다
+        assert not manager.ledger.is_file_loaded(manager.ledger.file_hash(path_a))
+        assert manager.load_from_excel(path_a)
+        assert _base_salary_total(manager) == total_a
+        assert manager.ledger.is_file_loaded(manager.ledger.file_hash(path_a))
+    finally:
+        manager.close()
+
+
+def test_unified_reload_of_replaced_file(shared_managers, revised_pair):
+    total, direct = shared_managers
+    path_a, path_b = revised_pair
+    ingest = UnifiedIngest(total, direct)
+    assert ingest.load_from_excel(path_a).success
+    totals_a = (_base_salary_total(total), _base_salary_total(direct))
+    assert ingest.load_from_excel(path_b).success
+
+    result = ingest.load_from_excel(path_a)
+    assert result.success and result.targets == ['payroll', 'direct_labor']
+    assert (_base_salary_total(total), _base_salary_total(direct)) == totals_a
+    assert ingest.load_from_excel(path_a).targets == []
+
+
+def test_load_directory_rerun_keeps_last_file(tmp_path, revised_pair):
+    path_a, path_b = revised_pair
+    directory = os.path.join(tmp_path, 'files')
+    os.makedirs(directory)
+    shutil.copy(path_a, os.path.join(directory, '01.xlsx'))
+    shutil.copy(path_b, os.path.join(directory, '02.xlsx'))
+
+    manager = TotalLaborCostManager(os.path.join(tmp_path, 'labor.db'))
+    try:
+        assert all(report.success for report in manager.load_directory(directory, workers=1))
+        expected = _base_salary_total(manager)
+        # 01이 02에 덮어써졌으므로 다시 적재하되 02도 뒤따라 적재되어 결과는 그대로
+        reports = manager.load_directory(directory, workers=1)
+        assert [report.skipped for report in reports] == [False, False]
+        assert _base_salary_total(manager) == expected
+    finally:
+        manager.close()
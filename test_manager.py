@@ -1,5 +1,10 @@
+import logging
+
 from total_labor_cost_manager import TotalLaborCostManager
 
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
 # 매니저 초기화
 manager = TotalLaborCostManager("labor_costs.db")
 
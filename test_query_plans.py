@@ -0,0 +1,56 @@
+"""
+쿼리 실행 계획 회귀 검사
+
+합성 급여대장을 두 저장소에 적재한 뒤 관리자의 조회/보고서/내보내기를 실행하고,
+실행된 모든 SQL을 EXPLAIN QUERY PLAN으로 점검한다. 원장 테이블 전체 스캔이나
+기간 인덱스로 한정되지 않은 정렬이 생기면 실패한다.
+
+    python -m pytest test_query_plans.py
+    python query_advisor.py --total-db labor_costs.db --direct-db direct_labor.db   # 실제 DB 점검
+"""
+
+import os
+
+import pytest
+
+from create_dummy_excel import generate_payroll, write_synthetic_payroll
+from direct_labor_cost_manager import DirectLaborCostManager
+from query_advisor import QueryPlanAdvisor, advise, format_findings
+from total_labor_cost_manager import TotalLaborCostManager
+from unified_ingest import UnifiedIngest
+
+
+@pytest.fixture(scope='module')
+def managers(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('plans')
+    excel_path = os.path.join(workdir, 'payroll.xlsx')
+    write_synthetic_payroll(generate_payroll(200, 3, seed=7), excel_path)
+
+    total = TotalLaborCostManager(os.path.join(workdir, 'labor_costs.db'))
+    direct = DirectLaborCostManager(os.path.join(workdir, 'direct_labor.db'))
+    # 적재 중 실행된 병합/집계 갱신 SQL도 함께 점검
+    with QueryPlanAdvisor.capture(total.connection, direct.connection) as ingest_statements:
+        assert UnifiedIngest(total, direct).load_from_excel(excel_path).success
+    yield total, direct, ingest_statements
+    total.close()
+    direct.close()
+
+
+def test_manager_queries_have_no_plan_regressions(managers):
+    total, direct, ingest_statements = managers
+    findings = advise(total, direct, statements=ingest_statements)
+    regressions = [finding for finding in findings if finding.is_regression]
+    assert not regressions, format_findings(regressions)
+
+
+def test_advisor_flags_scan_and_creates_index(managers):
+    total = managers[0]
+    advisor = QueryPlanAdvisor(total.connection)
+    query = "SELECT * FROM payroll WHERE employee_name = '직원0000001'"
+
+    findings = advisor.check([query])
+    assert [finding.kind for finding in findings] == ['full_scan']
+    assert findings[0].suggestion.columns == ('employee_name',)
+
+    assert advisor.apply(advisor.suggestions(findings)) == [findings[0].suggestion.name]
+    assert advisor.check([query]) == []
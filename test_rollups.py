@@ -0,0 +1,64 @@
+"""
+월별 집계 테이블 회귀 검사
+
+집계 컬럼은 NUMERIC이라 정수로 떨어지는 실수 합계가 INTEGER로 저장된다.
+조회 시 평균(합계 / 인원)이 정수 나눗셈으로 잘리지 않는지 정수 값 입력으로 확인한다.
+
+    python -m pytest test_rollups.py
+"""
+
+import pandas as pd
+import pytest
+
+from direct_labor_cost_manager import DirectLaborCostManager
+
+
+@pytest.fixture
+def direct():
+    manager = DirectLaborCostManager(':memory:')
+    # 정제가 끝난 두 직원 (시간/시간당 임금/생산성 합계가 모두 정수로 떨어짐)
+    df = pd.DataFrame({
+        'employee_id': ['E0000001', 'E0000002'],
+        'employee_name': ['직원1', '직원2'],
+        'department': ['개발팀', '개발팀'],
+        'position': ['사원', '사원'],
+        'work_type': ['정규직', '정규직'],
+        'base_salary': [3000000, 3000000],
+        'overtime_pay': [150000, 165000],
+        'night_shift_pay': [0, 0],
+        'holiday_pay': [0, 0],
+        'skill_allowance': [0, 0],
+        'direct_total': [3150000, 3165000],
+        'work_hours': [40.0, 40.0],
+        'overtime_hours': [10.0, 11.0],
+        'hourly_rate': [17000.0, 17001.0],
+        'overtime_rate': [25500.0, 25501.5],
+        'productivity_score': [90.0, 91.0],
+        'cost_center': ['개발팀', '개발팀'],
+        'project_code': ['DEFAULT', 'DEFAULT'],
+        'payment_date': ['2025-01-25', '2025-01-25'],
+        'year': [2025, 2025],
+        'month': [1, 1],
+    })
+    assert manager._save_direct_labor_to_database(df)
+    yield manager
+    manager.close()
+
+
+def test_whole_valued_sums_are_stored_as_integers(direct):
+    stored = direct.connection.execute(
+        "SELECT typeof(ot_total_hours), typeof(sum_productivity) FROM direct_labor_dept_rollup").fetchone()
+    assert stored == ('integer', 'integer')
+
+
+def test_rollup_averages_do_not_truncate(direct):
+    trend = direct.get_overtime_trend()
+    assert trend['avg_overtime_hours'].tolist() == [10.5]
+
+    analysis = direct.get_direct_labor_analysis(2025, 1)
+    department = analysis['department_analysis'].iloc[0]
+    assert department['avg_hourly_rate'] == 17000.5
+    assert department['avg_productivity'] == 90.5
+    position = analysis['position_analysis'].iloc[0]
+    assert position['avg_hourly_rate'] == 17000.5
+    assert position['avg_overtime_hours'] == 10.5
@@ -8,32 +8,177 @@ import sqlite3
 import numpy as np
 from datetime import datetime, timedelta
 import os
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from bulk_loader import DEFAULT_BATCH_SIZE, BulkLoadResult
+from connection_pool import ConnectionPool, serialized_write
+from columnar_export import ExportedPartition, PartitionedExporter, export_datasets
+from dimensions import DimensionStore
+from employee_history import read_employee_history
+from excel_stream import iter_excel_chunks
+from frame_dtypes import MemoryReport, constant, downcast_integer, fill_category, money, record_stage, to_category
+from instrumentation import MetricsRegistry, default_registry, instrumented
+from ingest_ledger import IngestLedger, MergeResult
+from parallel_ingest import FileIngestReport, list_excel_files, run_parallel_ingest
+from kpi_engine import KpiEngine, KpiResult, MetricDefinition
+from period_catalog import Period, PeriodCatalog
+from storage_backend import StorageBackend, create_backend
+from year_archive import YearArchive
+from rollups import RollupSpec, RollupStore
+from query_cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, QueryCache, cached_query
+from report_writer import ReportSheet, ReportWriteResult, StreamingReportWriter
+
 logger = logging.getLogger(__name__)
 
 class TotalLaborCostManager:
     """종합 인건비 관리 시스템"""
     
-    def __init__(self, db_path: str = "labor_costs.db"):
+    # payroll 테이블 저장 컬럼 순서
+    PAYROLL_COLUMNS = [
+        'employee_id', 'employee_name', 'department', 'position',
+        'base_salary', 'overtime_pay', 'allowances', 'bonuses', 'deductions',
+        'net_salary', 'payment_date', 'year', 'month'
+    ]
+    
+    # 정수 키(dim_* 사전)로 저장하는 라벨 컬럼
+    PAYROLL_DIMENSIONS = ['department', 'position']
+    
+    # 입력 데이터에 없을 때 사용할 선택 컬럼 기본값
+    PAYROLL_DEFAULTS = {
+        'position': '일반',
+        'overtime_pay': 0,
+        'allowances': 0,
+        'bonuses': 0,
+        'deductions': 0,
+        'payment_date': ''
+    }
+    
+    # 월별 집계 테이블 측정값 (평균은 조회 시 합계 / 인원으로 계산)
+    PAYROLL_MEASURES = {
+        'employee_count': 'COUNT(*)',
+        'total_base_salary': 'SUM(base_salary)',
+        'total_overtime': 'SUM(overtime_pay)',
+        'total_allowances': 'SUM(allowances)',
+        'total_bonuses': 'SUM(bonuses)',
+        'total_deductions': 'SUM(deductions)',
+        'total_net_salary': 'SUM(net_salary)',
+        'max_salary': 'MAX(net_salary)',
+        'min_salary': 'MIN(net_salary)'
+    }
+    
+    # 기간 전체 / 부서별 / 직급별 집계 테이블
+    PAYROLL_ROLLUPS = [
+        RollupSpec('payroll_period_rollup', (), PAYROLL_MEASURES),
+        RollupSpec('payroll_dept_rollup', ('department',), PAYROLL_MEASURES),
+        RollupSpec('payroll_position_rollup', ('position',), PAYROLL_MEASURES)
+    ]
+    
+    # 요약 통계 KPI 지표
+    SUMMARY_METRICS = [
+        MetricDefinition('employee_count', '전체 직원 수', 'COUNT(*)'),
+        MetricDefinition('total_net_salary', '총 인건비', 'SUM(net_salary)', '원'),
+        MetricDefinition('avg_salary', '평균 급여', 'AVG(net_salary)', '원'),
+        MetricDefinition('department_count', '부서 수', 'COUNT(DISTINCT department_id)', '개')
+    ]
+    
+    # 상세 급여 데이터 조회 (year, month)
+    DETAILED_PAYROLL_QUERY = """
+        SELECT 
+            p.id,
+            p.employee_id,
+            p.employee_name,
+            dept.label as department,
+            pos.label as position,
+            p.base_salary,
+            p.overtime_pay,
+            p.allowances,
+            p.bonuses,
+            p.deductions,
+            p.net_salary,
+            p.payment_date,
+            p.year,
+            p.month,
+            p.created_at
+        FROM payroll p
+        LEFT JOIN dim_department dept ON dept.id = p.department_id
+        LEFT JOIN dim_position pos ON pos.id = p.position_id
+        WHERE p.year = ? AND p.month = ?
+        ORDER BY department, p.net_salary DESC
+    """
+    
+    # Excel 컬럼명 표준화 매핑
+    COLUMN_MAPPING = {
+        '사번': 'employee_id',
+        '성명': 'employee_name',
+        '이름': 'employee_name',
+        '부서': 'department',
+        '직급': 'position',
+        '직책': 'position',
+        '기본급': 'base_salary',
+        '연장근무수당': 'overtime_pay',
+        '제수당': 'allowances',
+        '상여금': 'bonuses',
+        '공제액': 'deductions',
+        '실지급액': 'net_salary',
+        '지급일': 'payment_date',
+        '년도': 'year',
+        '월': 'month'
+    }
+    
+    # 필수 컬럼
+    REQUIRED_COLUMNS = ['employee_id', 'employee_name', 'department', 'base_salary']
+    
+    def __init__(self, db_path: str = "labor_costs.db", batch_size: int = DEFAULT_BATCH_SIZE,
+                 cache_size: int = DEFAULT_CACHE_SIZE, cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 metrics: Optional[MetricsRegistry] = None, analytics_backend: str = 'sqlite',
+                 mirror_dir: Optional[str] = None, archive_dir: Optional[str] = None):
         """
         TotalLaborCostManager 초기화
         
         Args:
             db_path (str): SQLite 데이터베이스 파일 경로
+            batch_size (int): 대량 저장 시 executemany 배치 크기
+            cache_size (int): 조회 결과 캐시 항목 수 (0이면 캐시 사용 안 함)
+            cache_ttl (Optional[float]): 조회 결과 캐시 유효 시간(초)
+            metrics (Optional[MetricsRegistry]): 실행 계측 집계기 (None이면 프로세스 공용 default_registry)
+            analytics_backend (str): 분석 조회 백엔드 ('sqlite' 또는 Parquet 미러 위의 'duckdb')
+            mirror_dir (Optional[str]): duckdb 백엔드의 Parquet 미러 디렉터리 (None이면 '{db_path}.mirror')
+            archive_dir (Optional[str]): 연도별 보관 파일 디렉터리 (None이면 '{db_path}.archive')
         """
         self.db_path = db_path
+        self.batch_size = batch_size
+        # 메서드별 실행 시간, SQL 문 수/시간, 캐시 적중 기록 (metrics.to_prometheus()로 출력)
+        self.metrics = metrics if metrics is not None else default_registry
+        self.pool: Optional[ConnectionPool] = None
         self.connection = None
+        self.last_load_result: Optional[BulkLoadResult] = None
+        self.last_merge_result: Optional[MergeResult] = None
+        self.ledger: Optional[IngestLedger] = None
+        self.dimensions: Optional[DimensionStore] = None
+        self.rollups: Optional[RollupStore] = None
+        self.periods: Optional[PeriodCatalog] = None
+        self.kpis: Optional[KpiEngine] = None
+        self.analytics_backend = analytics_backend
+        self.mirror_dir = mirror_dir
+        self.backend: Optional[StorageBackend] = None
+        self.archive_dir = archive_dir
+        self.archive: Optional[YearArchive] = None
+        self.last_report_result: Optional[ReportWriteResult] = None
+        # 마지막 Excel 전체 적재의 정제 단계별 메모리
+        self.last_memory_report: Optional[MemoryReport] = None
+        # 저장 시 invalidate()로 무효화, 다른 연결의 변경은 PRAGMA data_version으로 감지
+        self.cache = QueryCache(cache_size, cache_ttl, external_version=self._data_version)
         self._initialize_database()
         logger.info(f"TotalLaborCostManager 초기화 완료: {db_path}")
     
     def _initialize_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # 작성자 연결은 적재 전용, 조회는 self.reader (스레드별 읽기 전용 연결)
+            self.pool = ConnectionPool(self.db_path, metrics=self.metrics)
+            self.connection = self.pool.writer
             cursor = self.connection.cursor()
             
             # 급여대장 테이블 생성
@@ -42,8 +187,8 @@ class TotalLaborCostManager:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     employee_id TEXT NOT NULL,
                     employee_name TEXT NOT NULL,
-                    department TEXT NOT NULL,
-                    position TEXT,
+                    department_id INTEGER NOT NULL,
+                    position_id INTEGER,
                     base_salary INTEGER,
                     overtime_pay INTEGER DEFAULT 0,
                     allowances INTEGER DEFAULT 0,
@@ -69,23 +214,63 @@ class TotalLaborCostManager:
                 )
             """)
             
+            # 부서/직급 사전 (라벨 컬럼으로 저장된 기존 테이블은 정수 키로 변환)
+            self.dimensions = DimensionStore(self.connection, 'payroll', self.PAYROLL_DIMENSIONS)
+            self.dimensions.ensure_schema()
+            
             # 인덱스 생성
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payroll_dept_date ON payroll(department, year, month)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payroll_dept_date ON payroll(department_id, year, month)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_payroll_employee ON payroll(employee_id)")
+            # 기간 우선 조회용
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_payroll_period "
+                           "ON payroll(year, month, department_id, net_salary DESC)")
+            
+            # 적재 원장 (파일/기간/행 해시) 및 (사번, 년, 월) 고유 키
+            self.ledger = IngestLedger(self.connection, 'payroll', self.PAYROLL_COLUMNS,
+                                       batch_size=self.batch_size, dimensions=self.dimensions)
+            self.ledger.ensure_schema()
+            self.ledger.ensure_unique_key()
+            
+            # 월별 집계 테이블 (적재 시 변경된 기간만 갱신)
+            self.rollups = RollupStore(self.connection, 'payroll', self.PAYROLL_ROLLUPS, self.dimensions)
+            self.rollups.ensure_schema()
+            
+            # 기간 카탈로그 (최신 기간 조회용)
+            self.periods = PeriodCatalog(self.connection, 'payroll', reader=self.pool.reader)
+            self.periods.ensure_schema()
+            
+            # 연도별 보관 저장소 (지난 연도는 roll_year()로 별도 파일에 보관)
+            self.archive = YearArchive(self.pool, 'payroll', self.archive_dir)
+            self.archive.ensure_schema()
             
             self.connection.commit()
+            # 변환 전에 보관한 연도 파일도 같은 스키마로 변환
+            self.archive.upgrade(self.dimensions.migrate)
+            
+            # 분석 조회 백엔드 (적재/기간 카탈로그/내보내기는 항상 SQLite)
+            # 읽기 연결이 스키마를 볼 수 있도록 커밋 후 생성
+            self.backend = create_backend(self.analytics_backend, self.pool, 'payroll',
+                                          ['payroll'] + [spec.table for spec in self.PAYROLL_ROLLUPS],
+                                          self.mirror_dir, self.archive, lookups=self.dimensions.tables)
+            
+            # 단일 스캔 KPI 엔진
+            self.kpis = KpiEngine(self.connection, 'payroll', self.SUMMARY_METRICS,
+                                  reader=self.backend.reader)
+            
             logger.info("데이터베이스 테이블 초기화 완료")
             
         except Exception as e:
             logger.error(f"데이터베이스 초기화 오류: {e}")
             raise
     
-    def load_from_excel(self, excel_path: str) -> bool:
+    @instrumented
+    def load_from_excel(self, excel_path: str, chunksize: Optional[int] = None) -> bool:
         """
         Excel 급여대장 파일에서 데이터 로드
         
         Args:
             excel_path (str): Excel 파일 경로
+            chunksize (Optional[int]): 지정 시 읽기 전용 스트리밍 모드로 청크 단위 적재
             
         Returns:
             bool: 로드 성공 여부
@@ -95,78 +280,168 @@ class TotalLaborCostManager:
                 logger.error(f"파일을 찾을 수 없습니다: {excel_path}")
                 return False
             
+            # 같은 내용의 파일이 적재된 뒤 해당 기간이 바뀌지 않았으면 파싱 없이 생략
+            file_hash = self.ledger.file_hash(excel_path)
+            if self.ledger.is_file_loaded(file_hash):
+                logger.info(f"변경 없는 파일, 적재 생략: {excel_path}")
+                return True
+            
+            if chunksize:
+                return self._load_excel_streaming(excel_path, chunksize, file_hash)
+            
             # Excel 파일 읽기
             df = pd.read_excel(excel_path)
             logger.info(f"Excel 파일 로드 완료: {len(df)}행")
             
-            # 컬럼명 표준화
-            column_mapping = {
-                '사번': 'employee_id',
-                '성명': 'employee_name', 
-                '이름': 'employee_name',
-                '부서': 'department',
-                '직급': 'position',
-                '직책': 'position',
-                '기본급': 'base_salary',
-                '연장근무수당': 'overtime_pay',
-                '제수당': 'allowances',
-                '상여금': 'bonuses',
-                '공제액': 'deductions',
-                '실지급액': 'net_salary',
-                '지급일': 'payment_date',
-                '년도': 'year',
-                '월': 'month'
-            }
-            
-            # 컬럼명 변경
-            df = df.rename(columns=column_mapping)
-            
-            # 필수 컬럼 확인
-            required_columns = ['employee_id', 'employee_name', 'department', 'base_salary']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                logger.error(f"필수 컬럼이 없습니다: {missing_columns}")
+            report = MemoryReport('payroll')
+            df = self._prepare_payroll_frame(df, report)
+            if df is None:
                 return False
-            
-            # 데이터 정제
-            df = self._clean_payroll_data(df)
+            self.last_memory_report = report
+            logger.info(report.format())
             
             # 데이터베이스에 저장
-            return self._save_to_database(df)
+            return self._save_to_database(df, file_hash=file_hash, source_path=excel_path)
             
         except Exception as e:
             logger.error(f"Excel 파일 로드 오류: {e}")
             return False
     
-    def _clean_payroll_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """급여 데이터 정제"""
+    @instrumented
+    @serialized_write
+    def _load_excel_streaming(self, excel_path: str, chunksize: int, file_hash: Optional[str] = None) -> bool:
+        """
+        Excel 파일을 청크 단위로 읽어 정제 후 바로 저장 (메모리 사용량 일정)
+        
+        모든 청크는 하나의 트랜잭션으로 저장되며, 중간에 실패하면 전체를 롤백한다.
+        """
+        start = time.perf_counter()
+        total_rows = 0
+        total_batches = 0
+        try:
+            self.ledger.begin()
+            for chunk in iter_excel_chunks(excel_path, chunksize):
+                chunk = self._prepare_payroll_frame(chunk)
+                if chunk is None:
+                    self.connection.rollback()
+                    return False
+                
+                result = self.ledger.stage(self._fill_payroll_defaults(chunk))
+                total_rows += result.rows
+                total_batches += result.batches
+            
+            merge = self.ledger.merge()
+            self._refresh_derived(merge.periods_changed)
+            self._commit_load(total_rows, total_batches, merge, start, file_hash, excel_path)
+            logger.info(f"스트리밍 적재 완료: {total_rows}행, 기록 {merge.rows_written}행, 삭제 {merge.rows_deleted}행, "
+                        f"변경 없음 {merge.rows_unchanged}행 ({self.last_load_result.rows_per_sec:,.0f}행/초)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"스트리밍 적재 오류: {e}")
+            self.connection.rollback()
+            return False
+    
+    @instrumented
+    def load_directory(self, directory: str, workers: Optional[int] = None) -> List[FileIngestReport]:
+        """
+        디렉터리 안의 모든 Excel 급여대장을 병렬로 파싱하여 적재
+        
+        Args:
+            directory (str): Excel 파일이 있는 디렉터리
+            workers (Optional[int]): 파싱 작업자 프로세스 수 (None이면 CPU 수)
+            
+        Returns:
+            List[FileIngestReport]: 파일별 성공/실패 결과
+        """
+        if not os.path.isdir(directory):
+            logger.error(f"디렉터리를 찾을 수 없습니다: {directory}")
+            return []
+        
+        # 이미 적재된 뒤 바뀌지 않았거나 같은 디렉터리 안에서 내용이 중복된 파일은 파싱하지 않음.
+        # 다시 적재할 파일이 하나라도 나오면 같은 기간을 덮어쓸 수 있으므로 이름순으로 그 뒤의 파일도
+        # 모두 적재한다 (같은 기간은 뒤 파일이 최종 결과)
+        file_hashes = {}
+        skipped = []
+        for path in list_excel_files(directory):
+            file_hash = self.ledger.file_hash(path)
+            if file_hash in file_hashes.values() or (not file_hashes and self.ledger.is_file_loaded(file_hash)):
+                skipped.append(FileIngestReport(path, True, skipped=True))
+            else:
+                file_hashes[path] = file_hash
+        
+        def _write(path: str, df: pd.DataFrame) -> bool:
+            return self._save_to_database(df, file_hash=file_hashes[path], source_path=path)
+        
+        reports = run_parallel_ingest(list(file_hashes), _parse_payroll_file, _write, workers=workers)
+        reports = sorted(reports + skipped, key=lambda report: report.path)
+        
+        succeeded = sum(1 for report in reports if report.success)
+        logger.info(f"디렉터리 적재 완료: {succeeded}/{len(reports)}개 파일 성공")
+        return reports
+    
+    @classmethod
+    def _prepare_payroll_frame(cls, df: pd.DataFrame,
+                               memory_report: Optional[MemoryReport] = None) -> Optional[pd.DataFrame]:
+        """컬럼명 표준화, 필수 컬럼 확인 후 급여 데이터 정제 (필수 컬럼 누락 시 None)"""
+        # 컬럼명 변경
+        df = df.rename(columns=cls.COLUMN_MAPPING)
+        
+        # 필수 컬럼 확인
+        missing_columns = [col for col in cls.REQUIRED_COLUMNS if col not in df.columns]
+        
+        if missing_columns:
+            logger.error(f"필수 컬럼이 없습니다: {missing_columns}")
+            return None
+        
+        # 데이터 정제
+        return cls._clean_payroll_data(df, memory_report)
+    
+    @classmethod
+    def _clean_payroll_data(cls, df: pd.DataFrame, memory_report: Optional[MemoryReport] = None) -> pd.DataFrame:
+        """
+        급여 데이터 정제 (입력을 제자리에서 수정)
+        
+        금액은 축소 정수형, 부서/직급/지급일은 category로 둔다 (frame_dtypes 정책).
+        
+        Args:
+            df (pd.DataFrame): 표준 컬럼명의 급여 데이터
+            memory_report (Optional[MemoryReport]): 지정 시 단계별 메모리 기록
+            
+        Returns:
+            pd.DataFrame: 정제된 데이터
+        """
         try:
+            record_stage(memory_report, '입력', df)
+            
             # 숫자 컬럼 처리
             numeric_columns = ['base_salary', 'overtime_pay', 'allowances', 'bonuses', 'deductions', 'net_salary']
             for col in numeric_columns:
                 if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+                    df[col] = money(df[col])
             
             # 년월 정보 처리
             current_date = datetime.now()
-            if 'year' not in df.columns:
-                df['year'] = current_date.year
-            if 'month' not in df.columns:
-                df['month'] = current_date.month
+            df['year'] = downcast_integer(df['year']) if 'year' in df.columns else constant(current_date.year, df.index)
+            df['month'] = (downcast_integer(df['month']) if 'month' in df.columns
+                           else constant(current_date.month, df.index))
             
             # 지급일 처리
             if 'payment_date' not in df.columns:
-                df['payment_date'] = f"{df['year'].iloc[0]}-{df['month'].iloc[0]:02d}-25"
+                df['payment_date'] = constant(f"{df['year'].iloc[0]}-{df['month'].iloc[0]:02d}-25", df.index)
             
-            # 실지급액 계산 (없는 경우)
+            # 실지급액 계산 (없는 경우, 축소 정수형 합계 오버플로 방지를 위해 int64로 계산)
             if 'net_salary' not in df.columns or df['net_salary'].sum() == 0:
-                df['net_salary'] = (df['base_salary'] + df['overtime_pay'] + 
-                                  df['allowances'] + df['bonuses'] - df['deductions'])
+                df['net_salary'] = downcast_integer(
+                    df['base_salary'].astype(np.int64) + df['overtime_pay'] + df['allowances'] +
+                    df['bonuses'] - df['deductions'])
+            record_stage(memory_report, '숫자', df)
             
             # 빈 값 처리
-            df['position'] = df['position'].fillna('일반')
-            df['department'] = df['department'].fillna('미분류')
+            df['position'] = fill_category(df['position'], '일반')
+            df['department'] = fill_category(df['department'], '미분류')
+            df['payment_date'] = to_category(df['payment_date'])
+            record_stage(memory_report, '범주', df)
             
             logger.info(f"데이터 정제 완료: {len(df)}행")
             return df
@@ -175,36 +450,31 @@ class TotalLaborCostManager:
             logger.error(f"데이터 정제 오류: {e}")
             raise
     
-    def _save_to_database(self, df: pd.DataFrame) -> bool:
-        """정제된 데이터를 데이터베이스에 저장"""
-        try:
-            cursor = self.connection.cursor()
-            
-            # 기존 데이터 삭제 (같은 년월)
-            if not df.empty:
-                year = df['year'].iloc[0]
-                month = df['month'].iloc[0]
-                cursor.execute("DELETE FROM payroll WHERE year = ? AND month = ?", (year, month))
-            
-            # 새 데이터 삽입
-            for _, row in df.iterrows():
-                cursor.execute("""
-                    INSERT INTO payroll (
-                        employee_id, employee_name, department, position,
-                        base_salary, overtime_pay, allowances, bonuses, deductions,
-                        net_salary, payment_date, year, month
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['employee_id'], row['employee_name'], row['department'], 
-                    row.get('position', '일반'),
-                    row['base_salary'], row.get('overtime_pay', 0), 
-                    row.get('allowances', 0), row.get('bonuses', 0), 
-                    row.get('deductions', 0), row['net_salary'],
-                    row.get('payment_date', ''), row['year'], row['month']
-                ))
+    @instrumented
+    @serialized_write
+    def _save_to_database(self, df: pd.DataFrame, file_hash: Optional[str] = None,
+                          source_path: Optional[str] = None) -> bool:
+        """
+        정제된 데이터를 데이터베이스에 저장
+        
+        입력에 포함된 모든 (년, 월)을 (사번, 년, 월) 기준으로 upsert 병합한다.
+        적재 원장과 내용이 같은 기간과 행은 건너뛰고, 원본에서 사라진 행은 삭제한다.
+        
+        Args:
+            df (pd.DataFrame): 정제된 데이터
+            file_hash (Optional[str]): 원본 파일 해시 (지정 시 적재 원장에 기록)
+            source_path (Optional[str]): 원본 파일 경로
             
-            self.connection.commit()
-            logger.info(f"데이터베이스 저장 완료: {len(df)}행")
+        Returns:
+            bool: 저장 성공 여부
+        """
+        try:
+            start = time.perf_counter()
+            staged, merge = self._stage_and_merge(df)
+            self._commit_load(len(df), staged.batches, merge, start, file_hash, source_path)
+            logger.info(f"데이터베이스 저장 완료: {len(df)}행, 기록 {merge.rows_written}행, 삭제 {merge.rows_deleted}행, "
+                        f"변경 없음 {merge.rows_unchanged}행, 생략 기간 {len(merge.periods_skipped)}개 "
+                        f"({self.last_load_result.rows_per_sec:,.0f}행/초)")
             return True
             
         except Exception as e:
@@ -212,6 +482,82 @@ class TotalLaborCostManager:
             self.connection.rollback()
             return False
     
+    @instrumented
+    def _stage_and_merge(self, df: pd.DataFrame) -> Tuple[BulkLoadResult, MergeResult]:
+        """
+        적재 트랜잭션 안에서 스테이징, 병합, 파생 테이블 갱신 (커밋은 호출자)
+        
+        Args:
+            df (pd.DataFrame): 정제된 데이터
+            
+        Returns:
+            Tuple[BulkLoadResult, MergeResult]: 스테이징 결과와 병합 결과
+        """
+        self.ledger.begin()
+        staged = self.ledger.stage(self._fill_payroll_defaults(df), complete=True)
+        merge = self.ledger.merge()
+        self._refresh_derived(merge.periods_changed)
+        return staged, merge
+    
+    @instrumented
+    def _commit_load(self, rows: int, batches: int, merge: MergeResult, start: float,
+                     file_hash: Optional[str] = None, source_path: Optional[str] = None):
+        """적재 원장 기록 후 커밋하고 조회 캐시 무효화 및 적재 결과 갱신"""
+        if file_hash:
+            self.ledger.record_file(file_hash, source_path, rows, merge.periods)
+        self.connection.commit()
+        self._finish_load(rows, batches, merge, start)
+    
+    def _finish_load(self, rows: int, batches: int, merge: MergeResult, start: float):
+        """커밋 후 조회 캐시 무효화, 분석 백엔드 동기화 및 적재 결과 갱신"""
+        self.cache.invalidate()
+        self._refresh_backend()
+        self.last_load_result = BulkLoadResult(table='payroll', rows=rows, batches=batches,
+                                               elapsed=time.perf_counter() - start)
+        self.last_merge_result = merge
+    
+    def _refresh_derived(self, periods: List[Period]):
+        """적재 트랜잭션 안에서 변경된 기간의 집계 테이블과 기간 카탈로그 갱신"""
+        self.archive.check_writable(periods)
+        self.rollups.refresh(periods)
+        self.periods.refresh(periods)
+    
+    def _refresh_backend(self):
+        """커밋된 변경을 분석 조회 백엔드에 반영 (실패해도 적재는 유지, 다음 커밋에서 다시 동기화)"""
+        try:
+            self.backend.refresh()
+        except Exception as e:
+            logger.error(f"분석 백엔드 동기화 오류 ({self.backend.name}): {e}")
+    
+    @property
+    def reader(self) -> sqlite3.Connection:
+        """호출 스레드 전용 읽기 전용 연결 (메모리 DB는 작성자 연결)"""
+        return self.pool.reader()
+    
+    def _data_version(self) -> int:
+        """
+        다른 연결이 커밋할 때마다 바뀌는 SQLite 데이터 버전
+
+        호출 스레드의 읽기 연결에서 조회하므로 작성자 연결의 커밋도 감지하고,
+        작성자 연결을 기다리거나 다른 스레드의 쓰기 트랜잭션 중간에 끼어들지 않는다.
+        """
+        return self.reader.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _resolve_period(self, year: Optional[int] = None, month: Optional[int] = None) -> Optional[Period]:
+        """조회 대상 (년, 월) 결정 - 년월이 모두 지정되지 않으면 카탈로그의 최신 기간"""
+        if year and month:
+            return (year, month)
+        return self.periods.latest()
+    
+    @classmethod
+    def _fill_payroll_defaults(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """입력 데이터에 없는 선택 컬럼을 기본값으로 채움"""
+        missing_defaults = {col: constant(value, df.index) for col, value in cls.PAYROLL_DEFAULTS.items()
+                            if col not in df.columns}
+        return df.assign(**missing_defaults) if missing_defaults else df
+    
+    @instrumented
+    @cached_query
     def get_department_summary(self, year: Optional[int] = None, month: Optional[int] = None) -> pd.DataFrame:
         """
         부서별 인건비 요약
@@ -224,38 +570,36 @@ class TotalLaborCostManager:
             pd.DataFrame: 부서별 요약 데이터
         """
         try:
+            # 부서별 월 집계 테이블에서 조회
             query = """
                 SELECT 
                     department,
-                    COUNT(*) as employee_count,
-                    SUM(base_salary) as total_base_salary,
-                    SUM(overtime_pay) as total_overtime,
-                    SUM(allowances) as total_allowances,
-                    SUM(bonuses) as total_bonuses,
-                    SUM(deductions) as total_deductions,
-                    SUM(net_salary) as total_net_salary,
-                    AVG(net_salary) as avg_salary,
-                    MAX(net_salary) as max_salary,
-                    MIN(net_salary) as min_salary,
+                    employee_count,
+                    total_base_salary,
+                    total_overtime,
+                    total_allowances,
+                    total_bonuses,
+                    total_deductions,
+                    total_net_salary,
+                    total_net_salary * 1.0 / employee_count as avg_salary,
+                    max_salary,
+                    min_salary,
                     year,
                     month
-                FROM payroll 
+                FROM payroll_dept_rollup 
             """
             
-            params = []
-            if year and month:
-                query += " WHERE year = ? AND month = ?"
-                params = [year, month]
-            elif year:
+            if year and not month:
                 query += " WHERE year = ?"
                 params = [year]
             else:
-                # 최신 데이터 조회
-                query += " WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)"
+                # 지정한 년월 또는 카탈로그의 최신 기간
+                query += " WHERE year = ? AND month = ?"
+                params = list(self._resolve_period(year, month) or (None, None))
             
-            query += " GROUP BY department, year, month ORDER BY total_net_salary DESC"
+            query += " ORDER BY total_net_salary DESC"
             
-            df = pd.read_sql_query(query, self.connection, params=params)
+            df = self.backend.read_frame(query, params)
             
             # 비율 계산
             total_cost = df['total_net_salary'].sum()
@@ -271,28 +615,28 @@ class TotalLaborCostManager:
             logger.error(f"부서별 요약 조회 오류: {e}")
             return pd.DataFrame()
     
+    @instrumented
+    @cached_query
     def get_monthly_trend(self, months: int = 12) -> pd.DataFrame:
         """월별 인건비 추이 분석"""
         try:
+            # 기간 집계 테이블에서 최근 months개월 조회
             query = """
-                SELECT 
-                    year,
-                    month,
-                    COUNT(*) as employee_count,
-                    SUM(net_salary) as total_cost,
-                    AVG(net_salary) as avg_salary
-                FROM payroll 
-                WHERE (year, month) >= (
-                    SELECT year, month 
-                    FROM payroll 
+                SELECT * FROM (
+                    SELECT 
+                        year,
+                        month,
+                        employee_count,
+                        total_net_salary as total_cost,
+                        total_net_salary * 1.0 / employee_count as avg_salary
+                    FROM payroll_period_rollup 
                     ORDER BY year DESC, month DESC 
-                    LIMIT 1 OFFSET ?
+                    LIMIT ?
                 )
-                GROUP BY year, month 
                 ORDER BY year, month
             """
             
-            df = pd.read_sql_query(query, self.connection, params=[months-1])
+            df = self.backend.read_frame(query, [months])
             
             # 월별 증감률 계산
             df['cost_change'] = df['total_cost'].pct_change() * 100
@@ -305,21 +649,61 @@ class TotalLaborCostManager:
             logger.error(f"월별 추이 분석 오류: {e}")
             return pd.DataFrame()
     
-    def generate_report(self, output_path: str = "인건비_종합보고서.xlsx") -> bool:
+    @instrumented
+    @cached_query
+    def get_employee_history(self, employee_ids: Union[str, Sequence[str]], start: Optional[Period] = None,
+                             end: Optional[Period] = None) -> pd.DataFrame:
+        """
+        직원별 급여 이력
+        
+        (사번, 년, 월) 고유 인덱스 범위 검색으로 조회하므로 저장된 기간이 늘어나도 조회 시간이 일정하다.
+        
+        Args:
+            employee_ids (Union[str, Sequence[str]]): 사번 또는 사번 목록 (수천 건도 일괄 조회)
+            start (Optional[Period]): 시작 (년, 월) (None이면 처음부터)
+            end (Optional[Period]): 종료 (년, 월) (None이면 최신 기간까지)
+            
+        Returns:
+            pd.DataFrame: (employee_id, year, month) MultiIndex 이력
+        """
+        try:
+            # 조회 범위에 보관 연도가 있으면 해당 연도 파일만 연결
+            periods = [period for period in self.periods.list_periods()
+                       if (start is None or period >= tuple(start)) and (end is None or period <= tuple(end))]
+            df = read_employee_history(self.backend, 'payroll', self.PAYROLL_COLUMNS, employee_ids,
+                                       start, end, periods, self.dimensions)
+            
+            logger.info(f"직원 이력 조회 완료: {df.index.get_level_values('employee_id').nunique()}명, {len(df)}건")
+            return df
+            
+        except Exception as e:
+            logger.error(f"직원 이력 조회 오류: {e}")
+            return pd.DataFrame()
+    
+    @instrumented
+    def generate_report(self, output_path: str = "인건비_종합보고서.xlsx", streaming: bool = False) -> bool:
         """
         Excel 종합 보고서 생성
         
         Args:
             output_path (str): 출력 파일 경로
+            streaming (bool): True이면 상세 데이터를 커서에서 행 단위로 기록하는 저메모리 모드
             
         Returns:
             bool: 생성 성공 여부
         """
         try:
+            # 대상 기간은 한 번만 조회하여 모든 시트에 사용
+            period = self._resolve_period()
+            year, month = period or (None, None)
+            
+            if streaming:
+                return self._generate_streaming_report(output_path, period)
+            
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 
                 # 1. 부서별 요약
-                dept_summary = self.get_department_summary()
+                dept_summary = self.get_department_summary(year, month)
                 if not dept_summary.empty:
                     dept_summary.to_excel(writer, sheet_name='부서별요약', index=False)
                 
@@ -329,17 +713,17 @@ class TotalLaborCostManager:
                     monthly_trend.to_excel(writer, sheet_name='월별추이', index=False)
                 
                 # 3. 직급별 분석
-                position_analysis = self._get_position_analysis()
+                position_analysis = self._get_position_analysis(period)
                 if not position_analysis.empty:
                     position_analysis.to_excel(writer, sheet_name='직급별분석', index=False)
                 
                 # 4. 상세 급여 데이터
-                detailed_data = self._get_detailed_payroll()
+                detailed_data = self._get_detailed_payroll(period)
                 if not detailed_data.empty:
                     detailed_data.to_excel(writer, sheet_name='상세데이터', index=False)
                 
                 # 5. 요약 통계
-                summary_stats = self._get_summary_statistics()
+                summary_stats = self._get_summary_statistics(period)
                 if not summary_stats.empty:
                     summary_stats.to_excel(writer, sheet_name='요약통계', index=False)
             
@@ -350,93 +734,181 @@ class TotalLaborCostManager:
             logger.error(f"Excel 보고서 생성 오류: {e}")
             return False
     
-    def _get_position_analysis(self) -> pd.DataFrame:
-        """직급별 분석"""
+    @instrumented
+    def _generate_streaming_report(self, output_path: str, period: Optional[Period]) -> bool:
+        """xlsxwriter constant_memory 모드로 보고서 작성 (상세 데이터는 커서에서 스트리밍)"""
+        year, month = period or (None, None)
+        sheets = [
+            ReportSheet('부서별요약', frame=lambda: self.get_department_summary(year, month)),
+            ReportSheet('월별추이', frame=self.get_monthly_trend),
+            ReportSheet('직급별분석', frame=lambda: self._get_position_analysis(period)),
+            ReportSheet('상세데이터', query=self.DETAILED_PAYROLL_QUERY, params=list(period or (None, None))),
+            ReportSheet('요약통계', frame=lambda: self._get_summary_statistics(period))
+        ]
+        # 보관 연도 보고서는 작업자 스레드 연결에도 해당 연도 파일을 연결
+        periods = [period] if period else None
+        writer = StreamingReportWriter(self.db_path, connection=self.archive.reader(periods),
+                                       connect=lambda: self.archive.connect(periods))
+        self.last_report_result = writer.write(output_path, sheets)
+        return True
+    
+    @instrumented
+    def export_columnar(self, output_dir: str, fmt: str = 'parquet',
+                        periods: Optional[List[Period]] = None) -> List[ExportedPartition]:
+        """
+        상세 급여, 월별 집계 테이블, 분석 결과를 기간 파티션 단위로 내보내기
+        
+        Args:
+            output_dir (str): 출력 최상위 디렉터리
+            fmt (str): 'parquet', 'arrow'(Arrow IPC), 'csv'(gzip) 중 하나
+            periods (Optional[List[Period]]): 내보낼 (년, 월) 목록 (None이면 전체 기간)
+            
+        Returns:
+            List[ExportedPartition]: 저장된 파티션 목록
+        """
+        try:
+            periods = self.periods.list_periods() if periods is None else periods
+            exporter = PartitionedExporter(self.archive.reader(periods), output_dir, fmt)
+            
+            queries = {'payroll': self.DETAILED_PAYROLL_QUERY}
+            queries.update({spec.table: f"SELECT * FROM {spec.table} WHERE year = ? AND month = ?"
+                            for spec in self.PAYROLL_ROLLUPS})
+            frames = {
+                'department_summary': lambda period: self.get_department_summary(*period),
+                'position_analysis': self._get_position_analysis,
+                'summary_statistics': self._get_summary_statistics
+            }
+            return export_datasets(exporter, periods, queries, frames)
+            
+        except Exception as e:
+            logger.error(f"내보내기 오류: {e}")
+            return []
+    
+    def _get_position_analysis(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """직급별 분석 (period가 없으면 최신 기간)"""
         try:
             query = """
                 SELECT 
                     position,
-                    COUNT(*) as employee_count,
-                    AVG(net_salary) as avg_salary,
-                    SUM(net_salary) as total_salary,
-                    MAX(net_salary) as max_salary,
-                    MIN(net_salary) as min_salary
-                FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-                GROUP BY position 
+                    employee_count,
+                    total_net_salary * 1.0 / employee_count as avg_salary,
+                    total_net_salary as total_salary,
+                    max_salary,
+                    min_salary
+                FROM payroll_position_rollup 
+                WHERE year = ? AND month = ?
                 ORDER BY avg_salary DESC
             """
             
-            return pd.read_sql_query(query, self.connection)
+            params = list(period or self._resolve_period() or (None, None))
+            return self.backend.read_frame(query, params)
             
         except Exception as e:
             logger.error(f"직급별 분석 오류: {e}")
             return pd.DataFrame()
     
-    def _get_detailed_payroll(self) -> pd.DataFrame:
-        """상세 급여 데이터"""
+    def _get_detailed_payroll(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """상세 급여 데이터 (period가 없으면 최신 기간)"""
         try:
-            query = """
-                SELECT * FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-                ORDER BY department, net_salary DESC
-            """
-            
-            return pd.read_sql_query(query, self.connection)
+            params = list(period or self._resolve_period() or (None, None))
+            return self.backend.read_frame(self.DETAILED_PAYROLL_QUERY, params, periods=[params])
             
         except Exception as e:
             logger.error(f"상세 데이터 조회 오류: {e}")
             return pd.DataFrame()
     
-    def _get_summary_statistics(self) -> pd.DataFrame:
-        """요약 통계"""
+    @instrumented
+    @cached_query
+    def get_kpis(self, periods: Optional[List[Period]] = None) -> Dict[Period, KpiResult]:
+        """
+        요약 KPI를 기간별로 한 번의 스캔으로 계산
+        
+        Args:
+            periods (Optional[List[Period]]): 계산할 (년, 월) 목록 (None이면 최신 기간)
+            
+        Returns:
+            Dict[Period, KpiResult]: 기간별 KPI 결과
+        """
         try:
-            query = """
-                SELECT 
-                    '전체 직원 수' as metric,
-                    COUNT(*) as value,
-                    '' as unit
-                FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-                
-                UNION ALL
-                
-                SELECT 
-                    '총 인건비' as metric,
-                    SUM(net_salary) as value,
-                    '원' as unit
-                FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-                
-                UNION ALL
-                
-                SELECT 
-                    '평균 급여' as metric,
-                    AVG(net_salary) as value,
-                    '원' as unit
-                FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-                
-                UNION ALL
-                
-                SELECT 
-                    '부서 수' as metric,
-                    COUNT(DISTINCT department) as value,
-                    '개' as unit
-                FROM payroll 
-                WHERE (year, month) = (SELECT year, month FROM payroll ORDER BY year DESC, month DESC LIMIT 1)
-            """
+            if periods is None:
+                latest = self._resolve_period()
+                periods = [latest] if latest else []
+            return self.kpis.compute(periods)
             
-            return pd.read_sql_query(query, self.connection)
+        except Exception as e:
+            logger.error(f"KPI 계산 오류: {e}")
+            return {}
+    
+    def _get_summary_statistics(self, period: Optional[Period] = None) -> pd.DataFrame:
+        """요약 통계 (period가 없으면 최신 기간)"""
+        try:
+            period = period or self._resolve_period()
+            if period is None:
+                return KpiResult(None, {}, self.kpis.metrics).to_frame()
+            return self.kpis.compute_one(period).to_frame()
             
         except Exception as e:
             logger.error(f"요약 통계 조회 오류: {e}")
             return pd.DataFrame()
     
+    @instrumented
+    @serialized_write
+    def roll_year(self, year: int, vacuum: bool = False) -> bool:
+        """
+        지난 연도 원본 행을 연도별 보관 파일로 이동
+        
+        최신 기간 조회와 적재는 주 데이터베이스만 사용하고, 보관 연도 기간을 조회하면
+        해당 파일만 ATTACH하여 같은 쿼리로 읽는다. 집계 테이블과 기간 목록은 그대로 유지된다.
+        
+        Args:
+            year (int): 보관할 연도 (최신 연도 이전)
+            vacuum (bool): 이동 후 주 데이터베이스 VACUUM 여부
+            
+        Returns:
+            bool: 보관 성공 여부
+        """
+        try:
+            self.archive.roll_year(year, vacuum=vacuum)
+            self.cache.invalidate()
+            return True
+            
+        except Exception as e:
+            logger.error(f"연도 보관 오류: {e}")
+            return False
+    
+    @instrumented
+    @serialized_write
+    def restore_year(self, year: int) -> bool:
+        """
+        보관 연도를 주 데이터베이스로 복원 (보관 연도 데이터를 다시 적재하기 전에 사용)
+        
+        Args:
+            year (int): 복원할 연도
+            
+        Returns:
+            bool: 복원 성공 여부
+        """
+        try:
+            self.archive.restore_year(year)
+            self.cache.invalidate()
+            return True
+            
+        except Exception as e:
+            logger.error(f"연도 복원 오류: {e}")
+            return False
+    
     def close(self):
         """데이터베이스 연결 종료"""
-        if self.connection:
-            self.connection.close()
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            self.connection = None
             logger.info("데이터베이스 연결 종료")
 
     def __del__(self):
@@ -444,8 +916,19 @@ class TotalLaborCostManager:
         self.close()
 
 
+def _parse_payroll_file(excel_path: str) -> pd.DataFrame:
+    """프로세스 풀 작업자용: Excel 파일을 읽어 정제된 급여 데이터 반환"""
+    df = TotalLaborCostManager._prepare_payroll_frame(pd.read_excel(excel_path))
+    if df is None:
+        raise ValueError(f"필수 컬럼이 없습니다: {excel_path}")
+    return df
+
+
 # 사용 예제
 if __name__ == "__main__":
+    # 로깅 설정
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     # 매니저 초기화
     manager = TotalLaborCostManager("labor_costs.db")
     
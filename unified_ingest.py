@@ -0,0 +1,302 @@
+"""
+PayPulse 통합 적재
+unified_ingest - 급여대장을 한 번만 읽고 정규화하여 종합 인건비와 직접 인건비 저장소에 함께 적재
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from excel_stream import iter_excel_chunks
+from ingest_ledger import MergeResult
+from instrumentation import instrumented
+from total_labor_cost_manager import TotalLaborCostManager
+from direct_labor_cost_manager import DirectLaborCostManager
+
+logger = logging.getLogger(__name__)
+
+# 두 저장소의 Excel 컬럼명 매핑 합집합 (같은 한글 컬럼은 같은 표준 컬럼으로 매핑됨)
+SHARED_COLUMN_MAPPING = {**TotalLaborCostManager.COLUMN_MAPPING, **DirectLaborCostManager.COLUMN_MAPPING}
+
+# 적재 트랜잭션에서 작성자 연결을 쓰는 관리자 구성 요소 (bind_writer로 교체)
+WRITER_COMPONENTS = ('ledger', 'dimensions', 'rollups', 'periods')
+
+# 두 저장소 공통 필수 컬럼
+REQUIRED_COLUMNS = list(dict.fromkeys(TotalLaborCostManager.REQUIRED_COLUMNS +
+                                      DirectLaborCostManager.REQUIRED_COLUMNS))
+
+
+@dataclass
+class UnifiedIngestResult:
+    """통합 적재 결과"""
+    path: str
+    success: bool
+    rows: int = 0
+    elapsed: float = 0.0
+    targets: List[str] = field(default_factory=list)   # 실제로 적재한 저장소 (payroll / direct_labor)
+    payroll_merge: Optional[MergeResult] = None
+    direct_merge: Optional[MergeResult] = None
+
+
+def normalize_ledger_frame(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """공통 컬럼명 표준화 및 필수 컬럼 확인 (누락 시 None)"""
+    df = df.rename(columns=SHARED_COLUMN_MAPPING)
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        logger.error(f"필수 컬럼이 없습니다: {missing_columns}")
+        return None
+    return df
+
+
+@contextmanager
+def bind_writer(manager, connection: sqlite3.Connection):
+    """
+    manager의 적재 구성 요소(원장/사전/집계/기간 카탈로그)가 잠시 connection으로 쓰도록 교체
+
+    같은 데이터베이스 파일을 쓰는 두 관리자는 작성자 연결이 따로라서 한 트랜잭션으로 묶을 수 없으므로,
+    한쪽 적재를 다른 쪽 작성자 연결에서 실행할 때 사용한다. 스테이징 임시 테이블도 그 연결에 만들어진다.
+    """
+    owners = [manager] + [getattr(manager, name) for name in WRITER_COMPONENTS]
+    originals = [owner.connection for owner in owners]
+    for owner in owners:
+        owner.connection = connection
+    try:
+        yield
+    finally:
+        for owner, original in zip(owners, originals):
+            owner.connection = original
+
+
+def split_ledger_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    정규화된 급여대장을 두 저장소 형식으로 정제
+
+    각 정제 함수는 입력을 제자리에서 수정하므로 종합 인건비 쪽에는 복사본을 넘긴다.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (payroll 데이터, direct_labor 데이터)
+    """
+    payroll = TotalLaborCostManager._clean_payroll_data(df.copy())
+    direct = DirectLaborCostManager._clean_direct_labor_data(df)
+    return payroll, direct
+
+
+class UnifiedIngest:
+    """
+    종합 인건비 / 직접 인건비 통합 적재기
+
+    파일은 한 번만 읽고 정규화한 뒤 두 저장소의 적재 트랜잭션에 각각 병합한다.
+    두 트랜잭션은 모두 준비가 끝난 뒤에만 커밋되며, 준비 중 어느 쪽이든 실패하면 둘 다 롤백된다.
+    두 관리자가 같은 데이터베이스 파일을 쓰면 직접 인건비 쪽 적재도 종합 인건비 작성자 연결에서
+    실행하여 두 테이블의 병합과 파일 기록을 한 트랜잭션으로 커밋한다.
+    서로 다른 파일이면 두 트랜잭션을 연달아 커밋하므로, 앞쪽 커밋 후 뒤쪽 커밋이 실패하면
+    앞쪽 저장소만 반영된다. 이 경우 결과는 실패(success=False)이며 targets와 병합 결과에는
+    실제로 커밋된 저장소만 남는다. 같은 파일을 다시 적재하면 커밋되지 않은 저장소만 적재한다.
+    """
+
+    def __init__(self, total: TotalLaborCostManager, direct: DirectLaborCostManager):
+        """
+        Args:
+            total (TotalLaborCostManager): 종합 인건비 관리자
+            direct (DirectLaborCostManager): 직접 인건비 관리자
+        """
+        self.total = total
+        self.direct = direct
+        self.metrics = total.metrics
+        self.shared_database = (not total.pool.in_memory and not direct.pool.in_memory and
+                                os.path.abspath(total.db_path) == os.path.abspath(direct.db_path))
+
+    def _pending_targets(self, file_hash: str) -> List[str]:
+        targets = []
+        if not self.total.ledger.is_file_loaded(file_hash):
+            targets.append('payroll')
+        if not self.direct.ledger.is_file_loaded(file_hash):
+            targets.append('direct_labor')
+        return targets
+
+    def _managers(self, targets: List[str]):
+        return [manager for name, manager in (('payroll', self.total), ('direct_labor', self.direct))
+                if name in targets]
+
+    @instrumented
+    def load_from_excel(self, excel_path: str, chunksize: Optional[int] = None) -> UnifiedIngestResult:
+        """
+        급여대장 파일을 한 번 읽어 두 저장소에 적재
+
+        Args:
+            excel_path (str): Excel 파일 경로
+            chunksize (Optional[int]): 지정 시 읽기 전용 스트리밍 모드로 청크 단위 적재
+
+        Returns:
+            UnifiedIngestResult: 적재 결과
+        """
+        start = time.perf_counter()
+        result = UnifiedIngestResult(excel_path, False)
+        try:
+            if not os.path.exists(excel_path):
+                logger.error(f"파일을 찾을 수 없습니다: {excel_path}")
+                return result
+
+            # 같은 내용의 파일이 적재된 뒤 바뀌지 않은 저장소는 생략
+            file_hash = self.total.ledger.file_hash(excel_path)
+            result.targets = self._pending_targets(file_hash)
+            if not result.targets:
+                logger.info(f"변경 없는 파일, 적재 생략: {excel_path}")
+                result.success = True
+                return result
+
+            if chunksize:
+                result.success = self._load_streaming(excel_path, chunksize, file_hash, result)
+            else:
+                df = normalize_ledger_frame(pd.read_excel(excel_path))
+                if df is None:
+                    return result
+                logger.info(f"Excel 파일 로드 완료: {len(df)}행")
+                payroll, direct = split_ledger_frame(df)
+                result.rows = len(df)
+                result.success = self._save(result, payroll, direct, file_hash)
+
+            result.elapsed = time.perf_counter() - start
+            if result.success:
+                logger.info(f"통합 적재 완료: {excel_path} ({result.rows}행, {', '.join(result.targets)}, "
+                            f"{result.elapsed:.2f}초)")
+            return result
+
+        except Exception as e:
+            logger.error(f"통합 적재 오류: {e}")
+            return result
+
+    @contextmanager
+    def _write_scope(self, managers: List):
+        """대상 관리자의 쓰기 잠금을 잡고, 같은 파일이면 작성자 연결을 종합 인건비 쪽 하나로 묶음"""
+        with ExitStack() as stack:
+            for manager in managers:
+                stack.enter_context(manager.pool.write_lock)
+            if self.shared_database:
+                for manager in managers:
+                    if manager is not self.total:
+                        stack.enter_context(bind_writer(manager, self.total.connection))
+            yield
+
+    def _commit(self, prepared: List[Tuple], rows: int, file_hash: str, source_path: str,
+                committed: List[Tuple]):
+        """
+        준비가 끝난 적재의 파일 기록 후 커밋 (_write_scope 안에서 호출)
+
+        커밋에 성공한 항목은 차례로 committed에 추가된다. 서로 다른 파일이면 중간에 실패했을 때
+        앞쪽 항목만 committed에 남는다.
+
+        Args:
+            prepared (List[Tuple]): (관리자, 스테이징 배치 수, 병합 결과) 목록
+            committed (List[Tuple]): 커밋된 항목을 담을 목록
+        """
+        for manager, _, merge in prepared:
+            manager.ledger.record_file(file_hash, source_path, rows, merge.periods)
+
+        if self.shared_database:
+            # 같은 파일: 두 테이블의 병합과 파일 기록을 한 번에 커밋
+            self.total.connection.commit()
+            committed.extend(prepared)
+            return
+
+        for entry in prepared:
+            entry[0].connection.commit()
+            committed.append(entry)
+
+    @staticmethod
+    def _rollback(managers: List, committed: List[Tuple]):
+        """아직 커밋하지 않은 관리자의 적재 트랜잭션 롤백"""
+        done = [entry[0] for entry in committed]
+        for manager in managers:
+            if manager not in done:
+                manager.connection.rollback()
+
+    def _finish(self, result: UnifiedIngestResult, committed: List[Tuple], start: float, failed: bool) -> bool:
+        """
+        커밋된 관리자의 후처리(캐시 무효화, 백엔드 동기화)와 결과 기록
+
+        실패했지만 일부 저장소가 이미 커밋되었으면 targets를 그 저장소로 줄여 부분 결과를 남긴다.
+
+        Returns:
+            bool: 모든 대상 저장소가 커밋되었는지 여부
+        """
+        for manager, batches, merge in committed:
+            manager._finish_load(result.rows, batches, merge, start)
+        self._record_merges(result, committed)
+        if failed:
+            result.targets = [manager.ledger.target_table for manager, _, _ in committed]
+            if committed:
+                logger.warning(f"통합 적재 일부만 반영: {', '.join(result.targets)} 커밋됨 ({result.path})")
+        return not failed
+
+    @instrumented
+    def _save(self, result: UnifiedIngestResult, payroll: pd.DataFrame, direct: pd.DataFrame,
+              file_hash: str) -> bool:
+        """정제된 두 데이터를 각 저장소에 병합하고 함께 커밋"""
+        frames = {'payroll': payroll, 'direct_labor': direct}
+        managers = self._managers(result.targets)
+        start = time.perf_counter()
+
+        with self._write_scope(managers):
+            prepared, committed = [], []
+            failed = False
+            try:
+                for manager in managers:
+                    staged, merge = manager._stage_and_merge(frames[manager.ledger.target_table])
+                    prepared.append((manager, staged.batches, merge))
+                self._commit(prepared, result.rows, file_hash, result.path, committed)
+            except Exception as e:
+                logger.error(f"통합 적재 저장 오류, 커밋 전 트랜잭션 롤백: {e}")
+                self._rollback(managers, committed)
+                failed = True
+            return self._finish(result, committed, start, failed)
+
+    @instrumented
+    def _load_streaming(self, excel_path: str, chunksize: int, file_hash: str,
+                        result: UnifiedIngestResult) -> bool:
+        """청크마다 한 번 정규화하여 두 저장소의 스테이징 테이블에 함께 적재"""
+        managers = self._managers(result.targets)
+        start = time.perf_counter()
+        batches = {manager.ledger.target_table: 0 for manager in managers}
+        with self._write_scope(managers):
+            prepared, committed = [], []
+            failed = False
+            try:
+                for manager in managers:
+                    manager.ledger.begin()
+                for chunk in iter_excel_chunks(excel_path, chunksize):
+                    chunk = normalize_ledger_frame(chunk)
+                    if chunk is None:
+                        raise ValueError("필수 컬럼 누락")
+                    payroll, direct = split_ledger_frame(chunk)
+                    frames = {'payroll': TotalLaborCostManager._fill_payroll_defaults(payroll),
+                              'direct_labor': direct}
+                    for manager in managers:
+                        table = manager.ledger.target_table
+                        batches[table] += manager.ledger.stage(frames[table]).batches
+                    result.rows += len(chunk)
+
+                for manager in managers:
+                    merge = manager.ledger.merge()
+                    manager._refresh_derived(merge.periods_changed)
+                    prepared.append((manager, batches[manager.ledger.target_table], merge))
+                self._commit(prepared, result.rows, file_hash, excel_path, committed)
+            except Exception as e:
+                logger.error(f"통합 스트리밍 적재 오류, 커밋 전 트랜잭션 롤백: {e}")
+                self._rollback(managers, committed)
+                failed = True
+            return self._finish(result, committed, start, failed)
+
+    @staticmethod
+    def _record_merges(result: UnifiedIngestResult, prepared):
+        for manager, _, merge in prepared:
+            if manager.ledger.target_table == 'payroll':
+                result.payroll_merge = merge
+            else:
+                result.direct_merge = merge
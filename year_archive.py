@@ -0,0 +1,313 @@
+"""
+PayPulse 연도별 보관 저장소
+year_archive - 지난 연도 행을 연도별 SQLite 파일로 옮기고 필요할 때만 ATTACH DATABASE로 연결
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+import logging
+
+from connection_pool import ConnectionPool, ThreadConnections
+from period_catalog import Period
+
+logger = logging.getLogger(__name__)
+
+# 보관 파일을 연결할 때의 스키마 이름 접두사 (archive_2023)
+SCHEMA_PREFIX = 'archive_'
+
+
+def _qualify_ddl(sql: str, schema: str) -> str:
+    """sqlite_master의 CREATE TABLE/INDEX 문을 다른 스키마에 만드는 문장으로 변환"""
+    sql = re.sub(r'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?',
+                 f'CREATE TABLE IF NOT EXISTS {schema}.', sql, flags=re.IGNORECASE)
+    return re.sub(r'^CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?',
+                  lambda match: f"CREATE {match.group(1) or ''}INDEX IF NOT EXISTS {schema}.",
+                  sql, flags=re.IGNORECASE)
+
+
+class YearArchive:
+    """
+    원본 테이블 하나의 연도별 보관 저장소
+
+    - 현재(최신) 연도는 주 데이터베이스에만 두고, roll_year()로 지난 연도 행을
+      {archive_dir}/{source_table}_{year}.db로 옮긴다. 주 데이터베이스의 인덱스에는
+      보관 연도 행이 남지 않는다.
+    - 월별 집계 테이블, 기간 카탈로그, 적재 원장의 기간 해시는 작아서 주 데이터베이스에 그대로 둔다.
+      따라서 추이 조회와 최신 기간 결정은 보관 파일을 열지 않는다.
+    - reader(periods)는 요청한 기간에 보관 연도가 없으면 일반 읽기 연결을 그대로 돌려주고,
+      있으면 해당 연도 파일만 ATTACH한 연결을 돌려준다. 이 연결에서는 원본 테이블 이름이
+      주 테이블과 보관 테이블의 UNION ALL 임시 뷰를 가리키므로 같은 SQL이 여러 해에 걸쳐 실행된다.
+
+    보관 연도는 읽기 전용이며, 다시 적재하려면 restore_year()로 먼저 복원한다.
+    """
+
+    def __init__(self, pool: ConnectionPool, source_table: str, archive_dir: Optional[str] = None):
+        """
+        Args:
+            pool (ConnectionPool): 주 데이터베이스 연결 풀
+            source_table (str): 보관 대상 원본 테이블명
+            archive_dir (Optional[str]): 보관 파일 디렉터리 (None이면 '{db_path}.archive')
+        """
+        self.pool = pool
+        self.source_table = source_table
+        self.archive_dir = archive_dir or f"{pool.db_path}.archive"
+        self._readers = ThreadConnections()
+        # 보관/복원할 때마다 증가, 이전 세대에 연결된 읽기 연결은 다시 연결
+        self._generation = 0
+
+    def ensure_schema(self):
+        """보관 연도 목록 테이블 생성 (커밋은 호출자 담당)"""
+        self.pool.writer.execute("""
+            CREATE TABLE IF NOT EXISTS archived_years (
+                source_table TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                file_name TEXT NOT NULL,
+                row_count INTEGER,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source_table, year)
+            ) WITHOUT ROWID
+        """)
+
+    def upgrade(self, migrate: Callable[[str], Iterable[str]]):
+        """
+        보관 파일의 원본 테이블을 주 데이터베이스의 스키마 변경에 맞춤 (초기화 커밋 후 호출)
+
+        보관 파일마다 작성자 연결에 ATTACH하여 migrate(스키마 이름)를 실행하고,
+        변경이 있었으면 주 데이터베이스의 인덱스를 보관 파일에 다시 만든다.
+
+        Args:
+            migrate (Callable[[str], Iterable[str]]): 스키마 이름을 받아 변경 내용(없으면 빈 목록)을 돌려주는 함수
+        """
+        if self.pool.in_memory:
+            return
+        writer = self.pool.writer
+        table = self.source_table
+        index_ddl = writer.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type = 'index' "
+                                   "AND sql IS NOT NULL", (table,)).fetchall()
+        for year, path in self.archived_years(writer).items():
+            schema = f"{SCHEMA_PREFIX}{year}"
+            writer.execute("ATTACH DATABASE ? AS ?", (path, schema))
+            try:
+                if migrate(schema):
+                    for (sql,) in index_ddl:
+                        writer.execute(_qualify_ddl(sql, schema))
+                    logger.info(f"{table}: {year}년 보관 파일 스키마 변환 → {path}")
+                writer.commit()
+            except Exception:
+                writer.rollback()
+                raise
+            finally:
+                writer.execute("DETACH DATABASE ?", (schema,))
+        self._generation += 1
+
+    def _column_list(self, connection: sqlite3.Connection) -> str:
+        """주 데이터베이스 원본 테이블의 컬럼 목록 (보관 파일과 컬럼 순서가 달라도 이름으로 맞춤)"""
+        return ", ".join(row[1] for row in connection.execute(f"PRAGMA main.table_info({self.source_table})"))
+
+    def archive_path(self, year: int) -> str:
+        return os.path.join(self.archive_dir, f"{self.source_table}_{year}.db")
+
+    def archived_years(self, connection: Optional[sqlite3.Connection] = None) -> Dict[int, str]:
+        """
+        보관된 연도 → 보관 파일 경로
+
+        Args:
+            connection (Optional[sqlite3.Connection]): 조회 연결 (None이면 호출 스레드의 읽기 연결)
+        """
+        connection = connection or self.pool.reader()
+        rows = connection.execute("SELECT year, file_name FROM archived_years WHERE source_table = ? ORDER BY year",
+                                  (self.source_table,)).fetchall()
+        return {year: os.path.join(self.archive_dir, file_name) for year, file_name in rows}
+
+    def _archived_for(self, periods: Optional[Iterable[Period]],
+                      connection: Optional[sqlite3.Connection] = None) -> Dict[int, str]:
+        """periods 중 보관된 연도 (periods가 None이면 최신 연도 조회로 보고 빈 결과)"""
+        if periods is None:
+            return {}
+        years = {int(year) for year, _ in periods if year is not None}
+        if not years:
+            return {}
+        return {year: path for year, path in self.archived_years(connection).items() if year in years}
+
+    def check_writable(self, periods: Iterable[Period]):
+        """적재 트랜잭션 안에서 호출: 보관된 연도에 쓰려고 하면 ValueError"""
+        archived = self._archived_for(periods, self.pool.writer)
+        if archived:
+            raise ValueError(f"보관된 연도에는 적재할 수 없습니다: {sorted(archived)} "
+                             f"(restore_year()로 먼저 복원)")
+
+    # ------------------------------------------------------------------
+    # 보관 / 복원
+    # ------------------------------------------------------------------
+
+    def roll_year(self, year: int, vacuum: bool = False) -> int:
+        """
+        지난 연도의 원본 행을 보관 파일로 이동
+
+        보관 파일에 먼저 복사해 커밋한 뒤 주 데이터베이스에서 삭제하므로, 중간에 중단되어도
+        같은 연도로 다시 호출하면 이어서 완료된다. 호출자가 쓰기 잠금을 잡고 있어야 한다.
+
+        Args:
+            year (int): 보관할 연도 (원본 테이블의 최신 연도보다 이전이어야 함)
+            vacuum (bool): 이동 후 주 데이터베이스를 VACUUM하여 빈 페이지 반환
+
+        Returns:
+            int: 보관 파일로 옮긴 행 수
+        """
+        if self.pool.in_memory:
+            raise ValueError("메모리 DB는 연도 보관을 사용할 수 없습니다")
+
+        writer = self.pool.writer
+        table = self.source_table
+        latest = writer.execute(f"SELECT MAX(year) FROM {table}").fetchone()[0]
+        hot_rows = writer.execute(f"SELECT COUNT(*) FROM {table} WHERE year = ?", (year,)).fetchone()[0]
+        if hot_rows == 0:
+            if year in self.archived_years(writer):
+                return 0
+            raise ValueError(f"{table}: {year}년 데이터가 없습니다")
+        if year >= latest:
+            raise ValueError(f"{table}: 최신 연도({latest}) 이전만 보관할 수 있습니다: {year}")
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.archive_path(year)
+        schema = f"{SCHEMA_PREFIX}{year}"
+        ddl = writer.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL "
+                             "ORDER BY type DESC", (table,)).fetchall()  # table → index 순
+
+        # ATTACH/DETACH는 트랜잭션 밖에서만 가능
+        writer.commit()
+        writer.execute("ATTACH DATABASE ? AS ?", (path, schema))
+        try:
+            for (sql,) in ddl:
+                writer.execute(_qualify_ddl(sql, schema))
+            columns = self._column_list(writer)
+            moved = writer.execute(f"INSERT OR REPLACE INTO {schema}.{table} ({columns}) "
+                                   f"SELECT {columns} FROM main.{table} WHERE year = ?", (year,)).rowcount
+            # WAL 모드에서는 여러 파일에 걸친 커밋이 원자적이지 않으므로 보관 파일을 먼저 확정
+            writer.commit()
+
+            writer.execute(f"DELETE FROM main.{table} WHERE year = ?", (year,))
+            # 행 해시는 변경분 upsert에만 쓰이므로 보관 연도는 버림 (기간 해시는 유지)
+            writer.execute("DELETE FROM ingest_row_hashes WHERE target_table = ? AND year = ?", (table, year))
+            row_count = writer.execute(f"SELECT COUNT(*) FROM {schema}.{table}").fetchone()[0]
+            writer.execute("""
+                INSERT OR REPLACE INTO archived_years (source_table, year, file_name, row_count, archived_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (table, year, os.path.basename(path), row_count))
+            writer.commit()
+        except Exception:
+            writer.rollback()
+            raise
+        finally:
+            writer.execute("DETACH DATABASE ?", (schema,))
+        self._generation += 1
+
+        if vacuum:
+            writer.execute("VACUUM")
+        logger.info(f"{table}: {year}년 {moved}행 보관 완료 → {path}")
+        return moved
+
+    def restore_year(self, year: int) -> int:
+        """
+        보관 연도를 주 데이터베이스로 되돌리고 보관 파일 삭제 (호출자가 쓰기 잠금을 잡고 있어야 함)
+
+        Returns:
+            int: 주 데이터베이스로 옮긴 행 수
+        """
+        writer = self.pool.writer
+        table = self.source_table
+        path = self.archived_years(writer).get(year)
+        if path is None:
+            raise ValueError(f"{table}: 보관되지 않은 연도입니다: {year}")
+
+        schema = f"{SCHEMA_PREFIX}{year}"
+        writer.commit()
+        writer.execute("ATTACH DATABASE ? AS ?", (path, schema))
+        try:
+            columns = self._column_list(writer)
+            moved = writer.execute(f"INSERT OR REPLACE INTO main.{table} ({columns}) "
+                                   f"SELECT {columns} FROM {schema}.{table}").rowcount
+            writer.execute("DELETE FROM archived_years WHERE source_table = ? AND year = ?", (table, year))
+            writer.commit()
+        except Exception:
+            writer.rollback()
+            raise
+        finally:
+            writer.execute("DETACH DATABASE ?", (schema,))
+        self._generation += 1
+
+        os.remove(path)
+        logger.info(f"{table}: {year}년 {moved}행 복원 완료")
+        return moved
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _attach(self, connection: sqlite3.Connection, archived: Dict[int, str], attached: Iterable[int]):
+        """연결의 보관 파일 연결 상태를 archived에 맞추고 원본 테이블 이름의 임시 뷰를 다시 만듦"""
+        limit = connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(archived) > limit:
+            raise ValueError(f"한 번에 조회할 수 있는 보관 연도는 최대 {limit}개입니다: {sorted(archived)}")
+
+        table = self.source_table
+        connection.execute("PRAGMA query_only = OFF")
+        try:
+            connection.execute(f"DROP VIEW IF EXISTS temp.{table}")
+            for year in attached:
+                connection.execute("DETACH DATABASE ?", (f"{SCHEMA_PREFIX}{year}",))
+            columns = self._column_list(connection)
+            arms = [f"SELECT {columns} FROM main.{table}"]
+            for year, path in sorted(archived.items()):
+                connection.execute("ATTACH DATABASE ? AS ?",
+                                   (f"{Path(path).resolve().as_uri()}?mode=ro", f"{SCHEMA_PREFIX}{year}"))
+                # 보관 파일에는 해당 연도만 있으므로 연도 조건을 두지 않음
+                # (year = 상수 조건을 두면 사번 조회에서도 연도 인덱스 전체 스캔이 선택됨)
+                arms.append(f"SELECT {columns} FROM {SCHEMA_PREFIX}{year}.{table}")
+            if archived:
+                connection.execute(f"CREATE TEMP VIEW {table} AS " + " UNION ALL ".join(arms))
+        finally:
+            connection.execute("PRAGMA query_only = ON")
+
+    def connect(self, periods: Optional[Iterable[Period]] = None) -> sqlite3.Connection:
+        """
+        periods의 보관 연도를 연결한 새 읽기 전용 연결 (작업자 스레드용, 닫기는 호출자 담당)
+
+        Args:
+            periods (Optional[Iterable[Period]]): 조회할 (년, 월) 목록 (None이면 주 데이터베이스만)
+        """
+        connection = self.pool.open_reader()
+        archived = self._archived_for(periods, connection)
+        if archived:
+            self._attach(connection, archived, ())
+        return connection
+
+    def reader(self, periods: Optional[Iterable[Period]] = None) -> sqlite3.Connection:
+        """
+        호출 스레드 전용 조회 연결
+
+        Args:
+            periods (Optional[Iterable[Period]]): 조회할 (년, 월) 목록 (None이면 주 데이터베이스만)
+
+        Returns:
+            sqlite3.Connection: 보관 연도가 없으면 연결 풀의 읽기 연결, 있으면 해당 연도를 연결한 연결
+        """
+        archived = self._archived_for(periods)
+        if not archived:
+            return self.pool.reader()
+
+        slot = self._readers.current()
+        if slot is None:
+            slot = self._readers.register(self.pool.open_reader(), (None, {}))
+        generation, attached = slot.state
+        if generation != self._generation or attached != archived:
+            self._attach(slot.connection, archived, attached)
+            slot.state = (self._generation, archived)
+        return slot.connection
+
+    def close(self):
+        """보관 연도 조회 연결 닫기"""
+        self._readers.close()